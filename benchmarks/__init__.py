@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Headless benchmark suite for pyqtgraph.
+
+Times the rendering and data-path hot spots (path generation, image conversion,
+isosurface / isocurve extraction, array slicing, scatter plot fragments, ViewBox
+auto-ranging, MetaArray I/O and remote process round-trips) at a set of
+parameterized sizes, and writes the results to JSON so that runs from different
+commits can be compared.
+
+Usage (from the root of the source tree)::
+
+    python -m benchmarks                        ## run everything at 'small' and 'medium' sizes
+    python -m benchmarks --list                 ## list benchmarks and their sizes
+    python -m benchmarks -k makeARGB -k isosurface --sizes large
+    python -m benchmarks -o new.json --compare old.json
+
+Benchmarks that create graphics items need a QApplication. When no display is
+available, QT_QPA_PLATFORM is set to 'offscreen' (Qt 5 and later); with Qt 4, run
+under a virtual X server (eg. ``xvfb-run python -m benchmarks``) or pass --no-gui
+to skip those benchmarks.
+
+New benchmarks are registered with the :func:`benchmark` decorator in one of
+the bench_*.py modules (see runner.py).
+"""
+import os, sys
+
+## must be decided before Qt is first imported
+if ('QT_QPA_PLATFORM' not in os.environ and sys.platform.startswith('linux')
+        and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+from .runner import *
+from . import bench_functions, bench_graphics, bench_io, bench_multiprocess
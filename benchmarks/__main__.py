@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Command-line interface to the benchmark suite; see ``python -m benchmarks --help``.
+"""
+import sys, argparse
+from . import BENCHMARKS, SIZES, run, saveResults, loadResults, compareResults, printComparison
+from .runner import selectBenchmarks, printResult
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Run pyqtgraph benchmarks.")
+    parser.add_argument('-k', dest='patterns', action='append', default=None,
+                        help="Run only benchmarks whose name or group matches (substring or fnmatch pattern). May be repeated.")
+    parser.add_argument('--sizes', default='small,medium',
+                        help="Comma-separated size presets to run (from %s; default 'small,medium')" % ', '.join(SIZES))
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed repeats (default 5)")
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help="Minimum duration (s) of each repeat; fast functions are called several times per repeat (default 0.1)")
+    parser.add_argument('--no-gui', action='store_true', help="Skip benchmarks that create graphics items")
+    parser.add_argument('-o', '--output', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Compare results against a previously saved JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Relative change reported as faster/slower by --compare (default 0.1)")
+    parser.add_argument('--list', action='store_true', help="List available benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip() != '']
+    for s in sizes:
+        if s not in SIZES:
+            parser.error("Unknown size preset '%s' (must be one of %s)" % (s, ', '.join(SIZES)))
+
+    if args.list:
+        for bench in selectBenchmarks(args.patterns, gui=not args.no_gui):
+            params = ', '.join(['%s=%s' % (s, bench.sizes[s]) for s in SIZES if s in bench.sizes])
+            print('%-16s %-24s %s' % (bench.group, bench.name, params))
+            print('%-16s %-24s   %s' % ('', '', bench.doc))
+        return 0
+
+    if not args.no_gui:
+        import pyqtgraph as pg
+        pg.mkQApp()
+
+    results = run(args.patterns, sizes=sizes, repeat=args.repeat, minTime=args.min_time,
+                  gui=not args.no_gui, callback=printResult)
+
+    if args.output is not None:
+        saveResults(results, args.output)
+        print("Results written to %s" % args.output)
+
+    if args.compare is not None:
+        base = loadResults(args.compare)
+        print("\nComparison to %s (commit %s):" % (args.compare, base['environment'].get('commit', None)))
+        rows = compareResults(base, results, tolerance=args.tolerance)
+        printComparison(rows)
+        if any([r['status'] == 'slower' for r in rows]):
+            return 1
+
+    if any(['error' in r for r in results['results']]):
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
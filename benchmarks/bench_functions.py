@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the array-processing functions in pyqtgraph.functions.
+"""
+import numpy as np
+import pyqtgraph.functions as fn
+from .runner import benchmark
+
+
+@benchmark(sizes={'small': 10000, 'medium': 100000, 'large': 1000000})
+def arrayToQPath(n):
+    """Convert n (x, y) points to a QPainterPath, connecting all points."""
+    x = np.linspace(0, 1, n)
+    y = np.random.normal(size=n)
+    return lambda: fn.arrayToQPath(x, y)
+
+
+@benchmark(sizes={'small': 10000, 'medium': 100000, 'large': 1000000})
+def arrayToQPathConnect(n):
+    """Convert n (x, y) points to a QPainterPath using a connect array (1 break per 100 points)."""
+    x = np.linspace(0, 1, n)
+    y = np.random.normal(size=n)
+    connect = np.ones(n, dtype=np.int32)
+    connect[99::100] = 0
+    return lambda: fn.arrayToQPath(x, y, connect=connect)
+
+
+@benchmark(sizes={'small': 256, 'medium': 1024, 'large': 4096})
+def makeARGBLut(n):
+    """Map an (n, n) uint8 image through a 256-entry RGBA lookup table."""
+    data = np.random.randint(0, 256, size=(n, n)).astype(np.ubyte)
+    lut = np.random.randint(0, 256, size=(256, 4)).astype(np.ubyte)
+    return lambda: fn.makeARGB(data, lut=lut)
+
+
+@benchmark(sizes={'small': 256, 'medium': 1024, 'large': 4096})
+def makeARGBLevels(n):
+    """Rescale an (n, n) uint16 image with levels (no lookup table)."""
+    data = np.random.randint(0, 4096, size=(n, n)).astype(np.uint16)
+    return lambda: fn.makeARGB(data, levels=[100, 3000])
+
+
+@benchmark(sizes={'small': 256, 'medium': 1024, 'large': 4096})
+def makeARGBLevelsLut(n):
+    """Rescale an (n, n) float image with levels, then apply a 4096-entry lookup table."""
+    data = np.random.normal(size=(n, n)).astype(np.float32)
+    lut = np.random.randint(0, 256, size=(4096, 4)).astype(np.ubyte)
+    return lambda: fn.makeARGB(data, lut=lut, levels=[-2, 2])
+
+
+@benchmark(sizes={'small': 256, 'medium': 1024, 'large': 4096})
+def makeARGBRGB(n):
+    """Rescale an (n, n, 3) uint8 RGB image with per-channel levels."""
+    data = np.random.randint(0, 256, size=(n, n, 3)).astype(np.ubyte)
+    levels = np.array([[10, 240], [20, 230], [0, 255]])
+    return lambda: fn.makeARGB(data, levels=levels)
+
+
+@benchmark(sizes={'small': 256, 'medium': 1024, 'large': 4096})
+def makeQImage(n):
+    """Convert an (n, n, 4) ARGB array to QImage (copying the data)."""
+    data = np.random.randint(0, 256, size=(n, n, 4)).astype(np.ubyte)
+    return lambda: fn.makeQImage(data, alpha=True)
+
+
+@benchmark(sizes={'small': 32, 'medium': 64, 'large': 128})
+def isosurface(n):
+    """Marching cubes over an (n, n, n) volume containing noisy spherical shells."""
+    data = isoVolume(n)
+    return lambda: fn.isosurface(data, 0.5)
+
+
+@benchmark(sizes={'small': 32, 'medium': 64, 'large': 128})
+def isosurfaceThreads(n):
+    """Same as isosurface, processing slabs of the volume in 4 threads."""
+    data = isoVolume(n)
+    return lambda: fn.isosurface(data, 0.5, chunkSize=max(n // 8, 2), threads=4)
+
+
+@benchmark(sizes={'small': 128, 'medium': 512, 'large': 2048})
+def isocurve(n):
+    """Marching squares over an (n, n) smooth noise image, returning point pairs."""
+    data = isoImage(n)
+    return lambda: fn.isocurve(data, 0.5)
+
+
+@benchmark(sizes={'small': 128, 'medium': 512, 'large': 2048})
+def isocurveConnected(n):
+    """Marching squares over an (n, n) smooth noise image, returning connected lines."""
+    data = isoImage(n)
+    return lambda: fn.isocurve(data, 0.5, connected=True)
+
+
+@benchmark(sizes={'small': 64, 'medium': 128, 'large': 256})
+def affineSliceOblique(n):
+    """Oblique, linearly interpolated (n, n) slice through an (n, n, n, 4) volume."""
+    data = np.random.normal(size=(n, n, n, 4)).astype(np.float32)
+    c = np.cos(0.3)
+    s = np.sin(0.3)
+    vectors = [(c, s, 0.1), (-s, c, 0.2)]
+    def slice():
+        ## move the origin on every call so that cached coordinates are never reused
+        origin = (n * 0.2, np.random.random(), n * 0.3)
+        return fn.affineSlice(data, shape=(n // 2, n // 2), origin=origin, vectors=vectors, axes=(0, 1, 2))
+    return slice
+
+
+@benchmark(sizes={'small': 64, 'medium': 128, 'large': 256})
+def affineSliceCached(n):
+    """Repeated oblique slice with unchanged parameters (coordinate / weight cache hit)."""
+    data = np.random.normal(size=(n, n, n, 4)).astype(np.float32)
+    c = np.cos(0.3)
+    s = np.sin(0.3)
+    vectors = [(c, s, 0.1), (-s, c, 0.2)]
+    origin = (n * 0.2, 0.5, n * 0.3)
+    return lambda: fn.affineSlice(data, shape=(n // 2, n // 2), origin=origin, vectors=vectors, axes=(0, 1, 2))
+
+
+def isoVolume(n):
+    ## concentric spherical shells with a little noise; gives a large, closed surface
+    x, y, z = np.ogrid[-1:1:n*1j, -1:1:n*1j, -1:1:n*1j]
+    r = (x**2 + y**2 + z**2) ** 0.5
+    np.random.seed(0)
+    return (np.cos(r * 12) * 0.5 + 0.5 + np.random.normal(scale=0.05, size=(n, n, n))).astype(np.float32)
+
+
+def isoImage(n):
+    ## smooth 2D noise built from a few sinusoids
+    x, y = np.ogrid[0:1:n*1j, 0:1:n*1j]
+    data = np.zeros((n, n))
+    np.random.seed(0)
+    for i in range(8):
+        fx, fy, ph = np.random.uniform(1, 20, size=3)
+        data += np.sin(x * fx + ph) * np.cos(y * fy)
+    return data / 8. + 0.5
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for graphics items. These create (hidden) widgets, so they need a
+QApplication; run headless with an offscreen Qt platform or a virtual X server.
+"""
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph.Qt import QtGui, QtCore
+from .runner import benchmark
+
+
+def mkView(width=800, height=600):
+    ## PlotWidget with its final geometry, so that item transforms are valid
+    app = pg.mkQApp()
+    view = pg.PlotWidget()
+    view.resize(width, height)
+    view.show()
+    app.processEvents()
+    return view
+
+
+def closeView(view):
+    view.close()
+    view.deleteLater()
+    pg.mkQApp().processEvents()
+
+
+def renderer(view):
+    ## return a function that paints the scene of *view* into an offscreen image
+    img = QtGui.QImage(view.width(), view.height(), QtGui.QImage.Format_ARGB32_Premultiplied)
+    def render():
+        img.fill(0)
+        p = QtGui.QPainter(img)
+        try:
+            view.render(p)
+        finally:
+            p.end()
+    return render
+
+
+@benchmark(sizes={'small': 1000, 'medium': 10000, 'large': 100000}, gui=True)
+def scatterFragments(n):
+    """Compute pixmap fragments for n pxMode scatter points (as done when the view changes)."""
+    view = mkView()
+    item = pg.ScatterPlotItem(x=np.random.normal(size=n), y=np.random.normal(size=n), size=7,
+                              brush=[pg.intColor(i, 10) for i in range(n)])
+    view.addItem(item)
+    pg.mkQApp().processEvents()
+    def generate():
+        item.fragments = None
+        item.generateFragments()
+    return generate, lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 1000, 'medium': 10000, 'large': 100000}, gui=True)
+def scatterPaint(n):
+    """Render a view containing n pxMode scatter points, recomputing fragments each frame."""
+    view = mkView()
+    item = pg.ScatterPlotItem(x=np.random.normal(size=n), y=np.random.normal(size=n), size=7,
+                              brush=[pg.intColor(i, 10) for i in range(n)])
+    view.addItem(item)
+    render = renderer(view)
+    def paint():
+        item.fragments = None
+        render()
+    return paint, lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 1000, 'medium': 10000, 'large': 100000}, gui=True)
+def scatterAddPoints(n):
+    """Append 100 points to a pxMode scatter plot holding up to n points (oldest points discarded) and render."""
+    view = mkView()
+    item = pg.ScatterPlotItem(size=7, maxPoints=n)
+    view.addItem(item)
+    view.setRange(xRange=(-4, 4), yRange=(-4, 4), padding=0)
+    view.enableAutoRange(enable=False)
+    render = renderer(view)
+    item.addPoints(x=np.random.normal(size=n), y=np.random.normal(size=n))
+    pts = np.random.normal(size=(2, 100))
+    def add():
+        item.addPoints(x=pts[0], y=pts[1])
+        render()
+    return add, lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 100, 'medium': 1000, 'large': 10000}, gui=True)
+def scatterPaintScaled(n):
+    """Render a view containing n scatter points with pxMode=False."""
+    view = mkView()
+    item = pg.ScatterPlotItem(x=np.random.normal(size=n), y=np.random.normal(size=n), size=0.05,
+                              pxMode=False, brush=[pg.intColor(i, 10) for i in range(n)])
+    view.addItem(item)
+    return renderer(view), lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 10000, 'medium': 100000, 'large': 1000000}, gui=True)
+def curvePaint(n):
+    """Set n points of new data on a PlotDataItem and render the view."""
+    view = mkView()
+    item = view.plot()
+    data = np.random.normal(size=(10, n))
+    render = renderer(view)
+    index = [0]
+    def update():
+        index[0] = (index[0] + 1) % len(data)
+        item.setData(data[index[0]])
+        render()
+    return update, lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 10000, 'medium': 100000, 'large': 1000000}, gui=True)
+def curvePaintStepFill(n):
+    """Set n points of new data on a stepMode curve with fill and render the view."""
+    view = mkView()
+    item = pg.PlotCurveItem(stepMode=True, fillLevel=0, brush=(0, 0, 255, 80))
+    view.addItem(item)
+    x = np.arange(n + 1)
+    data = np.random.normal(size=(10, n))
+    render = renderer(view)
+    index = [0]
+    def update():
+        index[0] = (index[0] + 1) % len(data)
+        item.setData(x, data[index[0]])
+        render()
+    return update, lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 10, 'medium': 100, 'large': 500}, gui=True)
+def viewBoxAutoRange(n):
+    """Auto-range a ViewBox containing n curves of 10000 points each."""
+    view = mkView()
+    vb = view.getViewBox()
+    for i in range(n):
+        view.plot(np.random.normal(size=10000) + i)
+    pg.mkQApp().processEvents()
+    return lambda: vb.autoRange(), lambda: closeView(view)
+
+
+@benchmark(sizes={'small': 10, 'medium': 100, 'large': 500}, gui=True)
+def viewBoxUpdateAutoRange(n):
+    """Replace the data of one of n curves (10000 points each) and update the auto range."""
+    view = mkView()
+    vb = view.getViewBox()
+    curves = [view.plot(np.random.normal(size=10000) + i) for i in range(n)]
+    data = np.random.normal(size=(10, 10000))
+    pg.mkQApp().processEvents()
+    index = [0]
+    def update():
+        index[0] += 1
+        curves[index[0] % n].setData(data[index[0] % len(data)] + index[0] % n)
+        vb.updateAutoRange()
+    return update, lambda: closeView(view)
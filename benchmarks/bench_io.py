@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for MetaArray file I/O. HDF5 is used if h5py is available, otherwise
+the native MetaArray format.
+"""
+import os, tempfile
+import numpy as np
+from pyqtgraph.metaarray import MetaArray
+from .runner import benchmark
+
+
+def mkMetaArray(n):
+    ## (n, 8) array with a time axis and named columns
+    data = np.random.normal(size=(n, 8)).astype(np.float32)
+    info = [{'name': 'Time', 'units': 's', 'values': np.arange(n) * 1e-4},
+            {'name': 'Channel', 'cols': [{'name': 'ch%d' % i, 'units': 'V'} for i in range(8)]},
+            {'note': 'benchmark data'}]
+    return MetaArray(data, info=info)
+
+
+def tempFile():
+    fd, fileName = tempfile.mkstemp(suffix='.ma')
+    os.close(fd)
+    os.remove(fileName)
+    return fileName
+
+
+def removeFile(fileName):
+    if os.path.exists(fileName):
+        os.remove(fileName)
+
+
+@benchmark(sizes={'small': 10000, 'medium': 1000000, 'large': 10000000})
+def metaArrayWrite(n):
+    """Write an (n, 8) float32 MetaArray with axis values and column info to a new file."""
+    ma = mkMetaArray(n)
+    fileName = tempFile()
+    def write():
+        removeFile(fileName)
+        ma.write(fileName)
+    return write, lambda: removeFile(fileName)
+
+
+@benchmark(sizes={'small': 10000, 'medium': 1000000, 'large': 10000000})
+def metaArrayRead(n):
+    """Read back an (n, 8) float32 MetaArray, loading all data into memory."""
+    fileName = tempFile()
+    mkMetaArray(n).write(fileName)
+    def read():
+        ## (files smaller than 500MB are read completely and closed by default)
+        MetaArray(file=fileName).asarray()
+    return read, lambda: removeFile(fileName)
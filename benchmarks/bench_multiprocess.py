@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for remote process communication (pyqtgraph.multiprocess).
+Each benchmark starts its own child process during setup; startup time is not included.
+"""
+import numpy as np
+import pyqtgraph.multiprocess as mp
+from .runner import benchmark
+
+
+def mkProcess():
+    proc = mp.Process()
+    rnp = proc._import('numpy')
+    return proc, rnp
+
+
+@benchmark(sizes={'small': 10, 'medium': 100})
+def remoteCall(n):
+    """n sequential synchronous calls to a remote function returning a scalar by value."""
+    proc, rnp = mkProcess()
+    radd = rnp.add
+    def call():
+        for i in range(n):
+            radd(i, 1)
+    return call, proc.join
+
+
+@benchmark(sizes={'small': 10, 'medium': 100})
+def remoteGetattr(n):
+    """n sequential attribute lookups on a remote object, each returning a new proxy."""
+    proc, rnp = mkProcess()
+    def call():
+        for i in range(n):
+            rnp.float64
+    return call, proc.join
+
+
+@benchmark(sizes={'small': 1000, 'medium': 1000000, 'large': 10000000})
+def remoteArrayRoundTrip(n):
+    """Send an array of n float64 to the remote process and receive a copy by value."""
+    proc, rnp = mkProcess()
+    data = np.random.normal(size=n)
+    rarray = rnp.array
+    return lambda: rarray(data, _returnType='value'), proc.join
+
+
+@benchmark(sizes={'small': 1000, 'medium': 1000000, 'large': 10000000})
+def remoteArrayTransfer(n):
+    """Transfer an array of n float64 to the remote process (returning a proxy to it)."""
+    proc, rnp = mkProcess()
+    data = np.random.normal(size=n)
+    return lambda: proc.transfer(data), proc.join
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Registry, timing and result handling for the benchmark suite.
+"""
+import sys, os, json, time, platform, subprocess, fnmatch
+import numpy as np
+from pyqtgraph.pgcollections import OrderedDict
+import pyqtgraph.ptime as ptime
+
+__all__ = ['benchmark', 'BENCHMARKS', 'SIZES', 'run', 'runBenchmark', 'environment',
+           'saveResults', 'loadResults', 'compareResults', 'printResults', 'printComparison']
+
+## name of each size preset; benchmarks give one parameter value for each preset.
+SIZES = ['small', 'medium', 'large']
+
+## name: Benchmark, in registration order
+BENCHMARKS = OrderedDict()
+
+
+class Benchmark(object):
+    ## One registered benchmark function and the parameter values it is run with.
+    def __init__(self, func, name, sizes, group, gui):
+        self.func = func
+        self.name = name
+        self.sizes = sizes
+        self.group = group
+        self.gui = gui
+        self.doc = (func.__doc__ or '').strip()
+
+    def prepare(self, param):
+        ## Run the setup part of the benchmark; return (timedFunc, cleanupFunc or None)
+        ret = self.func(param)
+        if isinstance(ret, tuple):
+            return ret
+        return ret, None
+
+
+def benchmark(sizes, name=None, group=None, gui=False):
+    """
+    Decorator registering a benchmark.
+
+    The decorated function is called once per size with a single parameter (the value
+    from *sizes* for that preset). It should do any setup work and return a function
+    taking no arguments; only that function is timed. It may instead return a
+    tuple (timedFunc, cleanupFunc) if resources (processes, files) must be released
+    after timing.
+
+    ==========  ================================================================
+    sizes       dict {preset: parameter} giving the parameter for each of the
+                presets in SIZES ('small', 'medium', 'large'). Presets may be
+                omitted if a benchmark does not make sense at that size.
+    name        Benchmark name (default is the function name)
+    group       Name of the group the benchmark is listed under (default is the
+                module name)
+    gui         If True, the benchmark creates graphics items or widgets and
+                needs a QApplication.
+    ==========  ================================================================
+    """
+    def register(func):
+        n = name or func.__name__
+        g = group or func.__module__.split('.')[-1]
+        BENCHMARKS[n] = Benchmark(func, n, sizes, g, gui)
+        return func
+    return register
+
+
+def timeFunction(func, repeat=5, minTime=0.1):
+    ## Time calls to *func*. The number of calls per repeat is chosen so that each
+    ## repeat takes at least *minTime* seconds. Returns a list of per-call times (one
+    ## per repeat) and the number of calls per repeat.
+    start = ptime.time()
+    func()    ## warm-up; also used to estimate the time per call
+    dt = ptime.time() - start
+    number = 1
+    if dt < minTime:
+        number = int(min(minTime / max(dt, 1e-7), 1e6)) + 1
+    times = []
+    for i in range(repeat):
+        start = ptime.time()
+        for j in range(number):
+            func()
+        times.append((ptime.time() - start) / number)
+    return times, number
+
+
+def runBenchmark(bench, size, repeat=5, minTime=0.1):
+    """
+    Run a single benchmark at one size preset and return a dict describing the
+    result (times are per call, in seconds).
+    """
+    param = bench.sizes[size]
+    result = OrderedDict([('name', bench.name), ('group', bench.group), ('size', size), ('param', param)])
+    cleanup = None
+    try:
+        func, cleanup = bench.prepare(param)
+        times, number = timeFunction(func, repeat=repeat, minTime=minTime)
+    except Exception:
+        result['error'] = '%s: %s' % (sys.exc_info()[0].__name__, sys.exc_info()[1])
+        return result
+    finally:
+        if cleanup is not None:
+            cleanup()
+    times = np.array(times)
+    result['number'] = number
+    result['repeat'] = repeat
+    result['min'] = float(times.min())
+    result['median'] = float(np.median(times))
+    result['mean'] = float(times.mean())
+    result['std'] = float(times.std())
+    return result
+
+
+def selectBenchmarks(patterns=None, gui=True):
+    ## Return benchmarks whose name or group matches any of the (fnmatch-style) *patterns*
+    benches = []
+    for bench in BENCHMARKS.values():
+        if not gui and bench.gui:
+            continue
+        if patterns:
+            if not any([fnmatch.fnmatch(bench.name, p) or fnmatch.fnmatch(bench.group, p) or p in bench.name for p in patterns]):
+                continue
+        benches.append(bench)
+    return benches
+
+
+def run(patterns=None, sizes=('small', 'medium'), repeat=5, minTime=0.1, gui=True, callback=None):
+    """
+    Run all registered benchmarks matching *patterns* (list of names, groups or
+    fnmatch patterns; default is all) at each of the given size presets. Benchmarks
+    with gui=True are skipped if *gui* is False. *callback*, if given, is called with
+    each result dict as soon as it is available.
+
+    Returns a dict with keys 'environment' and 'results', suitable for
+    :func:`saveResults`.
+    """
+    results = []
+    for bench in selectBenchmarks(patterns, gui=gui):
+        for size in sizes:
+            if size not in bench.sizes:
+                continue
+            result = runBenchmark(bench, size, repeat=repeat, minTime=minTime)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+    return OrderedDict([('environment', environment()), ('results', results)])
+
+
+def environment():
+    """Return a dict describing the software / hardware the benchmarks are run on."""
+    import pyqtgraph as pg
+    env = OrderedDict()
+    env['time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    env['pyqtgraph'] = pg.__version__
+    env['commit'] = gitCommit()
+    env['python'] = sys.version.split()[0]
+    env['numpy'] = np.__version__
+    try:
+        import scipy
+        env['scipy'] = scipy.__version__
+    except ImportError:
+        env['scipy'] = None
+    env['qt'] = pg.Qt.VERSION_INFO
+    env['qtPlatform'] = os.environ.get('QT_QPA_PLATFORM', None)
+    env['platform'] = platform.platform()
+    env['machine'] = platform.machine()
+    env['processor'] = platform.processor()
+    return env
+
+
+def gitCommit():
+    ## Return the commit (and '+' if there are local changes) of the source tree being benchmarked.
+    path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        rev = subprocess.Popen(['git', 'rev-parse', 'HEAD'], cwd=path, stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()[0]
+        rev = rev.decode('ascii').strip()
+        if rev == '':
+            return None
+        status = subprocess.Popen(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=path, stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()[0]
+        if status.strip() != b'':
+            rev += '+'
+        return rev
+    except Exception:
+        return None
+
+
+def saveResults(results, fileName):
+    """Write the output of :func:`run` to *fileName* as JSON."""
+    fh = open(fileName, 'w')
+    try:
+        json.dump(results, fh, indent=1)
+    finally:
+        fh.close()
+
+
+def loadResults(fileName):
+    """Load results written by :func:`saveResults`."""
+    fh = open(fileName, 'r')
+    try:
+        return json.load(fh, object_pairs_hook=OrderedDict)
+    finally:
+        fh.close()
+
+
+def compareResults(base, new, tolerance=0.1, key='min'):
+    """
+    Compare two sets of results (as returned by :func:`run` or :func:`loadResults`).
+
+    Returns a list of dicts (name, size, base, new, ratio, status), one for each
+    benchmark/size present in both sets, where ratio = new / base for the statistic
+    *key* ('min' by default; the least noisy). status is 'slower' if the ratio
+    exceeds 1+tolerance, 'faster' if it is below 1/(1+tolerance), and 'same' otherwise.
+    """
+    baseRes = dict([((r['name'], r['size']), r) for r in base['results'] if 'error' not in r])
+    rows = []
+    for r in new['results']:
+        b = baseRes.get((r['name'], r['size']), None)
+        if b is None or 'error' in r:
+            continue
+        ratio = r[key] / b[key] if b[key] > 0 else float('inf')
+        if ratio > 1 + tolerance:
+            status = 'slower'
+        elif ratio < 1. / (1 + tolerance):
+            status = 'faster'
+        else:
+            status = 'same'
+        rows.append(OrderedDict([('name', r['name']), ('size', r['size']), ('base', b[key]),
+                                 ('new', r[key]), ('ratio', ratio), ('status', status)]))
+    return rows
+
+
+def formatTime(t):
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if t >= scale:
+            return '%0.3g %s' % (t / scale, unit)
+    return '%0.3g ns' % (t * 1e9)
+
+
+def printResult(result, out=None):
+    out = out or sys.stdout
+    label = '%s [%s=%s]' % (result['name'], result['size'], result['param'])
+    if 'error' in result:
+        out.write('%-55s  ERROR %s\n' % (label, result['error']))
+    else:
+        out.write('%-55s  min %10s   median %10s   (%d x %d)\n' % (label, formatTime(result['min']),
+                  formatTime(result['median']), result['repeat'], result['number']))
+    out.flush()
+
+
+def printResults(results, out=None):
+    """Print a table of results to *out* (default sys.stdout)."""
+    for r in results['results']:
+        printResult(r, out)
+
+
+def printComparison(rows, out=None):
+    """Print the output of :func:`compareResults` to *out* (default sys.stdout)."""
+    out = out or sys.stdout
+    for r in rows:
+        label = '%s [%s]' % (r['name'], r['size'])
+        out.write('%-45s  %10s -> %10s   x%0.2f  %s\n' % (label, formatTime(r['base']), formatTime(r['new']),
+                  r['ratio'], r['status'].upper() if r['status'] != 'same' else ''))
+    out.flush()
@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Test the speed of rapidly updating many stacked channels drawn by a single MultiTraceItem
+(compare to MultiPlotSpeedTest, which uses one curve per channel)
+"""
+
+## Add path to library (just for examples; you do not need this)
+import initExample
+
+
+from pyqtgraph.Qt import QtGui, QtCore
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph.ptime import time
+app = QtGui.QApplication([])
+
+p = pg.plot()
+p.setWindowTitle('pyqtgraph example: MultiTraceSpeedTest')
+p.setLabel('bottom', 'Time', units='s')
+
+nChannels = 256
+nSamples = 20000
+rate = 20000.
+x = np.arange(nSamples) / rate
+data = np.random.normal(size=(nChannels, nSamples)).astype(np.float32)
+gains = 0.15 * np.ones(nChannels)
+
+traces = pg.MultiTraceItem(data, x=x, gains=gains, pen=(200, 200, 255))
+p.addItem(traces)
+
+ptr = 0
+lastTime = time()
+fps = None
+def update():
+    global ptr, lastTime, fps
+    ## scroll the data by a block of samples
+    data[:, :-500] = data[:, 500:]
+    data[:, -500:] = np.random.normal(size=(nChannels, 500))
+    data[ptr % nChannels, -500:] += np.sin(np.linspace(0, 20, 500)) * 5
+    ptr += 1
+    traces.setData(data)
+    now = time()
+    dt = now - lastTime
+    lastTime = now
+    if fps is None:
+        fps = 1.0/dt
+    else:
+        s = np.clip(dt*3., 0, 1)
+        fps = fps * (1-s) + (1.0/dt) * s
+    p.setTitle('%0.2f fps' % fps)
+timer = QtCore.QTimer()
+timer.timeout.connect(update)
+timer.start(0)
+
+
+
+## Start Qt event loop unless running in interactive mode.
+if __name__ == '__main__':
+    import sys
+    if (sys.flags.interactive != 1) or not hasattr(QtCore, 'PYQT_VERSION'):
+        QtGui.QApplication.instance().exec_()
@@ -27,6 +27,13 @@ else:
 
 __all__ = ['GraphicsScene']
 
+
+def absZValue(item):
+    ## 'absolute' z value, which is the sum of all item/parent ZValues
+    if item is None:
+        return 0
+    return item.zValue() + absZValue(item.parentItem())
+
 class GraphicsScene(QtGui.QGraphicsScene):
     """
     Extension of QGraphicsScene that implements a complete, parallel mouse event system.
@@ -47,7 +54,8 @@ class GraphicsScene(QtGui.QGraphicsScene):
     Mouse interaction is as follows:
     
     1) Every time the mouse moves, the scene delivers both the standard hoverEnter/Move/LeaveEvents 
-       as well as custom HoverEvents. 
+       as well as custom HoverEvents. Custom HoverEvents are coalesced so that they are delivered at
+       most once per frame (see setHoverRateLimit).
     2) Items are sent HoverEvents in Z-order and each item may optionally call event.acceptClicks(button), 
        acceptDrags(button) or both. If this method call returns True, this informs the item that _if_ 
        the user clicks/drags the specified mouse button, the item is guaranteed to be the 
@@ -81,6 +89,11 @@ class GraphicsScene(QtGui.QGraphicsScene):
     
     ExportDirectory = None
     
+    ## Size (in view pixels) of the tiles used to cache hover candidates
+    _hoverTileSize = 32
+    ## Maximum number of tiles held in the hover candidate cache
+    _hoverCacheMaxTiles = 256
+    
     @classmethod
     def registerObject(cls, obj):
         """
@@ -92,10 +105,11 @@ class GraphicsScene(QtGui.QGraphicsScene):
             cls._addressCache[sip.unwrapinstance(sip.cast(obj, QtGui.QGraphicsItem))] = obj
             
             
-    def __init__(self, clickRadius=2, moveDistance=5):
+    def __init__(self, clickRadius=2, moveDistance=5, hoverRateLimit=60):
         QtGui.QGraphicsScene.__init__(self)
         self.setClickRadius(clickRadius)
         self.setMoveDistance(moveDistance)
+        self.setHoverRateLimit(hoverRateLimit)
         self.exportDirectory = None
         
         self.clickEvents = []
@@ -106,6 +120,22 @@ class GraphicsScene(QtGui.QGraphicsScene):
         self.lastDrag = None
         self.hoverItems = weakref.WeakKeyDictionary()
         self.lastHoverEvent = None
+        
+        ## hover events arriving faster than the rate limit are coalesced and
+        ## delivered by this timer
+        self._pendingHoverEvent = None
+        self._lastHoverTime = 0.0
+        self._hoverTimer = QtCore.QTimer()
+        self._hoverTimer.setSingleShot(True)
+        self._hoverTimer.timeout.connect(self.flushHoverEvents)
+        
+        ## cache of hover candidates per view-space tile; cleared whenever the 
+        ## scene or the view transform changes.
+        self._hoverCache = {}
+        self._hoverCacheTransform = None
+        self._hoverCacheValid = False
+        self.changed.connect(self.invalidateHoverCache)
+        self.sceneRectChanged.connect(self.invalidateHoverCache)
         #self.searchRect = QtGui.QGraphicsRectItem()
         #self.searchRect.setPen(fn.mkPen(200,0,0))
         #self.addItem(self.searchRect)
@@ -114,6 +144,7 @@ class GraphicsScene(QtGui.QGraphicsScene):
         self.contextMenu[0].triggered.connect(self.showExportDialog)
         
         self.exportDialog = None
+        self._paintMonitor = None
         
     def render(self, *args):
         self.prepareForPaint()
@@ -126,6 +157,24 @@ class GraphicsScene(QtGui.QGraphicsScene):
         This allows items to delay expensive processing until they know a paint will be required."""
         self.sigPrepareForPaint.emit()
     
+    def setPaintMonitoring(self, enable=True):
+        """
+        Enable or disable measurement of the time spent painting each item in the 
+        scene (see :class:`PaintMonitor <pyqtgraph.GraphicsScene.PaintMonitor>`). 
+        Return the PaintMonitor, or None if monitoring was disabled.
+        """
+        if enable and self._paintMonitor is None:
+            from .PaintMonitor import PaintMonitor
+            self._paintMonitor = PaintMonitor(self)
+        elif not enable and self._paintMonitor is not None:
+            self._paintMonitor.detach()
+            self._paintMonitor = None
+        return self._paintMonitor
+        
+    def paintMonitor(self):
+        """Return the PaintMonitor in use for this scene, or None."""
+        return self._paintMonitor
+    
 
     def setClickRadius(self, r):
         """
@@ -143,9 +192,19 @@ class GraphicsScene(QtGui.QGraphicsScene):
         drags.
         """
         self._moveDistance = d
+        
+    def setHoverRateLimit(self, rate):
+        """
+        Set the maximum rate (in events per second) at which HoverEvents are delivered
+        to items. Mouse moves arriving faster than this are coalesced so that only the 
+        most recent position is delivered. A rate of 0 disables coalescing.
+        """
+        self._hoverRateLimit = rate
 
     def mousePressEvent(self, ev):
         #print 'scenePress'
+        ## make sure items have seen the latest hover position before deciding who receives the press
+        self.flushHoverEvents()
         QtGui.QGraphicsScene.mousePressEvent(self, ev)
         #print "mouseGrabberItem: ", self.mouseGrabberItem()
         if self.mouseGrabberItem() is None:  ## nobody claimed press; we are free to generate drag/click events
@@ -168,8 +227,8 @@ class GraphicsScene(QtGui.QGraphicsScene):
         ## First allow QGraphicsScene to deliver hoverEnter/Move/ExitEvents
         QtGui.QGraphicsScene.mouseMoveEvent(self, ev)
         
-        ## Next deliver our own HoverEvents
-        self.sendHoverEvents(ev)
+        ## Next deliver our own HoverEvents (rate-limited)
+        self.queueHoverEvent(ev)
         
         if int(ev.buttons()) != 0:  ## button is pressed; send mouseMoveEvents and mouseDragEvents
             QtGui.QGraphicsScene.mouseMoveEvent(self, ev)
@@ -194,6 +253,7 @@ class GraphicsScene(QtGui.QGraphicsScene):
                         ev.accept()
                 
     def leaveEvent(self, ev):  ## inform items that mouse is gone
+        self._cancelPendingHover()
         if len(self.dragButtons) == 0:
             self.sendHoverEvents(ev, exitOnly=True)
         
@@ -221,6 +281,10 @@ class GraphicsScene(QtGui.QGraphicsScene):
             self.lastDrag = None
         QtGui.QGraphicsScene.mouseReleaseEvent(self, ev)
         
+        self._cancelPendingHover()
+        ## click handlers may have added, moved or removed items; the scene's changed
+        ## signal that normally invalidates the hover cache is not delivered until later.
+        self.invalidateHoverCache()
         self.sendHoverEvents(ev)  ## let items prepare for next click/drag
 
     def mouseDoubleClickEvent(self, ev):
@@ -228,16 +292,56 @@ class GraphicsScene(QtGui.QGraphicsScene):
         if self.mouseGrabberItem() is None:  ## nobody claimed press; we are free to generate drag/click events
             self.clickEvents.append(MouseClickEvent(ev, double=True))
         
+    def queueHoverEvent(self, ev):
+        """
+        Deliver HoverEvents for the mouse event *ev*, respecting the hover rate limit.
+        If the previous hover dispatch happened too recently, the event is stored and
+        delivered later; any event queued in the meantime replaces it.
+        """
+        if self._hoverRateLimit <= 0:
+            self.sendHoverEvents(ev)
+            return
+        acceptable = int(ev.buttons()) == 0
+        event = HoverEvent(ev, acceptable)
+        now = ptime.time()
+        interval = 1.0 / self._hoverRateLimit
+        wait = (self._lastHoverTime + interval) - now
+        if wait <= 0 and not self._hoverTimer.isActive():
+            self._sendHoverEvent(event)
+        else:
+            self._pendingHoverEvent = event
+            if not self._hoverTimer.isActive():
+                self._hoverTimer.start(int(max(wait, 0) * 1000) + 1)
+    
+    def flushHoverEvents(self):
+        """Immediately deliver any HoverEvent that is waiting due to rate limiting."""
+        self._hoverTimer.stop()
+        event = self._pendingHoverEvent
+        self._pendingHoverEvent = None
+        if event is not None:
+            self._sendHoverEvent(event)
+            
+    def _cancelPendingHover(self):
+        self._hoverTimer.stop()
+        self._pendingHoverEvent = None
+        
     def sendHoverEvents(self, ev, exitOnly=False):
         ## if exitOnly, then just inform all previously hovered items that the mouse has left.
         
         if exitOnly:
-            acceptable=False
-            items = []
-            event = HoverEvent(None, acceptable)
+            event = HoverEvent(None, False)
         else:
             acceptable = int(ev.buttons()) == 0  ## if we are in mid-drag, do not allow items to accept the hover event.
             event = HoverEvent(ev, acceptable)
+        self._sendHoverEvent(event)
+            
+    def _sendHoverEvent(self, event):
+        self._lastHoverTime = ptime.time()
+        exitOnly = event.isExit()
+        
+        if exitOnly:
+            items = []
+        else:
             items = self.itemsNearEvent(event, hoverable=True)
             self.sigMouseHover.emit(items)
             
@@ -269,9 +373,9 @@ class GraphicsScene(QtGui.QGraphicsScene):
             finally:
                 del self.hoverItems[item]
         
-        if hasattr(ev, 'buttons') and int(ev.buttons()) == 0:
+        if not exitOnly and int(event.buttons()) == 0:
             self.lastHoverEvent = event  ## save this so we can ask about accepted events later.
-            
+        
 
     def sendDragEvent(self, ev, init=False, final=False):
         ## Send a MouseDragEvent to the current dragItem or to 
@@ -437,6 +541,10 @@ class GraphicsScene(QtGui.QGraphicsScene):
         rgn = QtCore.QRectF(point.x()-w, point.y()-h, 2*w, 2*h)
         #self.searchRect.setRect(rgn)
 
+        if hoverable and selMode == QtCore.Qt.IntersectsItemShape:
+            ## candidates are already filtered and sorted; only the shape test remains
+            candidates = self._hoverCandidates(view, point)
+            return [item for item, shape in candidates if shape.contains(point)]
 
         items = self.items(point, selMode, sortOrder, tr)
         
@@ -453,11 +561,6 @@ class GraphicsScene(QtGui.QGraphicsScene):
         
         ## Sort by descending Z-order (don't trust scene.itms() to do this either)
         ## use 'absolute' z value, which is the sum of all item/parent ZValues
-        def absZValue(item):
-            if item is None:
-                return 0
-            return item.zValue() + absZValue(item.parentItem())
-        
         sortList(items2, lambda a,b: cmp(absZValue(b), absZValue(a)))
         
         return items2
@@ -473,6 +576,42 @@ class GraphicsScene(QtGui.QGraphicsScene):
             ##if item not in seen:
             #yield item
         
+    def _hoverCandidates(self, view, point):
+        """
+        Return a list of (item, sceneShape) for all hoverable items whose bounds intersect
+        the view-space tile containing *point*, sorted by descending absolute Z value.
+        Results are cached per tile until the scene or the view transform changes.
+        """
+        tr = view.viewportTransform()
+        if not self._hoverCacheValid or self._hoverCacheTransform != tr or len(self._hoverCache) > self._hoverCacheMaxTiles:
+            self._hoverCache = {}
+            self._hoverCacheTransform = QtGui.QTransform(tr)
+            self._hoverCacheValid = True
+            
+        s = self._hoverTileSize
+        vpt = view.mapFromScene(point)
+        key = (vpt.x() // s, vpt.y() // s)
+        candidates = self._hoverCache.get(key, None)
+        if candidates is None:
+            tile = view.mapToScene(QtCore.QRect(key[0]*s, key[1]*s, s, s)).boundingRect()
+            items = self.items(tile, QtCore.Qt.IntersectsItemBoundingRect, QtCore.Qt.DescendingOrder, tr)
+            candidates = []
+            for item in items:
+                if not hasattr(item, 'hoverEvent'):
+                    continue
+                shape = item.shape()
+                if shape is None:
+                    continue
+                candidates.append((absZValue(item), item, item.mapToScene(shape)))
+            candidates.sort(key=lambda c: c[0], reverse=True)
+            candidates = [(c[1], c[2]) for c in candidates]
+            self._hoverCache[key] = candidates
+        return candidates
+        
+    def invalidateHoverCache(self, *args):
+        """Discard cached hover candidates. Called automatically when the scene changes."""
+        self._hoverCacheValid = False
+        
     def getViewWidget(self):
         return self.views()[0]
     
@@ -0,0 +1,214 @@
+from pyqtgraph.Qt import QtCore, QtGui
+import pyqtgraph.ptime as ptime
+import weakref, collections
+
+__all__ = ['PaintMonitor']
+
+
+class PaintMonitor(QtCore.QObject):
+    """
+    Opt-in instrumentation that measures how long each item in a GraphicsScene takes
+    to paint, and how often the scene is redrawn. Usually created with
+    :func:`GraphicsScene.setPaintMonitoring() <pyqtgraph.GraphicsScene.setPaintMonitoring>`.
+
+    The paint() method of every item in the scene is replaced (on the instance only) by
+    a wrapper that records the time spent in the original method. Items added to the
+    scene later are wrapped at the start of the next frame. A frame begins each time
+    the scene emits sigPrepareForPaint (ie, once per GraphicsView repaint).
+
+    For each item, the number of paints, total / max / last paint time and the number
+    of path elements drawn (for items that keep a QPainterPath in *item.path*) are
+    recorded. Times are also accumulated per item class, and per frame.
+
+    Results are available from :func:`frameStats`, :func:`itemStats` and
+    :func:`classStats`, or can be displayed with a
+    :class:`PaintStatsItem <pyqtgraph.PaintStatsItem>` overlay.
+
+    ====================  ============================================================
+    **Signals:**
+    sigFrame(self)        Emitted at the start of each frame, after the statistics of
+                          the previous frame have been recorded.
+    ====================  ============================================================
+    """
+
+    sigFrame = QtCore.Signal(object)
+
+    def __init__(self, scene, historyLength=300):
+        """
+        *historyLength* is the number of frames kept for computing frame statistics.
+        """
+        QtCore.QObject.__init__(self)
+        self.scene = weakref.ref(scene)
+        self.records = weakref.WeakKeyDictionary()   ## item: PaintRecord
+        self.classRecords = {}                        ## class name: [count, total, max]
+        self.frameIntervals = collections.deque(maxlen=historyLength)   ## time between frame starts
+        self.framePaintTimes = collections.deque(maxlen=historyLength)  ## time spent in item paint methods
+        self.lastFrameTime = None
+        self.framePaintTime = 0.0
+        self.frameCount = 0
+        scene.sigPrepareForPaint.connect(self.frameStarted)
+        self.wrapItems()
+
+    def wrapItems(self):
+        ## instrument any items in the scene that have not been wrapped yet
+        scene = self.scene()
+        if scene is None:
+            return
+        for item in scene.items():
+            if item in self.records or getattr(item, 'paintMonitorIgnore', False):
+                continue
+            self.wrap(item)
+
+    def wrap(self, item):
+        rec = PaintRecord(item)
+        self.records[item] = rec
+        ## Call the class's method through a weak reference, so that the wrapper
+        ## (stored in the instance's __dict__) does not keep the item alive.
+        func = type(item).paint
+        ref = weakref.ref(item)
+        monitor = self
+        def paint(p, *args):
+            it = ref()
+            t0 = ptime.time()
+            try:
+                return func(it, p, *args)
+            finally:
+                monitor.recordPaint(rec, it, ptime.time() - t0)
+        item.paint = paint
+
+    def detach(self):
+        """Restore the original paint methods of all items and stop monitoring."""
+        for item in list(self.records.keys()):
+            try:
+                del item.paint
+            except AttributeError:
+                pass
+        self.records = weakref.WeakKeyDictionary()
+        scene = self.scene()
+        if scene is not None:
+            try:
+                scene.sigPrepareForPaint.disconnect(self.frameStarted)
+            except (TypeError, RuntimeError):
+                pass
+
+    def recordPaint(self, rec, item, dt):
+        rec.count += 1
+        rec.total += dt
+        rec.last = dt
+        if dt > rec.max:
+            rec.max = dt
+        path = getattr(item, 'path', None)
+        if isinstance(path, QtGui.QPainterPath):
+            rec.elements = path.elementCount()
+        cls = self.classRecords.get(rec.className, None)
+        if cls is None:
+            cls = [0, 0.0, 0.0]
+            self.classRecords[rec.className] = cls
+        cls[0] += 1
+        cls[1] += dt
+        cls[2] = max(cls[2], dt)
+        self.framePaintTime += dt
+
+    def frameStarted(self):
+        now = ptime.time()
+        if self.lastFrameTime is not None:
+            self.frameIntervals.append(now - self.lastFrameTime)
+            self.framePaintTimes.append(self.framePaintTime)
+        self.lastFrameTime = now
+        self.framePaintTime = 0.0
+        self.frameCount += 1
+        self.wrapItems()
+        self.sigFrame.emit(self)
+
+    def frameStats(self):
+        """
+        Return a dict describing recent frames (up to historyLength):
+
+        ================  ==============================================================
+        frames            Total number of frames seen
+        fps               Frames per second (from the mean interval between frames)
+        meanInterval      Mean / max time (s) from the start of one frame to the next
+        maxInterval
+        meanPaintTime     Mean / max / most recent time (s) spent in paint() methods of
+        maxPaintTime      monitored items per frame
+        lastPaintTime
+        ================  ==============================================================
+        """
+        intervals = list(self.frameIntervals)
+        paints = list(self.framePaintTimes)
+        stats = {'frames': self.frameCount, 'fps': 0.0, 'meanInterval': 0.0, 'maxInterval': 0.0,
+                 'meanPaintTime': 0.0, 'maxPaintTime': 0.0, 'lastPaintTime': 0.0}
+        if len(intervals) > 0:
+            mean = sum(intervals) / len(intervals)
+            stats['meanInterval'] = mean
+            stats['maxInterval'] = max(intervals)
+            stats['fps'] = 1.0 / mean if mean > 0 else 0.0
+            stats['meanPaintTime'] = sum(paints) / len(paints)
+            stats['maxPaintTime'] = max(paints)
+            stats['lastPaintTime'] = paints[-1]
+        return stats
+
+    def itemStats(self, sort='total', num=None):
+        """
+        Return a list of dicts (name, className, count, total, mean, max, last, elements),
+        one per painted item, sorted by *sort* in decreasing order. Times are in seconds.
+        """
+        stats = []
+        for rec in list(self.records.values()):
+            if rec.count == 0:
+                continue
+            stats.append({'name': rec.name, 'className': rec.className, 'count': rec.count,
+                          'total': rec.total, 'mean': rec.total / rec.count, 'max': rec.max,
+                          'last': rec.last, 'elements': rec.elements})
+        stats.sort(key=lambda s: s[sort], reverse=True)
+        if num is not None:
+            stats = stats[:num]
+        return stats
+
+    def classStats(self):
+        """Return a dict {className: {'count', 'total', 'mean', 'max'}}; times are in seconds."""
+        return dict([(name, {'count': c, 'total': t, 'mean': t / c, 'max': m})
+                     for name, (c, t, m) in self.classRecords.items() if c > 0])
+
+    def overBudget(self, budget=0.016):
+        """Return itemStats() for items whose most recent paint took longer than *budget* seconds."""
+        return [s for s in self.itemStats(sort='last') if s['last'] > budget]
+
+    def reset(self):
+        """Clear all statistics (items remain instrumented)."""
+        for rec in self.records.values():
+            rec.reset()
+        self.classRecords = {}
+        self.frameIntervals.clear()
+        self.framePaintTimes.clear()
+        self.lastFrameTime = None
+        self.framePaintTime = 0.0
+        self.frameCount = 0
+
+
+class PaintRecord(object):
+    ## Paint statistics for a single item
+    def __init__(self, item):
+        self.className = type(item).__name__
+        name = None
+        opts = getattr(item, 'opts', None)
+        if isinstance(opts, dict):
+            name = opts.get('name', None)
+        if name is None:
+            name = getattr(item, 'name', None)
+            if callable(name):
+                try:
+                    name = name()
+                except Exception:
+                    name = None
+        if not isinstance(name, basestring):
+            name = None
+        self.name = "%s(%s) 0x%x" % (self.className, name, id(item)) if name else "%s 0x%x" % (self.className, id(item))
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.elements = None
@@ -1 +1,2 @@
 from .GraphicsScene import *
+from .PaintMonitor import *
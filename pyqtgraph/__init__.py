@@ -54,14 +54,19 @@ CONFIG_OPTIONS = {
     'editorCommand': None,  ## command used to invoke code editor from ConsoleWidgets
     'useWeave': True,       ## Use weave to speed up some operations, if it is available
     'weaveDebug': False,    ## Print full error message if weave compile fails
+    'profile': os.environ.get('PYQTGRAPH_PROFILE', '') not in ('', '0'),  ## collect timing from all debug.Profilers (see debug.setProfiling)
 } 
 
 
 def setConfigOption(opt, value):
     CONFIG_OPTIONS[opt] = value
+    if opt == 'profile':
+        from . import debug
+        debug.setProfiling(value)
 
 def setConfigOptions(**opts):
-    CONFIG_OPTIONS.update(opts)
+    for k, v in opts.items():
+        setConfigOption(k, v)
 
 def getConfigOption(opt):
     return CONFIG_OPTIONS[opt]
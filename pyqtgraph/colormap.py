@@ -1,5 +1,4 @@
 import numpy as np
-import scipy.interpolate
 from pyqtgraph.Qt import QtGui, QtCore
 
 class ColorMap(object):
@@ -70,6 +69,7 @@ class ColorMap(object):
             mode = np.ones(len(pos))
         self.mode = mode
         self.stopsCache = {}
+        self.lutCache = {}
         
     def map(self, data, mode='byte'):
         """
@@ -91,16 +91,21 @@ class ColorMap(object):
             pos, color = self.getStops(self.BYTE)
         else:
             pos, color = self.getStops(mode)
-            
-        data = np.clip(data, pos.min(), pos.max())
-            
-        if not isinstance(data, np.ndarray):
-            interp = scipy.interpolate.griddata(pos, color, np.array([data]))[0]
-        else:
-            interp = scipy.interpolate.griddata(pos, color, data)
+        
+        ## Stops are one-dimensional, so each channel is interpolated independently.
+        scalar = not isinstance(data, np.ndarray)
+        data = np.clip(np.atleast_1d(data), pos.min(), pos.max())
+        interp = np.empty(data.shape + (color.shape[1],), dtype=float)
+        order = np.argsort(pos, kind='mergesort')
+        for i in range(color.shape[1]):
+            interp[..., i] = np.interp(data, pos[order], color[order, i])
+        if color.dtype.kind != 'f':
+            interp = interp.astype(color.dtype)
+        if scalar:
+            interp = interp[0]
         
         if mode == self.QCOLOR:
-            if not isinstance(data, np.ndarray):
+            if scalar:
                 return QtGui.QColor(*interp)
             else:
                 return [QtGui.QColor(*x) for x in interp]
@@ -209,14 +214,19 @@ class ColorMap(object):
         
         if alpha is None:
             alpha = self.usesAlpha()
-            
-        x = np.linspace(start, stop, nPts)
-        table = self.map(x, mode)
         
-        if not alpha:
-            return table[:,:3]
-        else:
-            return table
+        ## Like the stops, tables are cached on the assumption that pos/color are not modified.
+        key = (start, stop, nPts, bool(alpha), mode)
+        if key not in self.lutCache:
+            x = np.linspace(start, stop, nPts)
+            table = self.map(x, mode)
+            if not alpha and mode != self.QCOLOR:
+                table = table[:,:3]
+            self.lutCache[key] = table
+        table = self.lutCache[key]
+        if mode == self.QCOLOR:
+            return list(table)
+        return table.copy()
     
     def usesAlpha(self):
         """Return True if any stops have an alpha < 255"""
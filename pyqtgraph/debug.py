@@ -6,6 +6,7 @@ Distributed under MIT/X11 license. See license.txt for more infomation.
 """
 
 import sys, traceback, time, gc, re, types, weakref, inspect, os, cProfile
+import threading, collections, bisect, json, atexit
 from . import ptime
 from numpy import ndarray
 from .Qt import QtCore, QtGui
@@ -356,11 +357,11 @@ class GarbageWatcher(object):
         return self.objs[item]
 
     
-class Profiler:
+class Profiler(object):
     """Simple profiler allowing measurement of multiple time intervals.
     Arguments:
         msg: message to print at start and finish of profiling
-        disabled: If true, profiler does nothing (so you can leave it in place)
+        disabled: If true, profiler does not print anything (so you can leave it in place)
         delayed: If true, all messages are printed after call to finish()
                  (this can result in more accurate time step measurements)
         globalDelay: if True, all nested profilers delay printing until the top level finishes
@@ -372,17 +373,36 @@ class Profiler:
           ... do other stuff ...
         prof.mark('did other stuff')
         prof.finish()
+        
+    In addition, when profiling has been switched on globally (see 
+    :func:`setProfiling`, the 'profile' config option or the PYQTGRAPH_PROFILE
+    environment variable), every Profiler--including disabled ones--reports its 
+    intervals to a :class:`ProfileCollector`, which aggregates them by call site
+    and can export them as CSV or Chrome trace JSON. While profiling is off, creating
+    a disabled Profiler returns a shared object whose methods do nothing.
     """
     depth = 0
     msgs = []
+    collector = None   ## ProfileCollector in use while global profiling is on
+    
+    def __new__(cls, msg="Profiler", disabled=False, delayed=True, globalDelay=True):
+        if disabled and Profiler.collector is None:
+            return _disabledProfiler
+        return object.__new__(cls)
     
     def __init__(self, msg="Profiler", disabled=False, delayed=True, globalDelay=True):
         self.disabled = disabled
-        if disabled: 
-            return
-        
+        self.name = msg
         self.markCount = 0
         self.finished = False
+        self.collector = Profiler.collector
+        if self.collector is not None:
+            self.collector.start(self)
+        if disabled:
+            self.t0 = ptime.time()
+            self.t1 = self.t0
+            return
+        
         self.depth = Profiler.depth 
         Profiler.depth += 1
         if not globalDelay:
@@ -398,14 +418,17 @@ class Profiler:
         self.t1 = self.t0
     
     def mark(self, msg=None):
-        if self.disabled: 
-            return
-        
         if msg is None:
             msg = str(self.markCount)
         self.markCount += 1
         
         t1 = ptime.time()
+        if self.collector is not None:
+            self.collector.mark(self, msg, self.t1, t1)
+        if self.disabled: 
+            self.t1 = t1
+            return
+        
         msg2 = "  "+self.msg+" "+msg+" "+"%gms" % ((t1-self.t1)*1000)
         if self.delayed:
             self.msgs.append(msg2)
@@ -414,12 +437,17 @@ class Profiler:
         self.t1 = ptime.time()  ## don't measure time it took to print
         
     def finish(self, msg=None):
-        if self.disabled or self.finished: 
+        if self.finished: 
             return
         
         if msg is not None:
             self.mark(msg)
         t1 = ptime.time()
+        self.finished = True
+        if self.collector is not None:
+            self.collector.finish(self, self.t0, t1)
+        if self.disabled:
+            return
         msg = self.msg + ' <<< Finished, total time: %gms' % ((t1-self.t0)*1000)
         if self.delayed:
             self.msgs.append(msg)
@@ -430,10 +458,175 @@ class Profiler:
         else:
             print(msg)
         Profiler.depth = self.depth
-        self.finished = True
         
+        
+class DisabledProfiler(object):
+    ## Stand-in returned by Profiler(..., disabled=True) while global profiling is off
+    disabled = True
+    finished = True
+    
+    def mark(self, msg=None):
+        pass
+    
+    def finish(self, msg=None):
+        pass
+
+_disabledProfiler = DisabledProfiler()
+
+
+class ProfileCollector(object):
+    """
+    Collects the intervals reported by all Profiler instances while global profiling 
+    is enabled (see :func:`setProfiling`).
+    
+    Intervals are aggregated per call site: the name given to the Profiler for its
+    total time, and "name / mark" for each interval ending at a call to mark(). For 
+    each call site, the count, total, min and max duration are kept along with a 
+    histogram of durations (see *histogramBins*). The most recent *maxEvents* 
+    intervals are also kept individually (with their start time and thread) for 
+    export as a Chrome trace, which shows nested profilers as nested spans.
+    """
+    
+    ## upper edges (in ms) of the duration histogram bins; the last bin is unbounded
+    histogramBins = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+    
+    def __init__(self, maxEvents=100000):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}   ## name: [count, total, min, max, histogram]
+        self.events = collections.deque(maxlen=maxEvents)  ## (name, start, duration, threadId, depth)
+        
+    def start(self, prof):
+        ## nesting depth is counted per thread; only the depth is kept, so profilers
+        ## that return without calling finish() are not held here
+        prof.collectDepth = getattr(self.local, 'depth', 0)
+        self.local.depth = prof.collectDepth + 1
+        
+    def mark(self, prof, label, t0, t1):
+        self.record(prof.name + ' / ' + label, t0, t1, prof.collectDepth + 1)
+        
+    def finish(self, prof, t0, t1):
+        ## restoring the depth also discards any nested profilers that were never finished
+        self.local.depth = prof.collectDepth
+        self.record(prof.name, t0, t1, prof.collectDepth)
+        
+    def record(self, name, t0, t1, depth):
+        dt = t1 - t0
+        ind = bisect.bisect_left(self.histogramBins, dt * 1000)
+        with self.lock:
+            st = self.stats.get(name, None)
+            if st is None:
+                st = [0, 0.0, dt, dt, [0] * (len(self.histogramBins) + 1)]
+                self.stats[name] = st
+            st[0] += 1
+            st[1] += dt
+            st[2] = min(st[2], dt)
+            st[3] = max(st[3], dt)
+            st[4][ind] += 1
+            self.events.append((name, t0, dt, threading.current_thread().ident, depth))
+            
+    def reset(self):
+        """Discard all collected data."""
+        with self.lock:
+            self.stats = {}
+            self.events.clear()
             
+    def summary(self):
+        """
+        Return a dict {name: {'count', 'total', 'mean', 'min', 'max', 'histogram'}} of
+        statistics for each call site. Times are in seconds; histogram is a list of 
+        counts for each of histogramBins (plus one for longer durations).
+        """
+        with self.lock:
+            out = {}
+            for name, (count, total, mn, mx, hist) in self.stats.items():
+                out[name] = {'count': count, 'total': total, 'mean': total / count, 
+                             'min': mn, 'max': mx, 'histogram': hist[:]}
+            return out
         
+    def printSummary(self, sort='total', num=30):
+        """Print the *num* call sites with the largest *sort* value ('total', 'mean', 'max' or 'count')."""
+        stats = sorted(self.summary().items(), key=lambda item: item[1][sort], reverse=True)
+        print("%10s %12s %12s %12s  %s" % ('count', 'total (ms)', 'mean (ms)', 'max (ms)', 'name'))
+        for name, st in stats[:num]:
+            print("%10d %12.3f %12.3f %12.3f  %s" % (st['count'], st['total']*1000, st['mean']*1000, st['max']*1000, name))
+            
+    def saveCSV(self, fileName):
+        """Write per-call-site statistics (times in ms) as CSV."""
+        stats = sorted(self.summary().items(), key=lambda item: item[1]['total'], reverse=True)
+        hdr = ['name', 'count', 'total_ms', 'mean_ms', 'min_ms', 'max_ms']
+        hdr += ['le_%gms' % b for b in self.histogramBins] + ['gt_%gms' % self.histogramBins[-1]]
+        lines = [','.join(hdr)]
+        for name, st in stats:
+            row = ['"%s"' % name.replace('"', '""'), str(st['count'])]
+            row += ['%g' % (st[k]*1000) for k in ('total', 'mean', 'min', 'max')]
+            row += list(map(str, st['histogram']))
+            lines.append(','.join(row))
+        fh = open(fileName, 'w')
+        try:
+            fh.write('\n'.join(lines) + '\n')
+        finally:
+            fh.close()
+            
+    def traceEvents(self):
+        """Return the recorded intervals as a list of Chrome trace event dicts."""
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+        return [{'name': name, 'cat': 'pyqtgraph', 'ph': 'X', 'ts': t0 * 1e6, 'dur': dt * 1e6,
+                 'pid': pid, 'tid': tid, 'args': {'depth': depth}}
+                for name, t0, dt, tid, depth in events]
+            
+    def saveTrace(self, fileName):
+        """Write the recorded intervals in Chrome trace JSON format (viewable in 
+        chrome://tracing or other trace viewers)."""
+        fh = open(fileName, 'w')
+        try:
+            json.dump({'traceEvents': self.traceEvents(), 'displayTimeUnit': 'ms'}, fh)
+        finally:
+            fh.close()
+            
+    def save(self, fileName):
+        """Write a trace (for .json files) or statistics (any other extension) to *fileName*."""
+        if fileName.lower().endswith('.json'):
+            self.saveTrace(fileName)
+        else:
+            self.saveCSV(fileName)
+
+
+def setProfiling(enable=True, maxEvents=100000):
+    """
+    Switch global profiling on or off. While on, all Profiler instances (even those
+    created with disabled=True) report to a :class:`ProfileCollector`; see 
+    :func:`profileCollector`. Also available through the 'profile' config option,
+    or by setting the environment variable PYQTGRAPH_PROFILE to 1 (or to a .json or
+    .csv file name, which will be written when the process exits).
+    """
+    global _lastCollector
+    if enable:
+        if Profiler.collector is None:
+            Profiler.collector = ProfileCollector(maxEvents=maxEvents)
+            _lastCollector = Profiler.collector
+    else:
+        Profiler.collector = None
+    
+def profileCollector():
+    """Return the ProfileCollector in use (or most recently used), or None if 
+    profiling has never been enabled."""
+    return _lastCollector
+
+_lastCollector = None
+
+def _saveProfileAtExit(fileName):
+    if _lastCollector is not None:
+        _lastCollector.save(fileName)
+
+_profileEnv = os.environ.get('PYQTGRAPH_PROFILE', '')
+if _profileEnv not in ('', '0'):
+    setProfiling(True)
+    if _profileEnv.lower().endswith(('.json', '.csv')):
+        atexit.register(_saveProfileAtExit, _profileEnv)
+
 
 def profile(code, name='profile_run', sort='cumulative', num=30):
     """Common-use for cProfile"""
@@ -1,4 +1,5 @@
 import pyqtgraph as pg
+import numpy as np
 from pyqtgraph.Qt import QtGui, QtCore
 from .Exporter import Exporter
 from pyqtgraph.parametertree import Parameter
@@ -10,6 +11,7 @@ __all__ = ['CSVExporter']
 class CSVExporter(Exporter):
     Name = "CSV from plot data"
     windows = []
+    chunkSize = 10000  ## number of rows formatted at a time
     def __init__(self, item):
         Exporter.__init__(self, item)
         self.params = Parameter(name='params', type='group', children=[
@@ -29,11 +31,13 @@ class CSVExporter(Exporter):
             self.fileSaveDialog(filter=["*.csv", "*.tsv"])
             return
 
-        fd = open(fileName, 'w')
         data = []
         header = []
         for c in self.item.curves:
-            data.append(c.getData())
+            x, y = c.getData()
+            if x is None:
+                continue
+            data.append((x, y))
             header.extend(['x', 'y'])
 
         if self.params['separator'] == 'comma':
@@ -41,19 +45,39 @@ class CSVExporter(Exporter):
         else:
             sep = '\t'
             
-        fd.write(sep.join(header) + '\n')
-        i = 0
         numFormat = '%%0.%dg' % self.params['precision']
-        numRows = reduce(max, [len(d[0]) for d in data])
-        for i in range(numRows):
-            for d in data:
-                if i < len(d[0]):
-                    fd.write(numFormat % d[0][i] + sep + numFormat % d[1][i] + sep)
-                else:
-                    fd.write(' %s %s' % (sep, sep))
-            fd.write('\n')
-        fd.close()
+        fd = open(fileName, 'w')
+        try:
+            fd.write(sep.join(header) + '\n')
+            writeColumns(fd, data, numFormat, sep, self.chunkSize)
+        finally:
+            fd.close()
 
-        
-                
-        
+
+def writeColumns(fd, data, numFormat, sep, chunkSize=10000):
+    """
+    Write a list of (x, y) array pairs to *fd* as text columns.
+    
+    Rows are formatted *chunkSize* at a time by applying a single repeated format
+    string to the whole chunk, so memory use is bounded by the chunk size rather than 
+    the length of the data. Curves that are shorter than the longest curve are padded
+    with blank cells.
+    """
+    if len(data) == 0:
+        return
+    lengths = [len(d[0]) for d in data]
+    numRows = max(lengths)
+    
+    ## Split the rows into segments over which the set of curves having data is constant
+    bounds = sorted(set([0] + lengths))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        present = [i for i in range(len(data)) if lengths[i] >= stop]
+        rowFormat = ''.join([(numFormat + sep + numFormat + sep) if i in present else (' %s %s' % (sep, sep)) for i in range(len(data))]) + '\n'
+        for i in range(start, stop, chunkSize):
+            j = min(i + chunkSize, stop)
+            cols = []
+            for k in present:
+                cols.append(data[k][0][i:j])
+                cols.append(data[k][1][i:j])
+            chunk = np.column_stack(cols)
+            fd.write((rowFormat * (j-i)) % tuple(chunk.ravel().tolist()))
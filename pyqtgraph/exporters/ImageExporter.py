@@ -3,6 +3,7 @@ from pyqtgraph.parametertree import Parameter
 from pyqtgraph.Qt import QtGui, QtCore, QtSvg
 import pyqtgraph as pg
 import numpy as np
+import struct, zlib
 
 __all__ = ['ImageExporter']
 
@@ -23,6 +24,9 @@ class ImageExporter(Exporter):
             {'name': 'height', 'type': 'int', 'value': tr.height(), 'limits': (0, None)},
             {'name': 'antialias', 'type': 'bool', 'value': True},
             {'name': 'background', 'type': 'color', 'value': bg},
+            {'name': 'tile size', 'type': 'int', 'value': 0, 'limits': (0, None), 
+             'tip': 'If > 0, render the image in tiles of this size and stream them to a PNG file.\n'
+                    'Use this for images too large to hold in memory.'},
         ])
         self.params.param('width').sigValueChanged.connect(self.widthChanged)
         self.params.param('height').sigValueChanged.connect(self.heightChanged)
@@ -51,6 +55,9 @@ class ImageExporter(Exporter):
             self.fileSaveDialog(filter=filter)
             return
             
+        if self.params['tile size'] > 0:
+            return self.exportTiled(fileName, toBytes, copy)
+            
         targetRect = QtCore.QRect(0, 0, self.params['width'], self.params['height'])
         sourceRect = self.getSourceRect()
         
@@ -87,5 +94,112 @@ class ImageExporter(Exporter):
             return self.png
         else:
             self.png.save(fileName)
+
+    def exportTiled(self, fileName=None, toBytes=False, copy=False):
+        """
+        Render the image one tile at a time and stream the result to a PNG file
+        (or to bytes if *toBytes* is True). Memory use is bounded by one row of 
+        tiles regardless of the total image size.
+        """
+        if copy:
+            raise Exception("Tiled export can not be copied to the clipboard; export to a file instead.")
+        if fileName is not None and not fileName.lower().endswith('.png'):
+            raise Exception("Tiled export only supports PNG files.")
+            
+        width = self.params['width']
+        height = self.params['height']
+        tileSize = self.params['tile size']
+        sourceRect = self.getSourceRect()
+        origTargetRect = self.getTargetRect()
+        resolutionScale = float(width) / origTargetRect.width()
+        sx = sourceRect.width() / float(width)
+        sy = sourceRect.height() / float(height)
+        
+        if toBytes:
+            import io
+            fh = io.BytesIO()
+        else:
+            fh = open(fileName, 'wb')
+        try:
+            writer = PNGStreamWriter(fh, width, height)
+            strip = np.empty((min(tileSize, height), width, 4), dtype=np.ubyte)
+            try:
+                ## items keep a reference to opts; renderTile sets the painter for each tile
+                opts = {'antialias': self.params['antialias'], 'background': self.params['background'], 'resolutionScale': resolutionScale}
+                self.setExportMode(True, opts)
+                for y in range(0, height, tileSize):
+                    th = min(tileSize, height - y)
+                    for x in range(0, width, tileSize):
+                        tw = min(tileSize, width - x)
+                        tile = self.renderTile(tw, th, QtCore.QRectF(
+                            sourceRect.x() + x * sx, sourceRect.y() + y * sy, tw * sx, th * sy), opts)
+                        arr = pg.imageToArray(tile, transpose=False)
+                        strip[:th, x:x+tw] = arr[..., [2,1,0,3]]  ## BGRA -> RGBA
+                    writer.writeRows(strip[:th])
+            finally:
+                self.setExportMode(False)
+            writer.finish()
+            if toBytes:
+                return fh.getvalue()
+        finally:
+            fh.close()
+    
+    def renderTile(self, width, height, sourceRect, opts):
+        ## Render the region *sourceRect* of the scene into a new QImage of the given size.
+        ## *opts* is the dict passed to setExportMode; items read the painter from it
+        ## to determine their device transform.
+        img = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32)
+        img.fill(self.params['background'].rgba())
+        painter = QtGui.QPainter(img)
+        opts['painter'] = painter
+        try:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing, self.params['antialias'])
+            self.render(painter, QtCore.QRectF(0, 0, width, height), sourceRect)
+        finally:
+            del opts['painter']
+            painter.end()
+        return img
+
+
+class PNGStreamWriter(object):
+    """
+    Minimal PNG encoder that writes an 8-bit RGBA image to a file handle in horizontal
+    strips, so the complete image never needs to exist in memory.
+    """
+    def __init__(self, fh, width, height):
+        self.fh = fh
+        self.width = width
+        self.height = height
+        self.rowsWritten = 0
+        self.compressor = zlib.compressobj(6)
+        fh.write(b'\x89PNG\r\n\x1a\n')
+        ## 8 bits per sample, color type 6 (RGBA), no interlace
+        self.writeChunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        
+    def writeChunk(self, tag, data):
+        self.fh.write(struct.pack('>I', len(data)))
+        self.fh.write(tag)
+        self.fh.write(data)
+        self.fh.write(struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+        
+    def writeRows(self, rows):
+        """Append rows to the image. *rows* must be a ubyte array of shape (nRows, width, 4)."""
+        n = rows.shape[0]
+        if rows.shape[1:] != (self.width, 4):
+            raise ValueError("Rows must have shape (n, %d, 4); got %s" % (self.width, str(rows.shape)))
+        if self.rowsWritten + n > self.height:
+            raise ValueError("Too many rows written to PNG (height is %d)" % self.height)
+        ## prepend filter type 0 (none) to each scanline
+        data = np.empty((n, self.width*4 + 1), dtype=np.ubyte)
+        data[:, 0] = 0
+        data[:, 1:] = rows.reshape(n, self.width*4)
+        comp = self.compressor.compress(data)
+        if len(comp) > 0:
+            self.writeChunk(b'IDAT', comp)
+        self.rowsWritten += n
         
-        
\ No newline at end of file
+    def finish(self):
+        if self.rowsWritten != self.height:
+            raise ValueError("PNG is incomplete: %d of %d rows written" % (self.rowsWritten, self.height))
+        self.writeChunk(b'IDAT', self.compressor.flush())
+        self.writeChunk(b'IEND', b'')
@@ -0,0 +1,86 @@
+import pyqtgraph as pg
+import numpy as np
+from pyqtgraph.Qt import QtGui, QtCore
+from .Exporter import Exporter
+from pyqtgraph.parametertree import Parameter
+
+
+__all__ = ['NumpyExporter']
+
+
+class NumpyExporter(Exporter):
+    """
+    Export the data of all curves in a PlotItem to numpy's binary formats.
+
+    ==================  ==================================================================
+    **Formats:**
+    npz                 One array per curve, named x0, y0, x1, y1, ... Curves may have
+                        different lengths.
+    npy (memmap)        A single 2D array with columns (x0, y0, x1, y1, ...), padded with
+                        NaN where a curve is shorter than the longest one. The file is
+                        written through a memory map and can be opened the same way with
+                        ``np.load(fileName, mmap_mode='r')``.
+    ==================  ==================================================================
+    """
+    Name = "Numpy binary from plot data"
+    windows = []
+    chunkSize = 1000000  ## number of rows copied at a time when writing npy files
+
+    def __init__(self, item):
+        Exporter.__init__(self, item)
+        self.params = Parameter(name='params', type='group', children=[
+            {'name': 'format', 'type': 'list', 'value': 'npz', 'values': ['npz', 'npy (memmap)']},
+            {'name': 'compressed', 'type': 'bool', 'value': False},
+        ])
+
+    def parameters(self):
+        return self.params
+
+    def export(self, fileName=None):
+
+        if not isinstance(self.item, pg.PlotItem):
+            raise Exception("Must have a PlotItem selected for numpy export.")
+
+        if fileName is None:
+            self.fileSaveDialog(filter=["*.npz", "*.npy"])
+            return
+
+        data = []
+        for c in self.item.curves:
+            x, y = c.getData()
+            if x is None:
+                continue
+            data.append((x, y))
+
+        if self.params['format'] == 'npz':
+            self.writeNpz(fileName, data)
+        else:
+            self.writeNpy(fileName, data)
+
+    def writeNpz(self, fileName, data):
+        arrays = {}
+        for i, (x, y) in enumerate(data):
+            arrays['x%d' % i] = x
+            arrays['y%d' % i] = y
+        if self.params['compressed']:
+            np.savez_compressed(fileName, **arrays)
+        else:
+            np.savez(fileName, **arrays)
+
+    def writeNpy(self, fileName, data):
+        numRows = max([len(d[0]) for d in data] + [0])
+        dtype = np.result_type(*([d[0] for d in data] + [d[1] for d in data] + [np.float32]))
+        if dtype.kind not in 'fc':
+            dtype = np.dtype(float)  ## need NaN for padding
+        out = np.lib.format.open_memmap(fileName, mode='w+', dtype=dtype, shape=(numRows, 2*len(data)))
+        ## copy in blocks of rows so that pages are written out sequentially
+        for start in range(0, numRows, self.chunkSize):
+            stop = min(start + self.chunkSize, numRows)
+            for i, (x, y) in enumerate(data):
+                for j, col in enumerate((x, y)):
+                    n = min(len(col), stop)
+                    if n > start:
+                        out[start:n, 2*i+j] = col[start:n]
+                    out[max(n, start):stop, 2*i+j] = np.nan
+            out.flush()
+        del out
@@ -2,6 +2,7 @@ from .Exporter import Exporter
 from pyqtgraph.parametertree import Parameter
 from pyqtgraph.Qt import QtGui, QtCore, QtSvg
 import pyqtgraph as pg
+import pyqtgraph.functions as fn
 import re
 import xml.dom.minidom as xml
 import numpy as np
@@ -17,6 +18,8 @@ class SVGExporter(Exporter):
         Exporter.__init__(self, item)
         #tr = self.getTargetRect()
         self.params = Parameter(name='params', type='group', children=[
+            {'name': 'compact curves', 'type': 'bool', 'value': False, 
+             'tip': 'Write plot curves directly as decimated <path> elements (much smaller files for large data)'},
             #{'name': 'width', 'type': 'float', 'value': tr.width(), 'limits': (0, None)},
             #{'name': 'height', 'type': 'float', 'value': tr.height(), 'limits': (0, None)},
             #{'name': 'viewbox clipping', 'type': 'bool', 'value': True},
@@ -82,7 +85,7 @@ class SVGExporter(Exporter):
         ## Qt's SVG generator is not complete. (notably, it lacks clipping)
         ## Instead, we will use Qt to generate SVG for each item independently,
         ## then manually reconstruct the entire document.
-        xml = generateSvg(self.item)
+        xml = generateSvg(self.item, compactCurves=self.params['compact curves'])
         
         if toBytes:
             return xml.encode('UTF-8')
@@ -104,10 +107,20 @@ xmlHeader = """\
 </defs>
 """
 
-def generateSvg(item):
+def generateSvg(item, compactCurves=False):
+    """
+    Return an SVG document (as a string) representing *item* and its children.
+    
+    If *compactCurves* is True, PlotCurveItems with a plain solid pen are written
+    directly as <path> elements rather than being rendered through QSvgGenerator.
+    Their data is decimated to the pixel resolution of the export, keeping the first,
+    last, minimum and maximum point in each pixel column, and consecutive curves 
+    drawn with identical style are merged into a single path.
+    """
     global xmlHeader
+    opts = {'compactCurves': compactCurves, 'compactPaths': set()}
     try:
-        node = _generateItemSvg(item)
+        node = _generateItemSvg(item, options=opts)
     finally:
         ## reset export mode for all items in the tree
         if isinstance(item, QtGui.QGraphicsScene):
@@ -121,11 +134,13 @@ def generateSvg(item):
                 i.setExportMode(False)
     
     cleanXml(node)
+    if compactCurves:
+        mergePaths(node, opts['compactPaths'])
     
     return xmlHeader + node.toprettyxml(indent='    ') + "\n</svg>\n"
 
 
-def _generateItemSvg(item, nodes=None, root=None):
+def _generateItemSvg(item, nodes=None, root=None, options=None):
     ## This function is intended to work around some issues with Qt's SVG generator
     ## and SVG in general.
     ## 1) Qt SVG does not implement clipping paths. This is absurd.
@@ -163,6 +178,9 @@ def _generateItemSvg(item, nodes=None, root=None):
         
     if root is None:
         root = item
+        
+    if options is None:
+        options = {}
                 
     ## Skip hidden items
     if hasattr(item, 'isVisible') and not item.isVisible():
@@ -172,6 +190,12 @@ def _generateItemSvg(item, nodes=None, root=None):
     if hasattr(item, 'generateSvg'):
         return item.generateSvg(nodes)
     
+    ## Plot curves can be written directly from their data
+    if options.get('compactCurves', False) and isinstance(item, pg.PlotCurveItem) and len(item.childItems()) == 0:
+        g1 = _generateCurveSvg(item, root, options)
+        if g1 is not None:
+            g1.setAttribute('id', _uniqueName(item, nodes, g1))
+            return g1
 
     ## Generate SVG text for just this item (exclude its children; we'll handle them later)
     tr = QtGui.QTransform()
@@ -185,16 +209,7 @@ def _generateItemSvg(item, nodes=None, root=None):
         childs = item.childItems()
     else:
         childs = item.childItems()
-        tr = itemTransform(item, item.scene())
-        
-        ## offset to corner of root item
-        if isinstance(root, QtGui.QGraphicsScene):
-            rootPos = QtCore.QPoint(0,0)
-        else:
-            rootPos = root.scenePos()
-        tr2 = QtGui.QTransform()
-        tr2.translate(-rootPos.x(), -rootPos.y())
-        tr = tr * tr2
+        tr = exportTransform(item, root)
         #print item, pg.SRTTransform(tr)
 
         #tr.translate(item.pos().x(), item.pos().y())
@@ -252,14 +267,7 @@ def _generateItemSvg(item, nodes=None, root=None):
     #correctStroke(g1, item, root)
     
     ## decide on a name for this item
-    baseName = item.__class__.__name__
-    i = 1
-    while True:
-        name = baseName + "_%d" % i
-        if name not in nodes:
-            break
-        i += 1
-    nodes[name] = g1
+    name = _uniqueName(item, nodes, g1)
     g1.setAttribute('id', name)
     
     ## If this item clips its children, we need to take care of that.
@@ -294,7 +302,7 @@ def _generateItemSvg(item, nodes=None, root=None):
     ## Add all child items as sub-elements.
     childs.sort(key=lambda c: c.zValue())
     for ch in childs:
-        cg = _generateItemSvg(ch, nodes, root)
+        cg = _generateItemSvg(ch, nodes, root, options)
         if cg is None:
             continue
         childGroup.appendChild(cg)  ### this isn't quite right--some items draw below their parent (good enough for now)
@@ -302,6 +310,149 @@ def _generateItemSvg(item, nodes=None, root=None):
     prof.finish()
     return g1
 
+def _uniqueName(item, nodes, node):
+    ## decide on a unique name for the node generated for item
+    baseName = item.__class__.__name__
+    i = 1
+    while True:
+        name = baseName + "_%d" % i
+        if name not in nodes:
+            break
+        i += 1
+    nodes[name] = node
+    return name
+
+def exportTransform(item, root):
+    ## Return the transformation mapping item coordinates to the exported document
+    tr = itemTransform(item, item.scene())
+    
+    ## offset to corner of root item
+    if isinstance(root, QtGui.QGraphicsScene):
+        rootPos = QtCore.QPoint(0,0)
+    else:
+        rootPos = root.scenePos()
+    tr2 = QtGui.QTransform()
+    tr2.translate(-rootPos.x(), -rootPos.y())
+    return tr * tr2
+
+def _generateCurveSvg(item, root, options):
+    ## Generate a single <path> for a PlotCurveItem directly from its data.
+    ## Returns None if the curve uses features that are only handled by QSvgGenerator
+    ## (fill, shadow pen, step mode, dashed pens).
+    opts = item.opts
+    pen = fn.mkPen(opts['pen'])
+    spen = opts['shadowPen']
+    if (opts['fillLevel'] is not None and opts['brush'] is not None) or opts['stepMode']:
+        return None
+    if spen is not None and fn.mkPen(spen).style() != QtCore.Qt.NoPen:
+        return None
+    if pen.style() not in (QtCore.Qt.SolidLine, QtCore.Qt.NoPen):
+        return None
+    
+    doc = xml.parseString("<g>\n</g>\n")
+    g1 = doc.documentElement
+    if pen.style() == QtCore.Qt.NoPen:
+        return g1
+    
+    x, y = item.getData()
+    if x is None or len(x) < 2:
+        return g1
+    
+    ## map data to document coordinates
+    tr = exportTransform(item, root)
+    m = np.array([[tr.m11(), tr.m21(), tr.m31()], [tr.m12(), tr.m22(), tr.m32()]])
+    pts = fn.transformCoordinates(m, np.vstack([x, y]).astype(float))
+    pts = pts[:, np.isfinite(pts).all(axis=0)]
+    pts = decimateToPixels(pts[0], pts[1])
+    if pts.shape[1] < 2:
+        return g1
+    
+    ## stroke width in document coordinates
+    w = pen.widthF()
+    if pen.isCosmetic():
+        w = max(w, 1.0)
+    else:
+        s = fn.transformCoordinates(m, np.array([[w, 0], [0, 0]]), transpose=True)
+        w = ((s[0]-s[1])**2).sum()**0.5
+    color = pen.color()
+    
+    path = doc.createElement('path')
+    path.setAttribute('fill', 'none')
+    path.setAttribute('stroke', '#%02x%02x%02x' % (color.red(), color.green(), color.blue()))
+    path.setAttribute('stroke-opacity', '%0.3g' % color.alphaF())
+    path.setAttribute('stroke-width', '%0.3g' % w)
+    path.setAttribute('stroke-linecap', 'square')
+    path.setAttribute('stroke-linejoin', 'bevel')
+    path.setAttribute('d', pathString(pts))
+    g1.appendChild(path)
+    options['compactPaths'].add(path)
+    return g1
+
+def decimateToPixels(x, y, pxSize=1.0):
+    """
+    Reduce a polyline given in document coordinates to at most 4 points per run of 
+    consecutive points that fall within the same pixel column (first, min, max and last),
+    preserving the visible envelope of the curve.
+    """
+    n = len(x)
+    if n < 5:
+        return np.vstack([x, y])
+    col = np.floor(x / pxSize)
+    starts = np.empty(n, dtype=bool)
+    starts[0] = True
+    starts[1:] = col[1:] != col[:-1]
+    runId = np.cumsum(starts) - 1
+    firsts = np.argwhere(starts)[:,0]
+    lasts = np.empty_like(firsts)
+    lasts[:-1] = firsts[1:] - 1
+    lasts[-1] = n - 1
+    order = np.lexsort((y, runId))  ## sorted by run, then by y within each run
+    mins = order[firsts]
+    maxs = order[lasts]
+    keep = np.unique(np.concatenate([firsts, lasts, mins, maxs]))
+    return np.vstack([x[keep], y[keep]])
+
+def pathString(pts):
+    ## Format a 2xN array of points as SVG path data in a single string operation
+    n = pts.shape[1]
+    fmt = 'M%0.2f,%0.2f' + ' %0.2f,%0.2f' * (n-1)
+    return fmt % tuple(pts.T.ravel().tolist())
+
+def mergePaths(node, compactPaths):
+    ## Merge consecutive sibling groups that contain only a compact curve path with 
+    ## identical style into a single <path> element.
+    children = [ch for ch in node.childNodes if isinstance(ch, xml.Element)]
+    prev = None
+    for ch in children:
+        path = _soloPath(ch, compactPaths)
+        if path is None:
+            prev = None
+            mergePaths(ch, compactPaths)
+            continue
+        if prev is not None and _pathStyle(prev) == _pathStyle(path):
+            prev.setAttribute('d', prev.getAttribute('d') + ' ' + path.getAttribute('d'))
+            node.removeChild(ch)
+        else:
+            prev = path
+
+def _soloPath(node, compactPaths):
+    ## If node is a compact path, or a chain of plain groups around exactly one, return the path.
+    while True:
+        if node in compactPaths:
+            return node
+        if node.tagName != 'g':
+            return None
+        for attr in ('transform', 'clip-path', 'opacity', 'mask', 'filter'):
+            if node.hasAttribute(attr):
+                return None
+        elems = [ch for ch in node.childNodes if isinstance(ch, xml.Element)]
+        if len(elems) != 1:
+            return None
+        node = elems[0]
+
+def _pathStyle(path):
+    return [(k, v) for k, v in sorted(path.attributes.items()) if k != 'd']
+
 def correctCoordinates(node, item):
     ## Remove transformation matrices from <g> tags by applying matrix to coordinates inside.
     groups = node.getElementsByTagName('g')
@@ -395,6 +395,13 @@ def affineSlice(data, shape, origin, vectors, axes, order=1, returnCoords=False,
     --------------------------------------------------------------------------------------------------------------------
     ==============  ====================================================================================================
     
+    If the slice is axis-aligned (*vectors* are the unit vectors of *axes*), starts on an integer 
+    location and lies entirely inside *data*, no interpolation is needed and the result is a plain
+    strided view of *data*. Otherwise, with the default linear interpolation, all values along the
+    extra (non-sliced) axes are interpolated at once; the sample coordinates and interpolation 
+    weights for the most recent set of slice parameters are cached, so repeated calls with the 
+    same ROI (for example, on different data) do not recompute them.
+    
     Note the following must be true: 
         
         | len(shape) == len(vectors) 
@@ -424,7 +431,7 @@ def affineSlice(data, shape, origin, vectors, axes, order=1, returnCoords=False,
         if len(v) != len(axes):
             raise Exception("each vector must be same length as axes.")
         
-    shape = list(map(np.ceil, shape))
+    shape = [int(np.ceil(x)) for x in shape]
 
     ## transpose data so slice axes come first
     trAx = list(range(data.ndim))
@@ -437,26 +444,55 @@ def affineSlice(data, shape, origin, vectors, axes, order=1, returnCoords=False,
     
 
     ## make sure vectors are arrays
-    if not isinstance(vectors, np.ndarray):
-        vectors = np.array(vectors)
-    if not isinstance(origin, np.ndarray):
-        origin = np.array(origin)
-    origin.shape = (len(axes),) + (1,)*len(shape)
-    
-    ## Build array of sample locations. 
-    grid = np.mgrid[tuple([slice(0,x) for x in shape])]  ## mesh grid of indexes
-    #print shape, grid.shape
-    x = (grid[np.newaxis,...] * vectors.transpose()[(Ellipsis,) + (np.newaxis,)*len(shape)]).sum(axis=1)  ## magic
-    x += origin
-    #print "X values:"
-    #print x
-    ## iterate manually over unused axes since map_coordinates won't do it for us
+    vectors = np.array(vectors, dtype=float)
+    origin = np.array(origin, dtype=float)
     extraShape = data.shape[len(axes):]
-    output = np.empty(tuple(shape) + extraShape, dtype=data.dtype)
-    for inds in np.ndindex(*extraShape):
-        ind = (Ellipsis,) + inds
-        #print data[ind].shape, x.shape, output[ind].shape, output.shape
-        output[ind] = scipy.ndimage.map_coordinates(data[ind], x, order=order, **kargs)
+    
+    ## For batched interpolation, view the data as one row per slice plane (extra axes first). 
+    ## This is only possible without copying if the slice axes are contiguous in memory.
+    rows = None
+    if order == 1 and len(kargs) == 0:
+        rows = data.transpose(tuple(range(len(axes), data.ndim)) + tuple(range(len(axes)))).view()
+        try:
+            rows.shape = (int(np.prod(extraShape)), int(np.prod(data.shape[:len(axes)])))
+        except AttributeError:
+            rows = None
+    
+    ## Fast path: an axis-aligned, pixel-aligned slice that is entirely inside the data 
+    ## is just a strided view.
+    start = np.round(origin)
+    if (len(shape) == len(axes) and 
+        np.all(np.abs(vectors - np.eye(len(axes))) < 1e-9) and
+        np.all(np.abs(origin - start) < 1e-6) and
+        np.all(start >= 0) and
+        np.all(start + np.array(shape) <= data.shape[:len(axes)])):
+        start = start.astype(int)
+        output = data[tuple([slice(start[i], start[i]+shape[i]) for i in range(len(shape))])]
+        x = None
+        if returnCoords:
+            x = _affineSliceCoords(shape, vectors, origin)[0]
+    elif rows is not None:
+        x, corners = _affineSliceCoords(shape, vectors, origin, data.shape[:len(axes)])
+        ## Linear interpolation of all extra axes at once: for each corner of the 
+        ## interpolation cells, gather the same set of samples from every row and 
+        ## accumulate with the corner's weight.
+        accType = np.float32 if data.dtype in (np.float32, np.float16) else np.float64
+        acc = np.zeros((rows.shape[0], int(np.prod(shape))), dtype=accType)
+        for inds, weight in corners:
+            acc += np.take(rows, inds, axis=1) * weight.astype(accType)
+        if data.dtype.kind in 'iub':
+            ## map_coordinates rounds half away from zero when casting to integer types
+            acc = np.where(acc < 0, np.ceil(acc - 0.5), np.floor(acc + 0.5))
+        output = acc.astype(data.dtype).reshape(extraShape + tuple(shape))
+        output = output.transpose(tuple(range(len(extraShape), output.ndim)) + tuple(range(len(extraShape))))
+    else:
+        x = _affineSliceCoords(shape, vectors, origin)[0]
+        ## iterate manually over unused axes since map_coordinates won't do it for us
+        output = np.empty(tuple(shape) + extraShape, dtype=data.dtype)
+        for inds in np.ndindex(*extraShape):
+            ind = (Ellipsis,) + inds
+            #print data[ind].shape, x.shape, output[ind].shape, output.shape
+            output[ind] = scipy.ndimage.map_coordinates(data[ind], x, order=order, **kargs)
     
     tr = list(range(output.ndim))
     trb = []
@@ -473,6 +509,50 @@ def affineSlice(data, shape, origin, vectors, axes, order=1, returnCoords=False,
     else:
         return output
 
+
+AffineSliceCache = None
+
+def _affineSliceCoords(shape, vectors, origin, dataShape=None):
+    ## Return the array of sample locations used by affineSlice (len(axes), *shape). 
+    ## If *dataShape* is given, also return a list of (indexes, weights) for the 
+    ## 2**len(axes) corners used for linear interpolation into an array of that shape.
+    ## The result for the most recent set of arguments is cached.
+    global AffineSliceCache
+    key = (tuple(shape), tuple(vectors.ravel()), tuple(origin.ravel()), 
+           None if dataShape is None else tuple(dataShape))
+    if AffineSliceCache is not None and AffineSliceCache[0] == key:
+        return AffineSliceCache[1]
+    
+    ## Build array of sample locations. 
+    grid = np.mgrid[tuple([slice(0,x) for x in shape])]  ## mesh grid of indexes
+    x = (grid[np.newaxis,...] * vectors.transpose()[(Ellipsis,) + (np.newaxis,)*len(shape)]).sum(axis=1)  ## magic
+    x += origin.reshape((len(origin),) + (1,)*len(shape))
+    
+    corners = None
+    if dataShape is not None:
+        ## Samples outside the data are 0 (map_coordinates' default mode='constant', cval=0.0).
+        ## Each corner is stored as (flat index into a slice plane of the data, weight).
+        dataShape = tuple(dataShape)
+        flat = x.reshape(len(dataShape), -1)
+        inside = np.ones(flat.shape[1], dtype=bool)
+        for ax in range(len(dataShape)):
+            inside &= (flat[ax] >= 0) & (flat[ax] <= dataShape[ax]-1)
+        base = np.floor(flat).astype(np.intp)
+        frac = flat - base
+        corners = []
+        for offset in np.ndindex(*(2,)*len(dataShape)):
+            weight = inside.astype(float)
+            inds = []
+            for ax, o in enumerate(offset):
+                weight *= frac[ax] if o else 1.0 - frac[ax]
+                inds.append(np.clip(base[ax] + o, 0, dataShape[ax]-1))
+            if not np.any(weight):
+                continue
+            corners.append((np.ravel_multi_index(inds, dataShape), weight))
+    
+    AffineSliceCache = (key, (x, corners))
+    return x, corners
+
 def transformToArray(tr):
     """
     Given a QTransform, return a 3x3 numpy array.
@@ -1053,8 +1133,9 @@ def arrayToQPath(x, y, connect='all'):
     """Convert an array of x,y coordinats to QPainterPath as efficiently as possible.
     The *connect* argument may be 'all', indicating that each point should be
     connected to the next; 'pairs', indicating that each pair of points
-    should be connected, or an array of int32 values (0 or 1) indicating
-    connections.
+    should be connected; 'finite', indicating that points are connected except
+    where either one is NaN or infinite; or an array of int32 values (0 or 1) 
+    in which connect[i] indicates whether point i+1 is connected to point i.
     """
     
     ## Create all vertices in path. The method used below creates a binary format so that all 
@@ -1076,70 +1157,176 @@ def arrayToQPath(x, y, connect='all'):
     
     path = QtGui.QPainterPath()
     
-    #prof = debug.Profiler('PlotCurveItem.generatePath', disabled=True)
     if sys.version_info[0] == 2:   ## So this is disabled for python 3... why??
         n = x.shape[0]
-        # create empty array, pad with extra space on either end
-        arr = np.empty(n+2, dtype=[('x', '>f8'), ('y', '>f8'), ('c', '>i4')])
-        # write first two integers
-        #prof.mark('allocate empty')
-        arr.data[12:20] = struct.pack('>ii', n, 0)
-        #prof.mark('pack header')
+        arr = _pathRecordArray(n)
         # Fill array with vertex values
         arr[1:-1]['x'] = x
         arr[1:-1]['y'] = y
         
         # decide which points are connected by lines
-        if connect == 'pairs':
-            connect = np.empty((n/2,2), dtype=np.int32)
-            connect[:,0] = 1
-            connect[:,1] = 0
-            connect = connect.flatten()
-            
-        if connect == 'all':
+        connect = _connectArray(x, y, connect)
+        if connect is None:
             arr[1:-1]['c'] = 1
-        elif isinstance(connect, np.ndarray):
-            arr[1:-1]['c'] = connect
         else:
-            raise Exception('connect argument must be "all", "pairs", or array')
+            arr[1:-1]['c'] = connect
             
-        #prof.mark('fill array')
-        # write last 0
-        lastInd = 20*(n+1)
-        arr.data[lastInd:lastInd+4] = struct.pack('>i', 0)
-        #prof.mark('footer')
-        # create datastream object and stream into path
-        buf = QtCore.QByteArray(arr.data[12:lastInd+4])  # I think one unnecessary copy happens here
-        #prof.mark('create buffer')
-        ds = QtCore.QDataStream(buf)
-        #prof.mark('create datastream')
-        ds >> path
-        #prof.mark('load')
-        
-        #prof.finish()
+        path = _recordArrayToQPath(arr)
     else:
         ## This does exactly the same as above, but less efficiently (and more simply).
-        path.moveTo(x[0], y[0])
-        if connect == 'all':
-            for i in range(1, y.shape[0]):
+        ## As in the binary format, connect[i] determines whether vertex i+1 is joined to vertex i.
+        ## Non-finite vertices are skipped, as they are when the binary format is loaded.
+        n = y.shape[0]
+        connect = _connectArray(x, y, connect)
+        finite = np.isfinite(x) & np.isfinite(y)
+        for i in range(n):
+            if not finite[i]:
+                continue
+            if i > 0 and (connect is None or connect[i-1] == 1):
                 path.lineTo(x[i], y[i])
-        elif connect == 'pairs':
-            for i in range(1, y.shape[0]):
-                if i%2 == 0:
-                    path.lineTo(x[i], y[i])
-                else:
-                    path.moveTo(x[i], y[i])
-        elif isinstance(connect, np.ndarray):
-            for i in range(1, y.shape[0]):
-                if connect[i] == 1:
-                    path.lineTo(x[i], y[i])
-                else:
-                    path.moveTo(x[i], y[i])
-        else:
-            raise Exception('connect argument must be "all", "pairs", or array')
+            else:
+                path.moveTo(x[i], y[i])
             
     return path
 
+
+def _connectArray(x, y, connect):
+    ## Interpret the *connect* argument to arrayToQPath: return None if all points are 
+    ## connected, otherwise an array in which element i is 1 if vertex i+1 is joined to vertex i.
+    if isinstance(connect, np.ndarray):
+        return connect
+    n = len(x)
+    if connect == 'all':
+        return None
+    if connect == 'pairs':
+        pairs = np.zeros(n, dtype=np.int32)
+        pairs[::2] = 1
+        return pairs
+    if connect == 'finite':
+        ## Qt skips non-finite vertices; break the line on either side of them
+        finite = np.isfinite(x) & np.isfinite(y)
+        conn = np.zeros(n, dtype=np.int32)
+        conn[:-1] = finite[:-1] & finite[1:]
+        return conn
+    raise Exception('connect argument must be "all", "pairs", "finite", or array')
+
+
+def _pathRecordArray(n):
+    ## Allocate a record array in the binary QPainterPath format described in 
+    ## arrayToQPath, with the header for *n* vertices already written. 
+    ## Vertices go in arr[1:-1]; the first and last records are padding that 
+    ## hold the header and footer.
+    arr = np.empty(n+2, dtype=[('x', '>f8'), ('y', '>f8'), ('c', '>i4')])
+    arr.data[12:20] = struct.pack('>ii', n, 0)
+    return arr
+
+
+def _recordArrayToQPath(arr, fillRule=0):
+    ## Stream an array created by _pathRecordArray (with its vertices filled in) into a new QPainterPath.
+    ## *fillRule* is written after the last record (0 is Qt.OddEvenFill, 1 is Qt.WindingFill).
+    n = len(arr) - 2
+    # write fill rule
+    lastInd = 20*(n+1)
+    arr.data[lastInd:lastInd+4] = struct.pack('>i', fillRule)
+    # create datastream object and stream into path
+    buf = QtCore.QByteArray(arr.data[12:lastInd+4])  # I think one unnecessary copy happens here
+    ds = QtCore.QDataStream(buf)
+    path = QtGui.QPainterPath()
+    ds >> path
+    return path
+
+
+def _stepCoords(x, y, fillLevel, xOut, yOut):
+    ## Write the vertices of a step curve (len(x) == len(y)+1) into xOut, yOut, which
+    ## must have length 2*len(y), or 2*len(y)+2 if fillLevel is not None.
+    if fillLevel is None:
+        xOut[0::2] = x[:-1]
+        xOut[1::2] = x[1:]
+        yOut[0::2] = y
+        yOut[1::2] = y
+    else:
+        xOut[0::2] = x
+        xOut[1::2] = x
+        yOut[0] = fillLevel
+        yOut[-1] = fillLevel
+        yOut[1:-1:2] = y
+        yOut[2:-1:2] = y
+
+
+def stepArrayToQPath(x, y, fillLevel=None):
+    """
+    Return a QPainterPath that draws *y* as a step function (histogram), where *x*
+    gives the edges of each step (len(x) must be len(y)+1).
+    
+    If *fillLevel* is given, the path starts at (x[0], fillLevel) and ends at 
+    (x[-1], fillLevel), so that it can be filled directly to draw the area between
+    the steps and *fillLevel*. The first and last elements of the path may later be moved
+    with QPainterPath.setElementPositionAt() if the fill level changes.
+    
+    The vertices are written directly into the buffer that the path is loaded from
+    (where supported; see :func:`arrayToQPath`), without building intermediate 
+    x and y arrays.
+    """
+    n = len(y)
+    if n == 0:
+        return QtGui.QPainterPath()
+    nVerts = 2*n if fillLevel is None else 2*n+2
+    if sys.version_info[0] == 2:
+        arr = _pathRecordArray(nVerts)
+        verts = arr[1:-1]
+        _stepCoords(x, y, fillLevel, verts['x'], verts['y'])
+        verts['c'] = 1
+        return _recordArrayToQPath(arr)
+    else:
+        x2 = np.empty(nVerts, dtype=np.float64)
+        y2 = np.empty(nVerts, dtype=np.float64)
+        _stepCoords(x, y, fillLevel, x2, y2)
+        return arrayToQPath(x2, y2, connect='all')
+
+def tiledQPath(path, x, y, scale=1.0):
+    """
+    Return a single QPainterPath containing one copy of *path* for each point (x[i], y[i]).
+    Each copy is scaled by *scale* (a single value or an array with one value per point),
+    then translated to its point. The returned path uses the WindingFill rule, so that
+    overlapping copies are filled instead of cancelling each other out.
+    
+    This is useful for drawing many copies of the same symbol with a single call to 
+    QPainter.drawPath(). Where supported (see :func:`arrayToQPath`), the elements 
+    of all copies are computed with array operations and streamed into the path at once.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    out = QtGui.QPainterPath()
+    out.setFillRule(QtCore.Qt.WindingFill)
+    n = len(x)
+    k = path.elementCount()
+    if n == 0 or k == 0:
+        return out
+    scale = np.asarray(scale, dtype=np.float64).ravel()
+    if len(scale) == 1:
+        scale = np.repeat(scale, n)
+    
+    if sys.version_info[0] == 2:
+        elements = [path.elementAt(i) for i in range(k)]
+        ex = np.array([e.x for e in elements])
+        ey = np.array([e.y for e in elements])
+        types = np.array([int(e.type) for e in elements], dtype=np.int32)
+        arr = _pathRecordArray(n*k)
+        arr[1:-1]['x'] = (ex[np.newaxis, :] * scale[:, np.newaxis] + x[:, np.newaxis]).ravel()
+        arr[1:-1]['y'] = (ey[np.newaxis, :] * scale[:, np.newaxis] + y[:, np.newaxis]).ravel()
+        ## the element type of vertex i is stored in arr[i]['c'] (just before its coordinates);
+        ## the value following the last vertex is the index of the element that starts the 
+        ## last subpath, and the fill rule is written after that (see _recordArrayToQPath).
+        arr[:-2]['c'] = np.tile(types, n)
+        moves = np.argwhere(types == int(QtGui.QPainterPath.MoveToElement))
+        arr[-2]['c'] = (n-1)*k + (moves[-1,0] if len(moves) > 0 else 0)
+        return _recordArrayToQPath(arr, fillRule=int(QtCore.Qt.WindingFill))
+    else:
+        for i in range(n):
+            tr = QtGui.QTransform(scale[i], 0, 0, scale[i], x[i], y[i])
+            out.addPath(tr.map(path))
+        return out
+
 #def isosurface(data, level):
     #"""
     #Generate isosurface from volumetric data using marching tetrahedra algorithm.
@@ -1245,7 +1432,10 @@ def isocurve(data, level, connected=False, extendToEdge=False, path=False):
                   vertex coordinates. This forces connected=True.
     ============= =========================================================
     
-    This function is SLOW; plenty of room for optimization here.
+    All grid cells are processed at once with array operations. Each cut edge of 
+    the grid yields a single vertex that is shared by the (at most two) segments 
+    touching it, and segments are oriented consistently so that the connected 
+    curves can be assembled without searching.
     """    
     
     if path is True:
@@ -1264,149 +1454,169 @@ def isocurve(data, level, connected=False, extendToEdge=False, path=False):
         d2[-1,-1] = d2[-1,-2]
         data = d2
     
-    sideTable = [
-    [],
-    [0,1],
-    [1,2],
-    [0,2],
-    [0,3],
-    [1,3],
-    [0,1,2,3],
-    [2,3],
-    [2,3],
-    [0,1,2,3],
-    [1,3],
-    [0,3],
-    [0,2],
-    [1,2],
-    [0,1],
-    []
-    ]
-    
-    edgeKey=[
-    [(0,1), (0,0)],
-    [(0,0), (1,0)],
-    [(1,0), (1,1)],
-    [(1,1), (0,1)]
-    ]
-    
-    
-    lines = []
+    segTable = _isocurveTables()
     
     ## mark everything below the isosurface level
     mask = data < level
     
     ### make four sub-fields and compute indexes for grid cells
     index = np.zeros([x-1 for x in data.shape], dtype=np.ubyte)
-    fields = np.empty((2,2), dtype=object)
     slices = [slice(0,-1), slice(1,None)]
     for i in [0,1]:
         for j in [0,1]:
-            fields[i,j] = mask[slices[i], slices[j]]
-            #vertIndex = i - 2*j*i + 3*j + 4*k  ## this is just to match Bourk's vertex numbering scheme
-            vertIndex = i+2*j
-            #print i,j,k," : ", fields[i,j,k], 2**vertIndex
-            index += fields[i,j] * 2**vertIndex
-            #print index
-    #print index
-    
-    ## add lines
-    for i in range(index.shape[0]):                 # data x-axis
-        for j in range(index.shape[1]):             # data y-axis     
-            sides = sideTable[index[i,j]]
-            for l in range(0, len(sides), 2):     ## faces for this grid cell
-                edges = sides[l:l+2]
-                pts = []
-                for m in [0,1]:      # points in this face
-                    p1 = edgeKey[edges[m]][0] # p1, p2 are points at either side of an edge
-                    p2 = edgeKey[edges[m]][1]
-                    v1 = data[i+p1[0], j+p1[1]] # v1 and v2 are the values at p1 and p2
-                    v2 = data[i+p2[0], j+p2[1]]
-                    f = (level-v1) / (v2-v1)
-                    fi = 1.0 - f
-                    p = (    ## interpolate between corners
-                        p1[0]*fi + p2[0]*f + i + 0.5, 
-                        p1[1]*fi + p2[1]*f + j + 0.5
-                        )
-                    if extendToEdge:
-                        ## check bounds
-                        p = (
-                            min(data.shape[0]-2, max(0, p[0]-1)),
-                            min(data.shape[1]-2, max(0, p[1]-1)),                        
-                        )
-                    if connected:
-                        gridKey = i + (1 if edges[m]==2 else 0), j + (1 if edges[m]==3 else 0), edges[m]%2
-                        pts.append((p, gridKey))  ## give the actual position and a key identifying the grid location (for connecting segments)
-                    else:
-                        pts.append(p)
-                
-                lines.append(pts)
-
+            index += mask[slices[i], slices[j]].astype(np.ubyte) << (i+2*j)
+    
+    ## Generate one vertex for each cut edge of the grid. Edges along the first axis
+    ## (from [i,j] to [i+1,j]) are numbered first, then edges along the second axis.
+    cut0 = np.argwhere(mask[:-1] != mask[1:])
+    cut1 = np.argwhere(mask[:, :-1] != mask[:, 1:])
+    ids0 = np.empty((data.shape[0]-1, data.shape[1]), dtype=np.int32)
+    ids1 = np.empty((data.shape[0], data.shape[1]-1), dtype=np.int32)
+    ids0[cut0[:,0], cut0[:,1]] = np.arange(len(cut0))
+    ids1[cut1[:,0], cut1[:,1]] = np.arange(len(cut0), len(cut0)+len(cut1))
+    
+    verts = np.empty((len(cut0)+len(cut1), 2), dtype=float)
+    for ax, cut, vslice in [(0, cut0, slice(0, len(cut0))), (1, cut1, slice(len(cut0), None))]:
+        v1 = data[cut[:,0], cut[:,1]].astype(float)
+        cut[:,ax] += 1
+        v2 = data[cut[:,0], cut[:,1]]
+        cut[:,ax] -= 1
+        verts[vslice] = cut + 0.5
+        verts[vslice, ax] += (level-v1) / (v2-v1)   ## interpolate between corners
+    del cut0, cut1
+    if extendToEdge:
+        ## check bounds
+        verts -= 1
+        for ax in [0,1]:
+            np.clip(verts[:,ax], 0, data.shape[ax]-2, out=verts[:,ax])
+    
+    ## Generate segments (as pairs of vertex IDs) for each cell that is crossed by the curve
+    flatIndex = index.ravel()
+    cells = np.nonzero((flatIndex != 0) & (flatIndex != 15))[0]
+    segs = segTable[flatIndex[cells]]    ## (cells, 2 segments, 2 sides)
+    valid = segs[:, :, 0] >= 0
+    sides = segs[valid]
+    cells = np.repeat(cells[:, np.newaxis], 2, axis=1)[valid]
+    ci = np.repeat((cells // index.shape[1])[:, np.newaxis], 2, axis=1)
+    cj = np.repeat((cells % index.shape[1])[:, np.newaxis], 2, axis=1)
+    segments = np.empty(sides.shape, dtype=np.intp)
+    ## cell side -> (edge ID table, offset of the edge from the cell origin)
+    for side, (ids, di, dj) in enumerate([(ids1, 0, 0), (ids0, 0, 0), (ids1, 1, 0), (ids0, 0, 1)]):
+        m = sides == side
+        segments[m] = ids[ci[m]+di, cj[m]+dj]
+    
     if not connected:
-        return lines
-                
+        return verts[segments].tolist()  ## a list of pairs of points
+    
     ## turn disjoint list of segments into continuous lines
-
-    #lines = [[2,5], [5,4], [3,4], [1,3], [6,7], [7,8], [8,6], [11,12], [12,15], [11,13], [13,14]]
-    #lines = [[(float(a), a), (float(b), b)] for a,b in lines]
-    points = {}  ## maps each point to its connections
-    for a,b in lines:
-        if a[1] not in points:
-            points[a[1]] = []
-        points[a[1]].append([a,b])
-        if b[1] not in points:
-            points[b[1]] = []
-        points[b[1]].append([b,a])
-
-    ## rearrange into chains
-    for k in list(points.keys()):
-        try:
-            chains = points[k]
-        except KeyError:   ## already used this point elsewhere
-            continue
-        #print "===========", k
-        for chain in chains:
-            #print "  chain:", chain
-            x = None
-            while True:
-                if x == chain[-1][1]:
-                    break ## nothing left to do on this chain
-                    
-                x = chain[-1][1]
-                if x == k:  
-                    break ## chain has looped; we're done and can ignore the opposite chain
-                y = chain[-2][1]
-                connects = points[x]
-                for conn in connects[:]:
-                    if conn[1][1] != y:
-                        #print "    ext:", conn
-                        chain.extend(conn[1:])
-                #print "    del:", x
-                del points[x]
-            if chain[0][1] == chain[-1][1]:  # looped chain; no need to continue the other direction
-                chains.pop()
-                break
-                
-
-    ## extract point locations 
-    lines = []
-    for chain in points.values():
-        if len(chain) == 2:
-            chain = chain[1][1:][::-1] + chain[0]  # join together ends of chain
-        else:
-            chain = chain[0]
-        lines.append([p[0] for p in chain])
+    prev = np.empty(len(verts), dtype=np.intp)
+    prev[:] = -1
+    prev[segments[:,1]] = segments[:,0]
+    order, starts, closed = _orderChains(prev)
     
-    if not path:
-        return lines ## a list of pairs of points
+    ## repeat the first point at the end of each closed loop
+    ends = np.append(starts[1:], len(order))
+    order = np.insert(order, ends[closed], order[starts[closed]])
+    starts = starts + np.concatenate([[0], np.cumsum(closed)[:-1]]).astype(starts.dtype)
+    pts = verts[order]
     
-    path = QtGui.QPainterPath()
-    for line in lines:
-        path.moveTo(*line[0])
-        for p in line[1:]:
-            path.lineTo(*p)
-    
-    return path
+    if not path:
+        if len(pts) == 0:
+            return []
+        return [line.tolist() for line in np.split(pts, starts[1:])]
+    
+    if len(pts) == 0:
+        return QtGui.QPainterPath()
+    ## connect[i] == 0 breaks the line between vertex i and i+1 (see arrayToQPath)
+    ends = np.append(starts[1:], len(pts))
+    connect = np.ones(len(pts), dtype=np.int32)
+    connect[ends-1] = 0
+    return arrayToQPath(pts[:,0], pts[:,1], connect=connect)
+
+
+IsocurveDataCache = None
+
+def _isocurveTables():
+    ## Build the table of line segments for each of the 16 cell types: 
+    ## (16, 2 segments, 2 sides) with -1 marking unused segments. 
+    ## Cell sides are numbered 0: (0,0)-(0,1), 1: (0,0)-(1,0), 2: (1,0)-(1,1), 3: (0,1)-(1,1); 
+    ## corner (i,j) contributes bit i+2*j to the cell type.
+    ## Segments are oriented so that the region below the isosurface level is always
+    ## on the same side; consequently each vertex starts at most one segment and ends 
+    ## at most one segment.
+    global IsocurveDataCache
+    if IsocurveDataCache is None:
+        sideTable = [
+        [],
+        [0,1],
+        [1,2],
+        [0,2],
+        [0,3],
+        [1,3],
+        [0,1,2,3],
+        [2,3],
+        [2,3],
+        [0,1,2,3],
+        [1,3],
+        [0,3],
+        [0,2],
+        [1,2],
+        [0,1],
+        []
+        ]
+        sideCenters = np.array([[0, 0.5], [0.5, 0], [1, 0.5], [0.5, 1]])
+        sharedCorner = {(0,1): (0,0), (1,2): (1,0), (2,3): (1,1), (0,3): (0,1)}
+        segTable = np.empty((16, 2, 2), dtype=np.intp)
+        segTable[:] = -1
+        for case, sides in enumerate(sideTable):
+            for s in range(0, len(sides), 2):
+                a, b = sides[s:s+2]
+                ## check which side of the segment a reference corner lies on
+                corner = sharedCorner.get((a, b), (0, 0))
+                below = (case >> (corner[0] + 2*corner[1])) & 1 == 1
+                d1 = sideCenters[b] - sideCenters[a]
+                d2 = np.array(corner) - sideCenters[a]
+                if (d1[0]*d2[1] - d1[1]*d2[0] > 0) != below:
+                    a, b = b, a
+                segTable[case, s//2] = (a, b)
+        IsocurveDataCache = segTable
+    return IsocurveDataCache
+
+
+def _orderChains(prev):
+    ## Given the predecessor of each vertex in a set of disjoint chains and loops (-1 for
+    ## the first vertex of a chain), return:
+    ##   - the vertex IDs sorted chain by chain, each chain in order
+    ##   - the position in that array at which each chain starts
+    ##   - a boolean array indicating which chains are closed loops
+    ## Uses pointer jumping, so the number of passes grows only with log(len(prev)).
+    n = len(prev)
+    ids = np.arange(n)
+    nJumps = int(np.ceil(np.log2(max(n, 2)))) + 1
+    
+    ## find loops: jumping along prev, vertexes of an open chain converge on its first vertex
+    ## while vertexes on a loop keep circulating. Break each loop at its lowest vertex ID.
+    ptr = np.where(prev < 0, ids, prev)
+    low = ids.copy()
+    for i in range(nJumps):
+        low = np.minimum(low, low[ptr])
+        ptr = ptr[ptr]
+    onLoop = prev[ptr] >= 0
+    prev = prev.copy()
+    prev[onLoop & (low == ids)] = -1
+    
+    ## list ranking: distance of each vertex from the start of its chain
+    isStart = prev < 0
+    ptr = np.where(isStart, ids, prev)
+    rank = (~isStart).astype(np.intp)
+    for i in range(nJumps):
+        rank = rank + rank[ptr]
+        ptr = ptr[ptr]
+    
+    order = np.lexsort((rank, ptr))
+    first = ptr[order]
+    starts = np.nonzero(np.concatenate([[True], first[1:] != first[:-1]]))[0] if n > 0 else np.zeros(0, dtype=np.intp)
+    return order, starts, onLoop[first[starts]]
     
     
 def traceImage(image, values, smooth=0.5):
@@ -1433,30 +1643,34 @@ def traceImage(image, values, smooth=0.5):
     for i in range(diff.shape[-1]):    
         d = (labels==i).astype(float)
         d = ndi.gaussian_filter(d, (smooth, smooth))
-        lines = isocurve(d, 0.5, connected=True, extendToEdge=True)
-        path = QtGui.QPainterPath()
-        for line in lines:
-            path.moveTo(*line[0])
-            for p in line[1:]:
-                path.lineTo(*p)
-        
-        paths.append(path)
+        paths.append(isocurve(d, 0.5, extendToEdge=True, path=True))
     return paths
     
     
     
 IsosurfaceDataCache = None
-def isosurface(data, level):
+def isosurface(data, level, chunkSize=None, threads=1, meshData=False):
     """
     Generate isosurface from volumetric data using marching cubes algorithm.
     See Paul Bourke, "Polygonising a Scalar Field"  
     (http://paulbourke.net/geometry/polygonise/)
     
-    *data*   3D numpy array of scalar values
-    *level*  The level at which to generate an isosurface
+    ============== ================================================================
+    **Arguments:**
+    data           3D numpy array of scalar values
+    level          The level at which to generate an isosurface
+    chunkSize      Number of grid cells along the first axis of *data* to process
+                   at a time. Working memory is proportional to one slab of this
+                   size (per thread) rather than to the whole volume. By default, 
+                   slabs of roughly 4M voxels are used.
+    threads        Number of threads used to process slabs concurrently.
+    meshData       If True, return a :class:`MeshData <pyqtgraph.opengl.MeshData>` 
+                   object instead of arrays.
+    ============== ================================================================
     
     Returns an array of vertex coordinates (Nv, 3) and an array of 
-    per-face vertex indexes (Nf, 3)    
+    per-face vertex indexes (Nf, 3). Vertexes are shared between adjacent faces
+    (one vertex per cut edge of the grid), including across slab boundaries.
     """
     ## For improvement, see:
     ## 
@@ -1464,6 +1678,65 @@ def isosurface(data, level):
     ## Thomas Lewiner, Helio Lopes, Antonio Wilson Vieira and Geovan Tavares.
     ## Journal of Graphics Tools 8(2): pp. 1-15 (december 2003)
     
+    data = np.asarray(data)
+    nCells = data.shape[0] - 1
+    if chunkSize is None:
+        chunkSize = max(1, 2**22 // max(1, data.shape[1] * data.shape[2]))
+    slabs = [(a, min(a+chunkSize, nCells)) for a in range(0, max(nCells, 0), chunkSize)]
+    
+    ## Vertexes are numbered in C order of the cut edges (x, y, z, direction). Each slab
+    ## owns the edges whose first axis index falls in [start, stop) and numbers them
+    ## locally in the same order; edges on its far boundary plane are numbered after
+    ## its own, which is exactly how the next slab numbers them. Adding the running
+    ## vertex count to each slab's face indexes therefore stitches the slabs together.
+    results = [None] * len(slabs)
+    if threads is None or threads <= 1 or len(slabs) < 2:
+        for i, (a, b) in enumerate(slabs):
+            results[i] = _isosurfaceSlab(data, level, a, b, b == nCells)
+    else:
+        import threading
+        queue = list(range(len(slabs)))
+        errors = []
+        def work():
+            while True:
+                try:
+                    i = queue.pop(0)   ## atomic under the GIL
+                except IndexError:
+                    return
+                try:
+                    a, b = slabs[i]
+                    results[i] = _isosurfaceSlab(data, level, a, b, b == nCells)
+                except Exception:
+                    errors.append(sys.exc_info())
+                    return
+        workers = [threading.Thread(target=work) for i in range(min(threads, len(slabs)))]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        if len(errors) > 0:
+            raise errors[0][1]
+    
+    nVerts = sum([r[0].shape[0] for r in results])
+    nFaces = sum([r[1].shape[0] for r in results])
+    vertexes = np.empty((nVerts, 3), dtype=np.float32)
+    faces = np.empty((nFaces, 3), dtype=np.uint32)
+    vptr = 0
+    fptr = 0
+    for verts, slabFaces in results:
+        vertexes[vptr:vptr+len(verts)] = verts
+        faces[fptr:fptr+len(slabFaces)] = slabFaces
+        faces[fptr:fptr+len(slabFaces)] += vptr
+        vptr += len(verts)
+        fptr += len(slabFaces)
+    
+    if meshData:
+        from .opengl.MeshData import MeshData
+        return MeshData(vertexes=vertexes, faces=faces)
+    return vertexes, faces
+
+
+def _isosurfaceTables():
     ## Precompute lookup tables on the first run
     global IsosurfaceDataCache
     if IsosurfaceDataCache is None:
@@ -1788,7 +2061,7 @@ def isosurface(data, level):
             ## compute lookup table of index: vertexes mapping
             faceTableI = np.zeros((len(triTable), i*3), dtype=np.ubyte)
             faceTableInds = np.argwhere(nTableFaces == i)
-            faceTableI[faceTableInds[:,0]] = np.array([triTable[j] for j in faceTableInds])
+            faceTableI[faceTableInds[:,0]] = np.array([triTable[j] for j in faceTableInds[:,0]])
             faceTableI = faceTableI.reshape((len(triTable), i, 3))
             faceShiftTables.append(edgeShifts[faceTableI])
             
@@ -1800,109 +2073,84 @@ def isosurface(data, level):
         
         
         IsosurfaceDataCache = (faceShiftTables, edgeShifts, edgeTable, nTableFaces)
-    else:
-        faceShiftTables, edgeShifts, edgeTable, nTableFaces = IsosurfaceDataCache
-
-
+    return IsosurfaceDataCache
     
-    ## mark everything below the isosurface level
-    mask = data < level
+
+def _isosurfaceSlab(data, level, start, stop, last):
+    ## Run marching cubes over grid cells start:stop along the first axis of *data*.
+    ## Returns (vertexes, faces) with faces indexing into the vertexes of this slab, 
+    ## followed by the vertexes of the boundary plane at *stop* if that plane is 
+    ## owned by the next slab (ie, if *last* is False).
+    faceShiftTables, edgeShifts, edgeTable, nTableFaces = _isosurfaceTables()
+    
+    ## mark everything below the isosurface level. One extra plane is included (if available)
+    ## so that edges on the boundary plane are identified exactly as the next slab will.
+    sub = data[start:stop+2]
+    mask = sub < level
+    n = stop - start + 1  ## number of planes touched by the cells in this slab
     
     ### make eight sub-fields and compute indexes for grid cells
-    index = np.zeros([x-1 for x in data.shape], dtype=np.ubyte)
-    fields = np.empty((2,2,2), dtype=object)
+    index = np.zeros((n-1,) + tuple([x-1 for x in sub.shape[1:]]), dtype=np.ubyte)
     slices = [slice(0,-1), slice(1,None)]
     for i in [0,1]:
         for j in [0,1]:
             for k in [0,1]:
-                fields[i,j,k] = mask[slices[i], slices[j], slices[k]]
                 vertIndex = i - 2*j*i + 3*j + 4*k  ## this is just to match Bourk's vertex numbering scheme
-                index += fields[i,j,k] * 2**vertIndex
+                index += mask[i:n-1+i, slices[j], slices[k]].astype(np.ubyte) << vertIndex
     
-    ### Generate table of edges that have been cut
-    cutEdges = np.zeros([x+1 for x in index.shape]+[3], dtype=np.uint32)
-    edges = edgeTable[index]
-    for i, shift in enumerate(edgeShifts[:12]):        
-        slices = [slice(shift[j],cutEdges.shape[j]+(shift[j]-1)) for j in range(3)]
-        cutEdges[slices[0], slices[1], slices[2], shift[3]] += edges & 2**i
+    ### Find the edges that have been cut: those whose two end points lie on different
+    ### sides of the isosurface. (equivalent to OR-ing edgeTable[index] over all cells)
+    cutEdges = np.zeros((n,) + sub.shape[1:] + (3,), dtype=bool)
+    cutEdges[:sub.shape[0]-1, :, :, 0] = mask[:-1] != mask[1:]
+    cutEdges[:, :-1, :, 1] = mask[:n, :-1] != mask[:n, 1:]
+    cutEdges[:, :, :-1, 2] = mask[:n, :, :-1] != mask[:n, :, 1:]
     
     ## for each cut edge, interpolate to see where exactly the edge is cut and generate vertex positions
-    m = cutEdges > 0
-    vertexInds = np.argwhere(m)   ## argwhere is slow!
+    vertexInds = np.argwhere(cutEdges)
     vertexes = vertexInds[:,:3].astype(np.float32)
-    dataFlat = data.reshape(data.shape[0]*data.shape[1]*data.shape[2])
-    
-    ## re-use the cutEdges array as a lookup table for vertex IDs
-    cutEdges[vertexInds[:,0], vertexInds[:,1], vertexInds[:,2], vertexInds[:,3]] = np.arange(vertexInds.shape[0])
-    
     for i in [0,1,2]:
         vim = vertexInds[:,3] == i
         vi = vertexInds[vim, :3]
-        viFlat = (vi * (np.array(data.strides[:3]) / data.itemsize)[np.newaxis,:]).sum(axis=1)
-        v1 = dataFlat[viFlat]
-        v2 = dataFlat[viFlat + data.strides[i]/data.itemsize]
+        v1 = sub[vi[:,0], vi[:,1], vi[:,2]].astype(np.float64)
+        vi[:,i] += 1
+        v2 = sub[vi[:,0], vi[:,1], vi[:,2]]
         vertexes[vim,i] += (level-v1) / (v2-v1)
+    vertexes[:,0] += start
     
-    ### compute the set of vertex indexes for each face. 
-    
-    ## This works, but runs a bit slower.
-    #cells = np.argwhere((index != 0) & (index != 255))  ## all cells with at least one face
-    #cellInds = index[cells[:,0], cells[:,1], cells[:,2]]
-    #verts = faceTable[cellInds]
-    #mask = verts[...,0,0] != 9
-    #verts[...,:3] += cells[:,np.newaxis,np.newaxis,:]  ## we now have indexes into cutEdges
-    #verts = verts[mask]
-    #faces = cutEdges[verts[...,0], verts[...,1], verts[...,2], verts[...,3]]  ## and these are the vertex indexes we want.
-    
+    ## use a lookup table to map cut edges to vertex IDs
+    edgeIds = np.zeros(cutEdges.shape, dtype=np.uint32)
+    edgeIds[vertexInds[:,0], vertexInds[:,1], vertexInds[:,2], vertexInds[:,3]] = np.arange(vertexInds.shape[0])
+    del cutEdges
     
+    ### compute the set of vertex indexes for each face. 
     ## To allow this to be vectorized efficiently, we count the number of faces in each 
     ## grid cell and handle each group of cells with the same number together.
-    ## determine how many faces to assign to each grid cell
     nFaces = nTableFaces[index]
-    totFaces = nFaces.sum()
+    totFaces = int(nFaces.sum())
     faces = np.empty((totFaces, 3), dtype=np.uint32)
     ptr = 0
-    #import debug
-    #p = debug.Profiler('isosurface', disabled=False)
     
     ## this helps speed up an indexing operation later on
-    cs = np.array(cutEdges.strides)/cutEdges.itemsize
-    cutEdges = cutEdges.flatten()
-
-    ## this, strangely, does not seem to help.
-    #ins = np.array(index.strides)/index.itemsize
-    #index = index.flatten()
-
+    cs = np.array(edgeIds.strides) // edgeIds.itemsize
+    edgeIds = edgeIds.ravel()
+    
     for i in range(1,6):
-        ### expensive:
-        #p.mark('1')
-        cells = np.argwhere(nFaces == i)  ## all cells which require i faces  (argwhere is expensive)
-        #p.mark('2')
+        cells = np.argwhere(nFaces == i)  ## all cells which require i faces
         if cells.shape[0] == 0:
             continue
-        #cellInds = index[(cells*ins[np.newaxis,:]).sum(axis=1)]
         cellInds = index[cells[:,0], cells[:,1], cells[:,2]]   ## index values of cells to process for this round
-        #p.mark('3')
-        
-        ### expensive:
-        verts = faceShiftTables[i][cellInds]
-        #p.mark('4')
-        verts[...,:3] += cells[:,np.newaxis,np.newaxis,:]  ## we now have indexes into cutEdges
+        verts = faceShiftTables[i][cellInds].astype(np.intp)
+        verts[...,:3] += cells[:,np.newaxis,np.newaxis,:]  ## we now have indexes into edgeIds
         verts = verts.reshape((verts.shape[0]*i,)+verts.shape[2:])
-        #p.mark('5')
-        
-        ### expensive:
-        #print verts.shape
         verts = (verts * cs[np.newaxis, np.newaxis, :]).sum(axis=2)
-        #vertInds = cutEdges[verts[...,0], verts[...,1], verts[...,2], verts[...,3]]  ## and these are the vertex indexes we want.
-        vertInds = cutEdges[verts]
-        #p.mark('6')
+        vertInds = edgeIds[verts]
         nv = vertInds.shape[0]
-        #p.mark('7')
-        faces[ptr:ptr+nv] = vertInds #.reshape((nv, 3))
-        #p.mark('8')
+        faces[ptr:ptr+nv] = vertInds
         ptr += nv
-        
+    
+    if not last:
+        ## vertexes on the far boundary plane belong to the next slab
+        vertexes = vertexes[vertexInds[:,0] < n-1]
     return vertexes, faces
 
 
@@ -79,6 +79,13 @@ class AxisItem(GraphicsWidget):
         self.grid = False
         #self.setCacheMode(self.DeviceCoordinateCache)
         
+        ## Caches used to avoid repeating work when the axis is redrawn (see drawPicture).
+        ## Tick values and strings are only cached while tickValues, tickSpacing and
+        ## tickStrings are not overridden.
+        self._tickLevelCache = None   ## (key, tickLevels) for the last automatic tick levels
+        self._tickStringCache = {}    ## (values, scale, spacing, logMode) -> strings
+        self._textCache = {}          ## string -> (QRectF size, QStaticText or None)
+        
     def close(self):
         self.scene().removeItem(self.label)
         self.label = None
@@ -103,6 +110,7 @@ class AxisItem(GraphicsWidget):
         
     def setTickFont(self, font):
         self.tickFont = font
+        self._textCache = {}
         self.picture = None
         self.prepareGeometryChange()
         ## Need to re-allocate space depending on font size?
@@ -591,7 +599,15 @@ class AxisItem(GraphicsWidget):
             return
 
         if self._tickLevels is None:
-            tickLevels = self.tickValues(self.range[0], self.range[1], lengthInPixels)
+            ## the default tick values only depend on the range and length of the axis; 
+            ## subclasses that override tickValues or tickSpacing may depend on other state.
+            if self._isDefaultMethod('tickValues') and self._isDefaultMethod('tickSpacing'):
+                key = (self.range[0], self.range[1], lengthInPixels, self.logMode)
+                if self._tickLevelCache is None or self._tickLevelCache[0] != key:
+                    self._tickLevelCache = (key, self.tickValues(self.range[0], self.range[1], lengthInPixels))
+                tickLevels = self._tickLevelCache[1]
+            else:
+                tickLevels = self.tickValues(self.range[0], self.range[1], lengthInPixels)
             tickStrings = None
         else:
             ## parse self.tickLevels into the formats returned by tickLevels() and tickStrings()
@@ -630,8 +646,13 @@ class AxisItem(GraphicsWidget):
         ## draw three different intervals, long ticks first
         
         for i in range(len(tickLevels)):
-            tickPositions.append([])
             ticks = tickLevels[i][1]
+            
+            ## determine actual position to draw each tick; 
+            ## None marks ticks that fall outside the axis
+            x = np.array(ticks, dtype=float) * xScale - offset
+            visible = (x >= xMin) & (x <= xMax)
+            tickPositions.append([xi if vis else None for xi, vis in zip(x.tolist(), visible)])
         
             ## length of tick
             tickLength = self.tickLength / ((i*0.5)+1.0)
@@ -640,40 +661,36 @@ class AxisItem(GraphicsWidget):
             if self.grid is not False:
                 lineAlpha *= self.grid/255. * np.clip((0.05  * lengthInPixels / (len(ticks)+1)), 0., 1.)
             
-            for v in ticks:
-                ## determine actual position to draw this tick
-                x = (v * xScale) - offset
-                if x < xMin or x > xMax:  ## last check to make sure no out-of-bounds ticks are drawn
-                    tickPositions[i].append(None)
-                    continue
-                tickPositions[i].append(x)
-                
-                p1 = [x, x]
-                p2 = [x, x]
-                p1[axis] = tickStart
-                p2[axis] = tickStop
-                if self.grid is False:
-                    p2[axis] += tickLength*tickDir
-                tickPen = self.pen()
-                color = tickPen.color()
-                color.setAlpha(lineAlpha)
-                tickPen.setColor(color)
-                p.setPen(tickPen)
-                p.drawLine(Point(p1), Point(p2))
+            p2 = tickStop
+            if self.grid is False:
+                p2 += tickLength*tickDir
+            if axis == 0:
+                lines = [QtCore.QLineF(tickStart, xi, p2, xi) for xi in x[visible]]
+            else:
+                lines = [QtCore.QLineF(xi, tickStart, xi, p2) for xi in x[visible]]
+            if len(lines) == 0:
+                continue
+            tickPen = self.pen()
+            color = tickPen.color()
+            color.setAlpha(lineAlpha)
+            tickPen.setColor(color)
+            p.setPen(tickPen)
+            p.drawLines(lines)
         prof.mark('draw ticks')
 
         ## Draw text until there is no more room (or no more text)
         if self.tickFont is not None:
             p.setFont(self.tickFont)
+        p.setPen(self.pen())
         
-        textRects = []
+        textSizes = []
         for i in range(len(tickLevels)):
             ## Get the list of strings to display for this level
             if tickStrings is None:
                 spacing, values = tickLevels[i]
-                strings = self.tickStrings(values, self.scale, spacing)
+                strings = self.cachedTickStrings(values, self.scale, spacing)
             else:
-                strings = tickStrings[i]
+                strings = list(tickStrings[i])
                 
             if len(strings) == 0:
                 continue
@@ -682,47 +699,90 @@ class AxisItem(GraphicsWidget):
             for j in range(len(strings)):
                 if tickPositions[i][j] is None:
                     strings[j] = None
-
-            textRects.extend([p.boundingRect(QtCore.QRectF(0, 0, 100, 100), QtCore.Qt.AlignCenter, str(s)) for s in strings if s is not None])
+            
+            texts = [(x, self.textItem(p, str(s))) for x, s in zip(tickPositions[i], strings) if s is not None]
+            textSizes.extend([t[1][0] for t in texts])
             if i > 0:  ## always draw top level
                 ## measure all text, make sure there's enough room
                 if axis == 0:
-                    textSize = np.sum([r.height() for r in textRects])
+                    textSize = np.sum([r.height() for r in textSizes])
                 else:
-                    textSize = np.sum([r.width() for r in textRects])
+                    textSize = np.sum([r.width() for r in textSizes])
 
                 ## If the strings are too crowded, stop drawing text now
                 textFillRatio = float(textSize) / lengthInPixels
                 if textFillRatio > 0.7:
                     break
-            #spacing, values = tickLevels[best]
-            #strings = self.tickStrings(values, self.scale, spacing)
-            for j in range(len(strings)):
-                vstr = strings[j]
-                if vstr is None: ## this tick was ignored because it is out of bounds
-                    continue
-                vstr = str(vstr)
-                x = tickPositions[i][j]
-                textRect = p.boundingRect(QtCore.QRectF(0, 0, 100, 100), QtCore.Qt.AlignCenter, vstr)
-                height = textRect.height()
+            
+            for x, (size, staticText, vstr) in texts:
+                width = size.width()
+                height = size.height()
                 self.textHeight = height
+                ## top-left corner of the text, aligned next to the tick
                 if self.orientation == 'left':
                     textFlags = QtCore.Qt.AlignRight|QtCore.Qt.AlignVCenter
                     rect = QtCore.QRectF(tickStop-100, x-(height/2), 99-max(0,self.tickLength), height)
+                    pos = QtCore.QPointF(rect.right() - width, rect.top())
                 elif self.orientation == 'right':
                     textFlags = QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter
                     rect = QtCore.QRectF(tickStop+max(0,self.tickLength)+1, x-(height/2), 100-max(0,self.tickLength), height)
+                    pos = QtCore.QPointF(rect.left(), rect.top())
                 elif self.orientation == 'top':
                     textFlags = QtCore.Qt.AlignCenter|QtCore.Qt.AlignBottom
                     rect = QtCore.QRectF(x-100, tickStop-max(0,self.tickLength)-height, 200, height)
+                    pos = QtCore.QPointF(x - width/2., rect.top())
                 elif self.orientation == 'bottom':
                     textFlags = QtCore.Qt.AlignCenter|QtCore.Qt.AlignTop
                     rect = QtCore.QRectF(x-100, tickStop+max(0,self.tickLength), 200, height)
-
-                p.setPen(self.pen())
-                p.drawText(rect, textFlags, vstr)
+                    pos = QtCore.QPointF(x - width/2., rect.top())
+                
+                if staticText is None:
+                    p.drawText(rect, textFlags, vstr)
+                else:
+                    p.drawStaticText(pos, staticText)
         prof.mark('draw text')
         prof.finish()
+    
+    def _isDefaultMethod(self, name):
+        ## True if method *name* has not been overridden by a subclass or on this instance
+        if name in self.__dict__:
+            return False
+        meth = getattr(type(self), name)
+        return getattr(meth, '__func__', meth) is AxisItem.__dict__[name]
+    
+    def cachedTickStrings(self, values, scale, spacing):
+        ## Return tickStrings(values, scale, spacing), reusing the result from a previous 
+        ## call with the same arguments. While panning, the visible tick values (and thus
+        ## their strings) usually stay the same from one frame to the next.
+        ## Overridden tickStrings methods may depend on other state and are always called.
+        if not self._isDefaultMethod('tickStrings'):
+            return self.tickStrings(values, scale, spacing)
+        key = (tuple(values), scale, spacing, self.logMode)
+        strings = self._tickStringCache.get(key, None)
+        if strings is None:
+            if len(self._tickStringCache) > 100:
+                self._tickStringCache.clear()
+            strings = self.tickStrings(values, scale, spacing)
+            self._tickStringCache[key] = strings
+        return list(strings)
+    
+    def textItem(self, p, vstr):
+        ## Return (size, QStaticText, vstr) for a tick string, using the font currently 
+        ## set on painter *p*. The layout of each string is only computed once per font.
+        item = self._textCache.get(vstr, None)
+        if item is None:
+            if len(self._textCache) > 1000:
+                self._textCache.clear()
+            size = p.boundingRect(QtCore.QRectF(0, 0, 100, 100), QtCore.Qt.AlignCenter, vstr).size()
+            if hasattr(QtGui, 'QStaticText'):
+                staticText = QtGui.QStaticText(vstr)
+                staticText.setTextFormat(QtCore.Qt.PlainText)
+                staticText.prepare(QtGui.QTransform(), p.font())
+            else:
+                staticText = None
+            item = (size, staticText, vstr)
+            self._textCache[vstr] = item
+        return item
         
     def show(self):
         
@@ -382,6 +382,7 @@ class GradientEditorItem(TickSliderItem):
         self.backgroundRect = QtGui.QGraphicsRectItem(QtCore.QRectF(0, -self.rectSize, 100, self.rectSize))
         self.backgroundRect.setBrush(QtGui.QBrush(QtCore.Qt.DiagCrossPattern))
         self.colorMode = 'rgb'
+        self._lutCache = None   ## (key, table) for the last lookup table generated
         
         TickSliderItem.__init__(self, *args, **kargs)
         
@@ -654,19 +655,50 @@ class GradientEditorItem(TickSliderItem):
         alpha          True, False, or None - Specifies whether or not alpha values are included 
                        in the table.If alpha is None, alpha will be automatically determined.
         ============= ============================================================================
+        
+        The table is computed for all points at once and cached; requesting the same table
+        again without changing the gradient returns a copy of the cached table.
         """
+        ticks = self.listTicks()
+        stops = tuple([(x, t.color.getRgb()) for t,x in ticks])
         if alpha is None:
-            alpha = self.usesAlpha()
-        if alpha:
-            table = np.empty((nPts,4), dtype=np.ubyte)
-        else:
-            table = np.empty((nPts,3), dtype=np.ubyte)
-            
-        for i in range(nPts):
-            x = float(i)/(nPts-1)
-            color = self.getColor(x, toQColor=False)
-            table[i] = color[:table.shape[1]]
+            alpha = any([c[3] < 255 for x,c in stops])
+        key = (stops, self.colorMode, nPts, bool(alpha))
+        if self._lutCache is None or self._lutCache[0] != key:
+            table = self._computeLookupTable(stops, nPts)
+            if not alpha:
+                table = table[:, :3].copy()
+            self._lutCache = (key, table)
+        return self._lutCache[1].copy()
+        
+    def _computeLookupTable(self, stops, nPts):
+        ## Vectorized equivalent of calling getColor() for each point in the table.
+        pos = np.array([x for x,c in stops], dtype=float)
+        colors = np.array([c for x,c in stops], dtype=float)
+        x = np.arange(nPts) / float(nPts-1)
+        table = np.empty((nPts, 4), dtype=np.ubyte)
+        if len(pos) == 1:
+            table[:] = colors[0]
+            return table
             
+        ## find the pair of ticks surrounding each point, and the fractional distance between them
+        ind = np.clip(np.searchsorted(pos, x, side='left'), 1, len(pos)-1)
+        x1 = pos[ind-1]
+        dx = pos[ind] - x1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = np.where(dx == 0, 0., (x-x1) / dx)[:, np.newaxis]
+        
+        if self.colorMode == 'rgb':
+            table[:] = colors[ind-1] * (1.-f) + colors[ind] * f
+        elif self.colorMode == 'hsv':
+            hsv = np.array([QtGui.QColor(*c).getHsv()[:3] for x,c in stops], dtype=float)
+            hsv = (hsv[ind-1] * (1.-f) + hsv[ind] * f).astype(int)
+            table[:, :3] = _hsvToRgb(hsv[:,0], hsv[:,1], hsv[:,2])
+            table[:, 3] = 255
+        
+        ## points beyond the first and last ticks take the color of that tick
+        table[x <= pos[0]] = colors[0]
+        table[x >= pos[-1]] = colors[-1]
         return table
     
     def usesAlpha(self):
@@ -908,3 +940,21 @@ class Tick(QtGui.QGraphicsObject):  ## NOTE: Making this a subclass of GraphicsO
                 ##self.setBrush(QtGui.QBrush(QtGui.QColor(self.color)))
                 ###self.emit(QtCore.SIGNAL('tickChanged'), self)
                 ##self.view.tickChanged(self)
+
+
+def _hsvToRgb(h, s, v):
+    ## Convert arrays of integer h (degrees), s, v (0-255) to an (N, 3) array of RGB values,
+    ## matching QColor.setHsv(). Achromatic colors (h == -1) are treated as h=0.
+    h = np.clip(h, 0, 359) / 60.
+    s = s / 255.
+    v = v / 255.
+    i = h.astype(int)
+    f = h - i
+    p = v * (1. - s)
+    q = v * (1. - s * f)
+    t = v * (1. - s * (1. - f))
+    rgb = np.empty((len(h), 3))
+    rgb[:,0] = np.choose(i, [v, q, p, p, t, v])
+    rgb[:,1] = np.choose(i, [t, v, v, q, p, p])
+    rgb[:,2] = np.choose(i, [p, p, t, v, v, q])
+    return np.round(rgb * 255)
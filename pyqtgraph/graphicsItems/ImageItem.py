@@ -250,6 +250,7 @@ class ImageItem(GraphicsObject):
     def render(self):
         prof = debug.Profiler('ImageItem.render', disabled=True)
         if self.image is None:
+            prof.finish()
             return
         if isinstance(self.lut, collections.Callable):
             lut = self.lut(self.image)
@@ -266,6 +267,7 @@ class ImageItem(GraphicsObject):
     def paint(self, p, *args):
         prof = debug.Profiler('ImageItem.paint', disabled=True)
         if self.image is None:
+            prof.finish()
             return
         if self.qimage is None:
             self.render()
@@ -104,12 +104,7 @@ class IsocurveItem(GraphicsObject):
         if self.data is None:
             self.path = None
             return
-        lines = fn.isocurve(self.data, self.level, connected=True, extendToEdge=True)
-        self.path = QtGui.QPainterPath()
-        for line in lines:
-            self.path.moveTo(*line[0])
-            for p in line[1:]:
-                self.path.lineTo(*p)
+        self.path = fn.isocurve(self.data, self.level, extendToEdge=True, path=True)
     
     def paint(self, p, *args):
         if self.data is None:
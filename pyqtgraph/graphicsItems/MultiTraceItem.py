@@ -0,0 +1,283 @@
+from pyqtgraph.Qt import QtGui, QtCore
+import numpy as np
+from .GraphicsObject import GraphicsObject
+import pyqtgraph.functions as fn
+from pyqtgraph import debug
+import pyqtgraph as pg
+
+__all__ = ['MultiTraceItem']
+
+class MultiTraceItem(GraphicsObject):
+    """
+    **Bases:** :class:`GraphicsObject <pyqtgraph.GraphicsObject>`
+
+    Displays many channels sharing a single x-axis as stacked traces, all drawn from
+    one (nChannels, nSamples) array. Each channel is displayed as
+    ``data[i] * gains[i] + offsets[i]``.
+
+    Compared to creating one PlotDataItem per channel, this item does all of its work
+    on the whole array at once: when more samples are visible than there are pixel
+    columns, every channel is reduced with a single vectorized min/max pass over the
+    visible range, and all channels are drawn as one path (one call to
+    :func:`arrayToQPath <pyqtgraph.arrayToQPath>` using a *connect* array to separate
+    channels). The cost of drawing therefore scales with the number of pixels rather
+    than with the number of channels or samples.
+
+    All channels are drawn with the same pen. Data should not contain NaN or inf.
+    """
+
+    def __init__(self, data=None, **kargs):
+        """
+        Forwards all arguments to :func:`setData <pyqtgraph.MultiTraceItem.setData>`.
+        """
+        GraphicsObject.__init__(self)
+        self.data = None
+        self.xData = None
+        self.offsets = None
+        self.gains = None
+        self.path = None
+        self._pathKey = None
+        self._boundingRect = None
+        self._boundsCache = [None, None]
+        self._dataMin = None  ## per-channel min/max of raw data (before gain/offset)
+        self._dataMax = None
+        self._monotonic = True
+        self.opts = {
+            'pen': fn.mkPen('w'),
+            'spacing': 1.0,
+            'downsample': True,
+            'antialias': pg.getConfigOption('antialias'),
+        }
+        self.setData(data, **kargs)
+
+    def setData(self, data=None, **kargs):
+        """
+        ==============  =================================================================
+        **Arguments:**
+        data            (nChannels, nSamples) array of values to display
+        x               1D array of length nSamples giving the x-value of each sample
+                        (shared by all channels). Should be monotonically increasing;
+                        the default is ``arange(nSamples)``.
+        offsets         Array of nChannels vertical offsets. By default, channels are
+                        stacked *spacing* units apart starting from 0.
+        gains           Array of nChannels scale factors (or a single scalar). Default
+                        is 1.
+        spacing         Distance between channels when *offsets* is not given.
+        pen             Pen used to draw all traces. Any single argument accepted by
+                        :func:`mkPen <pyqtgraph.mkPen>` is allowed.
+        downsample      (bool) If True (default), reduce the visible data to min/max
+                        pairs per pixel column before drawing.
+        antialias       (bool) Whether to use antialiasing when drawing.
+        ==============  =================================================================
+
+        If *data* is None, then only the other options given are changed.
+        """
+        prof = debug.Profiler('MultiTraceItem.setData', disabled=True)
+        for k in ['spacing', 'downsample', 'antialias']:
+            if k in kargs:
+                self.opts[k] = kargs[k]
+        if 'pen' in kargs:
+            self.opts['pen'] = fn.mkPen(kargs['pen'])
+
+        if data is not None:
+            data = np.asarray(data)
+            if data.ndim != 2:
+                raise Exception("MultiTraceItem data must be 2D array (nChannels, nSamples); got shape %s" % str(data.shape))
+            if 'complex' in str(data.dtype):
+                raise Exception("Can not plot complex data types.")
+            nCh = data.shape[0]
+            if self.data is not None and self.data.shape[0] != nCh:
+                ## channel count changed; discard per-channel options unless they are re-specified
+                self.offsets = None
+                self.gains = None
+            self.data = data
+            self._dataMin = data.min(axis=1) if data.shape[1] > 0 else np.zeros(nCh)
+            self._dataMax = data.max(axis=1) if data.shape[1] > 0 else np.zeros(nCh)
+            prof.mark('channel bounds')
+            if 'x' not in kargs and (self.xData is None or len(self.xData) != data.shape[1]):
+                self.setXData(None)
+        elif self.data is None:
+            ## nothing to display yet
+            prof.finish()
+            return
+
+        if 'x' in kargs:
+            self.setXData(kargs['x'])
+
+        nCh = self.data.shape[0]
+        if 'offsets' in kargs and kargs['offsets'] is not None:
+            self.offsets = np.asarray(kargs['offsets'], dtype=float).reshape(nCh)
+        elif self.offsets is None or 'spacing' in kargs:
+            self.offsets = np.arange(nCh, dtype=float) * self.opts['spacing']
+        if 'gains' in kargs and kargs['gains'] is not None:
+            gains = np.empty(nCh, dtype=float)
+            gains[:] = kargs['gains']
+            self.gains = gains
+        elif self.gains is None:
+            self.gains = np.ones(nCh, dtype=float)
+
+        self.invalidateBounds()
+        self.prepareGeometryChange()
+        self.informViewBoundsChanged()
+        self.path = None
+        self.update()
+        prof.finish()
+
+    def setXData(self, x):
+        if x is None:
+            x = np.arange(self.data.shape[1])
+        x = np.asarray(x)
+        if x.ndim != 1 or len(x) != self.data.shape[1]:
+            raise Exception("x must be 1D array of length %d (got shape %s)" % (self.data.shape[1], str(x.shape)))
+        self.xData = x
+        self._monotonic = len(x) < 2 or bool(np.all(np.diff(x) >= 0))
+
+    def setOffsets(self, offsets):
+        """Set the vertical offset of each channel."""
+        self.setData(offsets=offsets)
+
+    def setGains(self, gains):
+        """Set the scale factor of each channel (array or single scalar)."""
+        self.setData(gains=gains)
+
+    def setPen(self, *args, **kargs):
+        """Set the pen used to draw all traces."""
+        self.opts['pen'] = fn.mkPen(*args, **kargs)
+        self.invalidateBounds()
+        self.update()
+
+    def getData(self):
+        """Return the (x, data) arrays currently displayed."""
+        return self.xData, self.data
+
+    def channelCount(self):
+        return 0 if self.data is None else self.data.shape[0]
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        ## *frac* and *orthoRange* are ignored; bounds always cover the complete data set.
+        cache = self._boundsCache[ax]
+        if cache is not None:
+            return cache
+        if self.data is None or self.data.shape[1] == 0 or self.data.shape[0] == 0:
+            return (None, None)
+        if ax == 0:
+            if self._monotonic:
+                b = (self.xData[0], self.xData[-1])
+            else:
+                b = (self.xData.min(), self.xData.max())
+        else:
+            lo = self._dataMin * self.gains
+            hi = self._dataMax * self.gains
+            b = ((np.minimum(lo, hi) + self.offsets).min(), (np.maximum(lo, hi) + self.offsets).max())
+        pen = self.opts['pen']
+        if not pen.isCosmetic():
+            b = (b[0] - pen.widthF()*0.7072, b[1] + pen.widthF()*0.7072)
+        self._boundsCache[ax] = b
+        return b
+
+    def pixelPadding(self):
+        pen = self.opts['pen']
+        if pen.isCosmetic():
+            return pen.widthF()*0.7072
+        return 0
+
+    def boundingRect(self):
+        if self._boundingRect is None:
+            (xmn, xmx) = self.dataBounds(ax=0)
+            (ymn, ymx) = self.dataBounds(ax=1)
+            if xmn is None:
+                return QtCore.QRectF()
+            px = py = 0.0
+            pxPad = self.pixelPadding()
+            if pxPad > 0:
+                px, py = self.pixelVectors()
+                px = 0 if px is None else px.length() * pxPad
+                py = 0 if py is None else py.length() * pxPad
+            self._boundingRect = QtCore.QRectF(xmn-px, ymn-py, (2*px)+xmx-xmn, (2*py)+ymx-ymn)
+        return self._boundingRect
+
+    def viewTransformChanged(self):
+        self.invalidateBounds()
+        self.prepareGeometryChange()
+
+    def invalidateBounds(self):
+        self._boundingRect = None
+        self._boundsCache = [None, None]
+
+    def visibleRange(self):
+        """
+        Return (start, stop, ds): the range of sample indexes that is visible in the
+        view (padded by one sample on either side) and the number of samples that
+        will be combined into each min/max pair.
+        """
+        n = self.data.shape[1]
+        start, stop = 0, n
+        if not self._monotonic or self._exportOpts is not False:
+            return start, stop, 1
+        vr = self.viewRect()
+        if vr is None:
+            return start, stop, 1
+        start = max(0, int(np.searchsorted(self.xData, vr.left(), side='right')) - 1)
+        stop = min(n, int(np.searchsorted(self.xData, vr.right(), side='left')) + 1)
+        stop = max(stop, start)
+        ds = 1
+        if self.opts['downsample']:
+            px = self.pixelVectors()[0]
+            if px is not None and px.x() != 0:
+                width = vr.width() / abs(px.x())   ## number of pixel columns in view
+                if width > 0:
+                    ds = int((stop - start) / width)
+        return start, stop, max(ds, 1)
+
+    def generatePath(self, start, stop, ds):
+        prof = debug.Profiler('MultiTraceItem.generatePath', disabled=True)
+        nCh = self.data.shape[0]
+        data = self.data[:, start:stop]
+        x = self.xData[start:stop]
+        if ds > 1:
+            ## min/max over bins of *ds* samples for all channels at once; each bin
+            ## contributes two vertices (min, then max) at the x-value of its first sample.
+            bins = np.arange(0, stop-start, ds)
+            y = np.empty((nCh, len(bins), 2), dtype=data.dtype)
+            y[..., 0] = np.minimum.reduceat(data, bins, axis=1)
+            y[..., 1] = np.maximum.reduceat(data, bins, axis=1)
+            y = y.reshape(nCh, len(bins)*2)
+            x = np.repeat(x[bins], 2)
+            prof.mark('downsample')
+        else:
+            y = data
+        nPts = y.shape[1]
+        if nPts == 0 or nCh == 0:
+            return QtGui.QPainterPath()
+
+        y = y * self.gains[:, np.newaxis]
+        y += self.offsets[:, np.newaxis]
+        x = np.tile(x, nCh)
+        connect = np.ones(nCh * nPts, dtype=np.int32)
+        connect[nPts-1::nPts] = 0   ## do not connect the end of one channel to the start of the next
+        prof.mark('scale')
+        path = fn.arrayToQPath(x, y.ravel(), connect=connect)
+        prof.mark('arrayToQPath')
+        prof.finish()
+        return path
+
+    def paint(self, p, opt, widget):
+        if self.data is None or self.data.shape[1] == 0:
+            return
+        key = self.visibleRange()
+        if self.path is None or key != self._pathKey:
+            self.path = self.generatePath(*key)
+            self._pathKey = key
+
+        if self._exportOpts is not False:
+            aa = self._exportOpts.get('antialias', True)
+        else:
+            aa = self.opts['antialias']
+        p.setRenderHint(p.Antialiasing, aa)
+        p.setPen(self.opts['pen'])
+        p.drawPath(self.path)
+
+    def shape(self):
+        if self.path is None:
+            return QtGui.QPainterPath()
+        return self.path
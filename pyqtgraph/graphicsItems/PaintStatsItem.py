@@ -0,0 +1,84 @@
+from pyqtgraph.Qt import QtGui, QtCore
+import pyqtgraph.functions as fn
+from .GraphicsObject import GraphicsObject
+
+__all__ = ['PaintStatsItem']
+
+class PaintStatsItem(GraphicsObject):
+    """
+    **Bases:** :class:`GraphicsObject <pyqtgraph.GraphicsObject>`
+    
+    Overlay displaying the statistics collected by a 
+    :class:`PaintMonitor <pyqtgraph.GraphicsScene.PaintMonitor>`: frame rate, time 
+    spent painting per frame, and the items with the longest paint times. The text is 
+    drawn unscaled (the item ignores view transformations) and refreshed periodically.
+    
+    Example::
+    
+        monitor = plot.scene().setPaintMonitoring(True)
+        overlay = pg.PaintStatsItem(monitor)
+        plot.scene().addItem(overlay)
+    
+    The overlay itself is not monitored, but its periodic repaints do count as frames.
+    """
+    
+    def __init__(self, monitor, numItems=8, sort='last', interval=500, color=(255, 255, 0), fill=(0, 0, 0, 180)):
+        """
+        ============== ==================================================================
+        **Arguments:**
+        monitor        The PaintMonitor to display
+        numItems       Number of items to list
+        sort           Key used to choose items to list ('last', 'max', 'mean' or 'total')
+        interval       Refresh interval in ms
+        color          Text color
+        fill           Background brush
+        ============== ==================================================================
+        """
+        GraphicsObject.__init__(self)
+        self.paintMonitorIgnore = True
+        self.monitor = monitor
+        self.numItems = numItems
+        self.sort = sort
+        self.pen = fn.mkPen(color)
+        self.brush = fn.mkBrush(fill)
+        self.lines = []
+        self.rect = QtCore.QRectF()
+        self.setFlag(self.ItemIgnoresTransformations)
+        self.setZValue(1e9)
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self.updateText)
+        self.timer.start(interval)
+        self.updateText()
+        
+    def updateText(self):
+        fs = self.monitor.frameStats()
+        lines = ["%0.1f fps   paint: %0.2f ms mean, %0.2f ms max" % (fs['fps'], fs['meanPaintTime']*1000, fs['maxPaintTime']*1000)]
+        for st in self.monitor.itemStats(sort=self.sort, num=self.numItems):
+            line = "%7.2f ms  %s" % (st[self.sort]*1000, st['name'])
+            if st['elements'] is not None:
+                line += "  [%d elements]" % st['elements']
+            lines.append(line)
+        self.lines = lines
+        
+        fm = QtGui.QFontMetrics(QtGui.QFont())
+        width = max([fm.width(l) for l in lines]) + 8
+        height = fm.height() * len(lines) + 8
+        rect = QtCore.QRectF(0, 0, width, height)
+        if rect != self.rect:
+            self.prepareGeometryChange()
+            self.rect = rect
+        self.update()
+        
+    def boundingRect(self):
+        return self.rect
+        
+    def paint(self, p, *args):
+        p.setPen(fn.mkPen(None))
+        p.setBrush(self.brush)
+        p.drawRect(self.rect)
+        p.setPen(self.pen)
+        fm = p.fontMetrics()
+        y = 4 + fm.ascent()
+        for line in self.lines:
+            p.drawText(QtCore.QPointF(4, y), line)
+            y += fm.height()
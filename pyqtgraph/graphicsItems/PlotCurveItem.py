@@ -230,10 +230,30 @@ class PlotCurveItem(GraphicsObject):
         
     def setFillLevel(self, level):
         """Set the level filled to when filling under the curve"""
+        oldLevel = self.opts['fillLevel']
         self.opts['fillLevel'] = level
-        self.fillPath = None
+        if (oldLevel is None) != (level is None):
+            ## fill is being turned on or off; in step mode the ends of the curve change too.
+            if self.opts['stepMode']:
+                self.path = None
+            self.fillPath = None
+        elif level != oldLevel:
+            self.updateFillLevel()
         self.invalidateBounds()
         self.update()
+        
+    def updateFillLevel(self):
+        ## The fill level only determines the first and last vertex of the fill path 
+        ## (which, in step mode, is the curve itself); move those instead of regenerating.
+        level = self.opts['fillLevel']
+        path = self.path if self.opts['stepMode'] else self.fillPath
+        if path is None:
+            return
+        n = path.elementCount()
+        if n < 2:
+            return
+        for i in (0, n-1):
+            path.setElementPositionAt(i, path.elementAt(i).x, level)
 
     def setData(self, *args, **kargs):
         """
@@ -336,26 +356,31 @@ class PlotCurveItem(GraphicsObject):
         
     def generatePath(self, x, y):
         if self.opts['stepMode']:
-            ## each value in the x/y arrays generates 2 points.
-            x2 = np.empty((len(x),2), dtype=x.dtype)
-            x2[:] = x[:,np.newaxis]
-            if self.opts['fillLevel'] is None:
-                x = x2.reshape(x2.size)[1:-1]
-                y2 = np.empty((len(y),2), dtype=y.dtype)
-                y2[:] = y[:,np.newaxis]
-                y = y2.reshape(y2.size)
-            else:
-                ## If we have a fill level, add two extra points at either end
-                x = x2.reshape(x2.size)
-                y2 = np.empty((len(y)+2,2), dtype=y.dtype)
-                y2[1:-1] = y[:,np.newaxis]
-                y = y2.reshape(y2.size)[1:-1]
-                y[0] = self.opts['fillLevel']
-                y[-1] = self.opts['fillLevel']
+            ## each value in the x/y arrays generates 2 points. If we have a fill level, 
+            ## the path also starts and ends on the fill level.
+            return fn.stepArrayToQPath(x, y, fillLevel=self.opts['fillLevel'])
         
         path = fn.arrayToQPath(x, y, connect='all')
         
         return path
+        
+    def generateFillPath(self, x, y):
+        ## Return the polygon filled between the curve and fillLevel. Its first and 
+        ## last vertices are on the fill level (see updateFillLevel).
+        if self.opts['stepMode']:
+            ## the step path already begins and ends on the fill level; 
+            ## QPainter closes it implicitly when filling.
+            return self.path
+        fillLevel = self.opts['fillLevel']
+        x2 = np.empty(len(x)+2, dtype=np.float64)
+        y2 = np.empty(len(y)+2, dtype=np.float64)
+        x2[1:-1] = x
+        y2[1:-1] = y
+        x2[0] = x[0]
+        x2[-1] = x[-1]
+        y2[0] = fillLevel
+        y2[-1] = fillLevel
+        return fn.arrayToQPath(x2, y2, connect='all')
 
 
     def shape(self):
@@ -367,8 +392,9 @@ class PlotCurveItem(GraphicsObject):
         return self.path
 
     def paint(self, p, opt, widget):
-        prof = debug.Profiler('PlotCurveItem.paint '+str(id(self)), disabled=True)
+        prof = debug.Profiler('PlotCurveItem.paint', disabled=True)
         if self.xData is None:
+            prof.finish()
             return
         #if self.opts['spectrumMode']:
             #if self.specPath is None:
@@ -381,6 +407,7 @@ class PlotCurveItem(GraphicsObject):
         if self.path is None:
             x,y = self.getData()
             if x is None or len(x) == 0 or y is None or len(y) == 0:
+                prof.finish()
                 return
             self.path = self.generatePath(x,y)
             self.fillPath = None
@@ -401,12 +428,7 @@ class PlotCurveItem(GraphicsObject):
             if self.fillPath is None:
                 if x is None:
                     x,y = self.getData()
-                p2 = QtGui.QPainterPath(self.path)
-                p2.lineTo(x[-1], self.opts['fillLevel'])
-                p2.lineTo(x[0], self.opts['fillLevel'])
-                p2.lineTo(x[0], y[0])
-                p2.closeSubpath()
-                self.fillPath = p2
+                self.fillPath = self.generateFillPath(x, y)
                 
             prof.mark('generate fill path')
             p.fillPath(self.fillPath, self.opts['brush'])
@@ -447,6 +469,7 @@ class PlotCurveItem(GraphicsObject):
         self.xDisp = None  ## display values (after log / fft)
         self.yDisp = None
         self.path = None
+        self.fillPath = None
         #del self.xData, self.yData, self.xDisp, self.yDisp, self.path
         
     def mouseClickEvent(self, ev):
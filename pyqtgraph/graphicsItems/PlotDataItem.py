@@ -271,7 +271,7 @@ class PlotDataItem(GraphicsObject):
         See :func:`__init__() <pyqtgraph.PlotDataItem.__init__>` for details; it accepts the same arguments.
         """
         #self.clear()
-        prof = debug.Profiler('PlotDataItem.setData (0x%x)' % id(self), disabled=True)
+        prof = debug.Profiler('PlotDataItem.setData', disabled=True)
         y = None
         x = None
         if len(args) == 1:
@@ -208,6 +208,11 @@ class PlotItem(GraphicsWidget):
         self.paramList = {}
         self.avgCurves = {}
         
+        ## state for batchUpdate()
+        self._batchDepth = 0
+        self._batchPending = set()
+        self._batchLegendItems = []
+        
         ### Set up context menu
         
         w = QtGui.QWidget()
@@ -530,10 +535,16 @@ class PlotItem(GraphicsWidget):
             item.setPointMode(self.pointMode())
             
             ## Hide older plots if needed
-            self.updateDecimation()
+            if self._batchDepth > 0:
+                self._batchPending.add('updateDecimation')
+            else:
+                self.updateDecimation()
             
             ## Add to average if needed
-            self.updateParamList()
+            if self._batchDepth > 0:
+                self._batchPending.add('updateParamList')
+            else:
+                self.updateParamList()
             if self.ctrl.averageGroup.isChecked() and 'skipAverage' not in kargs:
                 self.addAvgCurve(item)
                 
@@ -542,7 +553,50 @@ class PlotItem(GraphicsWidget):
             #self.plotChanged()
         name = kargs.get('name', getattr(item, 'opts', {}).get('name', None))
         if name is not None and hasattr(self, 'legend') and self.legend is not None:
-            self.legend.addItem(item, name=name)
+            if self._batchDepth > 0:
+                self._batchLegendItems.append((item, name))
+            else:
+                self.legend.addItem(item, name=name)
+            
+    def batchUpdate(self):
+        """
+        Return a context manager that defers work which would otherwise be repeated for 
+        every item added or changed inside the block::
+        
+            with plot.batchUpdate():
+                for curve, data in zip(curves, channels):
+                    curve.setData(data)
+                    
+        While the block is active, auto-ranging of the ViewBox, trace decimation, the 
+        average parameter list and legend entries are not updated; each is updated 
+        once on exit, followed by a single update() of the plot. Blocks may be nested.
+        """
+        return PlotBatchUpdate(self)
+        
+    def _beginBatch(self):
+        self._batchDepth += 1
+        if self._batchDepth == 1:
+            self.vb.suspendAutoRange()
+            
+    def _endBatch(self):
+        self._batchDepth -= 1
+        if self._batchDepth > 0:
+            return
+        try:
+            pending = self._batchPending
+            self._batchPending = set()
+            if 'updateDecimation' in pending:
+                self.updateDecimation()
+            if 'updateParamList' in pending:
+                self.updateParamList()
+            legendItems = self._batchLegendItems
+            self._batchLegendItems = []
+            for item, name in legendItems:
+                if self.legend is not None and item in self.items:
+                    self.legend.addItem(item, name=name)
+        finally:
+            self.vb.resumeAutoRange()
+            self.update()
             
 
     def addDataItem(self, item, *args):
@@ -1202,3 +1256,16 @@ class PlotItem(GraphicsWidget):
         #else:
             #self.autoBtn.show()
     
+
+
+class PlotBatchUpdate(object):
+    """Context manager returned by :func:`PlotItem.batchUpdate() <pyqtgraph.PlotItem.batchUpdate>`."""
+    def __init__(self, plot):
+        self.plot = plot
+        
+    def __enter__(self):
+        self.plot._beginBatch()
+        return self.plot
+        
+    def __exit__(self, *args):
+        self.plot._endBatch()
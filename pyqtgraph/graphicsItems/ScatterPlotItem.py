@@ -34,15 +34,19 @@ for k, c in coords.items():
     Symbols[k].closeSubpath()
 
     
+def symbolPath(symbol):
+    ## Return the QPainterPath for a symbol name, index into Symbols, or path
+    if isinstance(symbol, basestring):
+        return Symbols[symbol]
+    if np.isscalar(symbol):
+        return list(Symbols.values())[symbol % len(Symbols)]
+    return symbol
+
 def drawSymbol(painter, symbol, size, pen, brush):
     painter.scale(size, size)
     painter.setPen(pen)
     painter.setBrush(brush)
-    if isinstance(symbol, basestring):
-        symbol = Symbols[symbol]
-    if np.isscalar(symbol):
-        symbol = list(Symbols.values())[symbol % len(Symbols)]
-    painter.drawPath(symbol)
+    painter.drawPath(symbolPath(symbol))
 
     
 def renderSymbol(symbol, size, pen, brush, device=None):
@@ -226,11 +230,15 @@ class ScatterPlotItem(GraphicsObject):
         prof = debug.Profiler('ScatterPlotItem.__init__', disabled=True)
         GraphicsObject.__init__(self)
         
-        self.picture = None   # QPicture used for rendering when pxmode==False
+        self.spotBatches = None  # list of (path, pen, brush) used for rendering when pxmode==False
         self.fragments = None # fragment specification for pxmode; updated every time the view changes.
         self.fragmentAtlas = SymbolAtlas()
         
-        self.data = np.empty(0, dtype=[('x', float), ('y', float), ('size', float), ('symbol', object), ('pen', object), ('brush', object), ('data', object), ('fragCoords', object), ('item', object)])
+        ## Spot records are stored in a backing array that has room for more points than are in use,
+        ## so that addPoints() does not need to reallocate. self.data is a view of the records in use.
+        self._buffer = np.empty(0, dtype=[('x', float), ('y', float), ('size', float), ('symbol', object), ('pen', object), ('brush', object), ('data', object), ('fragCoords', object), ('item', object)])
+        self._start = 0   ## index of the first record in use
+        self.data = self._buffer[:0]
         self.bounds = [None, None]  ## caches data bounds
         self._maxSpotWidth = 0      ## maximum size of the scale-variant portion of all spots
         self._maxSpotPxWidth = 0    ## maximum size of the scale-invariant portion of all spots
@@ -238,6 +246,7 @@ class ScatterPlotItem(GraphicsObject):
             'pxMode': True, 
             'useCache': True,  ## If useCache is False, symbols are re-drawn on every paint. 
             'antialias': pg.getConfigOption('antialias'),
+            'maxPoints': None,
         }   
         
         self.setPen(200,200,200, update=False)
@@ -286,6 +295,8 @@ class ScatterPlotItem(GraphicsObject):
         *antialias*            Whether to draw symbols with antialiasing. Note that if pxMode is True, symbols are 
                                always rendered with antialiasing (since the rendered symbols can be cached, this 
                                incurs very little performance cost)
+        *maxPoints*            If given, only the most recently added *maxPoints* spots are kept; older spots
+                               are discarded as new ones are added (see addPoints).
         ====================== ===============================================================================================
         """
         oldData = self.data  ## this causes cached pixmaps to be preserved while new data is registered.
@@ -296,6 +307,13 @@ class ScatterPlotItem(GraphicsObject):
         """
         Add new points to the scatter plot. 
         Arguments are the same as setData()
+        
+        Points are appended to a backing array whose capacity is doubled when it 
+        fills up, so adding a few points at a time does not copy the existing 
+        points. Only the new points are measured, assigned symbol atlas coordinates 
+        and (in pxMode) given pixmap fragments. If *maxPoints* is set, the oldest 
+        points are discarded, first-in first-out, by advancing the start of 
+        the data within the backing array.
         """
         
         ## deal with non-keyword arguments
@@ -337,16 +355,7 @@ class ScatterPlotItem(GraphicsObject):
             numPts = 0
         
         ## Extend record array
-        oldData = self.data
-        self.data = np.empty(len(oldData)+numPts, dtype=self.data.dtype)
-        ## note that np.empty initializes object fields to None and string fields to ''
-        
-        self.data[:len(oldData)] = oldData
-        #for i in range(len(oldData)):
-            #oldData[i]['item']._data = self.data[i]  ## Make sure items have proper reference to new array
-            
-        newData = self.data[len(oldData):]
-        newData['size'] = -1  ## indicates to use default size
+        newData = self._reserve(numPts)
         
         if 'spots' in kargs:
             spots = kargs['spots']
@@ -388,16 +397,102 @@ class ScatterPlotItem(GraphicsObject):
         
         if 'data' in kargs:
             self.setPointData(kargs['data'], dataSet=newData)
-            
+        
+        if 'maxPoints' in kargs:
+            self.opts['maxPoints'] = kargs['maxPoints']
+        
         self.prepareGeometryChange()
-        self.bounds = [None, None]
-        self.invalidate()
-        self.updateSpots(newData)
+        maxPoints = self.opts['maxPoints']
+        evicted = 0
+        if maxPoints is not None and len(self.data) > maxPoints:
+            evicted = len(self.data) - maxPoints
+            self._evict(evicted)
+            newData = self.data[max(0, len(self.data)-numPts):]  ## new points that were kept
+        
+        oldBounds = self.bounds
+        oldWidths = (self._maxSpotWidth, self._maxSpotPxWidth)
+        self.updateSpots(newData, invalidate=False)
+        
+        if evicted == 0 and len(newData) > 0 and (self._maxSpotWidth, self._maxSpotPxWidth) == oldWidths:
+            ## extend cached bounds to include the new points
+            pad = self._maxSpotWidth*0.7072
+            for ax, field in enumerate(['x', 'y']):
+                if oldBounds[ax] is not None:
+                    d = newData[field]
+                    oldBounds[ax] = (min(oldBounds[ax][0], d.min() - pad), max(oldBounds[ax][1], d.max() + pad))
+            self.bounds = oldBounds
+        else:
+            self.bounds = [None, None]
+        
+        if self.opts['pxMode'] and self.fragments is not None and self.fragmentAtlas.atlasValid:
+            ## Existing points (and the atlas) are unchanged; only generate fragments for the new points.
+            del self.fragments[:evicted]
+            self.generateFragments(start=len(self.data)-len(newData))
+            self.update()
+        else:
+            self.invalidate()
         self.sigPlotChanged.emit(self)
         
+    def setMaxPoints(self, maxPoints):
+        """
+        Set the maximum number of points to keep. If more points are added (see addPoints), 
+        the oldest points are discarded. If *maxPoints* is None, the number of points is not limited.
+        """
+        self.opts['maxPoints'] = maxPoints
+        if maxPoints is not None and len(self.data) > maxPoints:
+            self.prepareGeometryChange()
+            self._evict(len(self.data) - maxPoints)
+            self.bounds = [None, None]
+            self.invalidate()
+            self.sigPlotChanged.emit(self)
+        
+    def _reserve(self, numPts):
+        ## Extend self.data by numPts records and return the new records (a view into self._buffer).
+        ## If the backing array has no room after the current data, existing records are either 
+        ## moved to the front of the array (if that leaves at least half of the array free) or 
+        ## copied to a new array of twice the size.
+        n = len(self.data)
+        need = n + numPts
+        cap = len(self._buffer)
+        if self._start + need > cap:
+            if need <= cap // 2:
+                buf = self._buffer
+            else:
+                buf = np.empty(max(cap*2, need), dtype=self._buffer.dtype)
+            buf[:n] = self.data
+            self._buffer = buf
+            self._start = 0
+            self.data = buf[:n]
+            self._updateItemRefs()
+        self.data = self._buffer[self._start:self._start+need]
+        newData = self.data[n:]
+        
+        ## these records may have been used before; reset to the defaults
+        for k in ['symbol', 'pen', 'brush', 'data', 'fragCoords', 'item']:
+            newData[k] = None
+        newData['size'] = -1  ## indicates to use default size
+        return newData
+    
+    def _evict(self, num):
+        ## Discard the first *num* records without moving the others
+        old = self.data[:num]
+        for i in np.argwhere(np.not_equal(old['item'], None))[:,0]:
+            old['item'][i]._data = old[i].copy()   ## SpotItems that are still referenced keep a private copy
+        for k in ['symbol', 'pen', 'brush', 'data', 'fragCoords', 'item']:
+            old[k] = None
+        n = len(self.data) - num
+        self._start += num
+        self.data = self._buffer[self._start:self._start+n]
+        
+    def _updateItemRefs(self):
+        ## Records have moved; make sure SpotItems refer to their record in the current array
+        items = self.data['item']
+        for i in np.argwhere(np.not_equal(items, None))[:,0]:
+            items[i]._data = self.data[i]
+        
     def invalidate(self):
         ## clear any cached drawing state
-        self.picture = None
+        self.spotBatches = None
         self.fragments = None
         self.update()
         
@@ -533,17 +628,22 @@ class ScatterPlotItem(GraphicsObject):
         self.opts['pxMode'] = mode
         self.invalidate()
         
-    def updateSpots(self, dataSet=None):
+    def updateSpots(self, dataSet=None, invalidate=True):
+        ## Measure spots in dataSet (default all) and assign atlas coordinates to any that
+        ## need them. Returns True if any coordinates were assigned; in that case, cached 
+        ## drawing state is also cleared unless *invalidate* is False.
         if dataSet is None:
             dataSet = self.data
-        self._maxSpotWidth = 0
-        self._maxSpotPxWidth = 0
-        invalidate = False
+        if len(dataSet) == len(self.data):
+            ## measuring all spots; otherwise the maximum sizes can only grow
+            self._maxSpotWidth = 0
+            self._maxSpotPxWidth = 0
+        changed = False
         self.measureSpotSizes(dataSet)
         if self.opts['pxMode']:
             mask = np.equal(dataSet['fragCoords'], None)
             if np.any(mask):
-                invalidate = True
+                changed = True
                 opts = self.getSpotOpts(dataSet[mask])
                 coords = self.fragmentAtlas.getSymbolCoords(opts)
                 dataSet['fragCoords'][mask] = coords
@@ -552,8 +652,9 @@ class ScatterPlotItem(GraphicsObject):
                 #if rec['fragCoords'] is None:
                     #invalidate = True
                     #rec['fragCoords'] = self.fragmentAtlas.getSymbolCoords(*self.getSpotOpts(rec))
-        if invalidate:
+        if changed and invalidate:
             self.invalidate()
+        return changed
 
     def getSpotOpts(self, recs, scale=1.0):
         if recs.ndim == 0:
@@ -583,6 +684,7 @@ class ScatterPlotItem(GraphicsObject):
             
         
     def measureSpotSizes(self, dataSet):
+        oldWidths = (self._maxSpotWidth, self._maxSpotPxWidth)
         for rec in dataSet:
             ## keep track of the maximum spot size and pixel size
             symbol, size, pen, brush = self.getSpotOpts(rec)
@@ -598,13 +700,16 @@ class ScatterPlotItem(GraphicsObject):
                     width += pen.widthF()
             self._maxSpotWidth = max(self._maxSpotWidth, width)
             self._maxSpotPxWidth = max(self._maxSpotPxWidth, pxWidth)
-        self.bounds = [None, None]
+        if (self._maxSpotWidth, self._maxSpotPxWidth) != oldWidths:
+            self.bounds = [None, None]
     
     
     def clear(self):
         """Remove all spots from the scatter plot"""
         #self.clearItems()
-        self.data = np.empty(0, dtype=self.data.dtype)
+        self._buffer = np.empty(0, dtype=self._buffer.dtype)
+        self._start = 0
+        self.data = self._buffer[:0]
         self.bounds = [None, None]
         self.invalidate()
 
@@ -668,27 +773,87 @@ class ScatterPlotItem(GraphicsObject):
         self.bounds = [None, None]
         self.fragments = None
         
-    def generateFragments(self):
+    def generateFragments(self, start=0):
+        ## Generate pixmap fragments for the points from *start* onward; 
+        ## fragments already generated for earlier points are kept.
         tr = self.deviceTransform()
         if tr is None:
+            self.fragments = None
             return
-        pts = np.empty((2,len(self.data['x'])))
-        pts[0] = self.data['x']
-        pts[1] = self.data['y']
+        if self.fragments is None:
+            start = 0
+        data = self.data[start:]
+        pts = np.empty((2,len(data['x'])))
+        pts[0] = data['x']
+        pts[1] = data['y']
         pts = fn.transformCoordinates(tr, pts)
-        self.fragments = []
+        if start == 0:
+            self.fragments = []
         pts = np.clip(pts, -2**31, 2**31) ## prevent Qt segmentation fault.
                                           ## Still won't be able to render correctly, though.
-        for i in xrange(len(self.data)):
-            rec = self.data[i]
+        for i in xrange(len(data)):
+            rec = data[i]
             pos = QtCore.QPointF(pts[0,i], pts[1,i])
             x,y,w,h = rec['fragCoords']
             rect = QtCore.QRectF(y, x, h, w)
             self.fragments.append(QtGui.QPainter.PixmapFragment.create(pos, rect))
             
+    def generateSpotBatches(self):
+        ## Group spots that share a symbol, pen and brush, and build a single path per group 
+        ## containing all of its spots (used for drawing when pxMode is False). 
+        ## Returns a list of (path, pen, brush), ordered by the first spot in each group.
+        prof = debug.Profiler('ScatterPlotItem.generateSpotBatches', disabled=True)
+        if len(self.data) == 0:
+            return []
+        recs = self.getSpotOpts(self.data)
+        
+        ## spots usually share the same symbol / pen / brush objects; find each distinct combination
+        ids = np.empty(len(recs), dtype=[('symbol', np.intp), ('pen', np.intp), ('brush', np.intp)])
+        for k in ['symbol', 'pen', 'brush']:
+            ids[k] = [id(v) for v in recs[k]]
+        uniq, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='mergesort')
+        edges = np.searchsorted(inverse[order], np.arange(len(uniq)+1))
+        prof.mark('find styles')
+        
+        ## combinations of different but equivalent objects are merged by value
+        groups = OrderedDict()  ## key: [symbol, pen, brush, [spot indexes, ...]]
+        for u in np.argsort(first):
+            rec = recs[first[u]]
+            symbol = symbolPath(rec['symbol'])
+            pen = fn.mkPen(rec['pen'])
+            brush = fn.mkBrush(rec['brush'])
+            key = (id(symbol), fn.colorTuple(pen.color()), pen.widthF(), int(pen.style()), pen.isCosmetic(), 
+                   fn.colorTuple(brush.color()), int(brush.style()))
+            if key not in groups:
+                groups[key] = [symbol, pen, brush, []]
+            groups[key][3].append(order[edges[u]:edges[u+1]])
+        prof.mark('group spots')
+        
+        batches = []
+        for symbol, pen, brush, indexes in groups.values():
+            inds = np.concatenate(indexes)
+            sizes = recs['size'][inds]
+            if pen.isCosmetic():
+                batches.append((fn.tiledQPath(symbol, recs['x'][inds], recs['y'][inds], sizes), pen, brush))
+            else:
+                ## non-cosmetic pens are scaled along with the symbol (as in drawSymbol)
+                for size in np.unique(sizes):
+                    sel = inds[sizes == size]
+                    spotPen = QtGui.QPen(pen)
+                    spotPen.setWidthF(pen.widthF() * size)
+                    batches.append((fn.tiledQPath(symbol, recs['x'][sel], recs['y'][sel], size), spotPen, brush))
+        prof.mark('generate paths')
+        prof.finish()
+        return batches
+            
     def setExportMode(self, *args, **kwds):
         GraphicsObject.setExportMode(self, *args, **kwds)
-        self.invalidate()
+        ## pxMode fragments depend on the device; spot batches (pxMode=False) are 
+        ## in local coordinates and are reused for export.
+        self.fragments = None
+        self.update()
             
     def paint(self, p, *args):
 
@@ -728,19 +893,14 @@ class ScatterPlotItem(GraphicsObject):
                     p.translate(frag.x, frag.y)
                     drawSymbol(p, *self.getSpotOpts(rec, scale))
         else:
-            if self.picture is None:
-                self.picture = QtGui.QPicture()
-                p2 = QtGui.QPainter(self.picture)
-                for rec in self.data:
-                    if scale != 1.0:
-                        rec = rec.copy()
-                        rec['size'] *= scale
-                    p2.resetTransform()
-                    p2.translate(rec['x'], rec['y'])
-                    drawSymbol(p2, *self.getSpotOpts(rec, scale))
-                p2.end()
-                
-            self.picture.play(p)
+            ## spot sizes are in local coordinates, so no resolution scaling is needed for export
+            if self.spotBatches is None:
+                self.spotBatches = self.generateSpotBatches()
+            p.setRenderHint(p.Antialiasing, aa)
+            for path, pen, brush in self.spotBatches:
+                p.setPen(pen)
+                p.setBrush(brush)
+                p.drawPath(path)
         
     def points(self):
         for rec in self.data:
@@ -0,0 +1,291 @@
+from pyqtgraph.Qt import QtGui, QtCore
+import numpy as np
+import collections
+import pyqtgraph.functions as fn
+import pyqtgraph.debug as debug
+from pyqtgraph.pgcollections import OrderedDict
+from .ImageItem import ImageItem
+
+__all__ = ['TiledImageItem']
+
+
+class TiledImageItem(ImageItem):
+    """
+    **Bases:** :class:`ImageItem <pyqtgraph.ImageItem>`
+
+    ImageItem for displaying very large images (for example, gigapixel slide scans).
+
+    Rather than converting the entire image to a single QImage, the image is divided
+    into square tiles and a multi-resolution (mip) pyramid is built lazily: each level
+    is downsampled by 2 from the level below it, using either the block mean or the
+    block max. When painting, only the tiles that intersect the visible area are
+    rendered, at the pyramid level that best matches the size of a device pixel.
+    Downsampled tile data and rendered tiles are cached (least recently used tiles
+    are discarded first once their total size exceeds *cacheSize*), so panning
+    and zooming reuses previously rendered tiles.
+
+    Levels and lookup tables are applied exactly as in ImageItem; changing them
+    discards the rendered tiles but keeps the downsampled data.
+    """
+
+    def __init__(self, image=None, tileSize=512, downsampleMethod='mean', cacheSize=512*2**20, **kargs):
+        """
+        ================  ==================================================================
+        **Arguments:**
+        image             Image data (see :func:`ImageItem.setImage <pyqtgraph.ImageItem.setImage>`)
+        tileSize          Width and height (in pixels) of each tile.
+        downsampleMethod  'mean' or 'max'; how blocks of 2x2 pixels are combined when
+                          building lower resolution levels.
+        cacheSize         Maximum number of bytes used by each of the downsampled data
+                          cache and the rendered tile cache.
+        ================  ==================================================================
+
+        All extra keyword arguments are passed to setImage().
+        """
+        self.pyramid = None
+        self.tileSize = tileSize
+        self.downsampleMethod = downsampleMethod
+        self.tileCache = LRUCache(cacheSize)   ## (level, i, j): QImage
+        self.dataCacheSize = cacheSize
+        self.lastLevel = None
+        ImageItem.__init__(self, image, **kargs)
+
+    def setImage(self, image=None, autoLevels=None, **kargs):
+        if image is not None:
+            self.pyramid = ImagePyramid(image.view(np.ndarray), tileSize=self.tileSize, method=self.downsampleMethod, cacheSize=self.dataCacheSize)
+        ## new data, levels or lookup table; rendered tiles are out of date
+        self.tileCache.clear()
+        ImageItem.setImage(self, image, autoLevels=autoLevels, **kargs)
+
+    def setDownsampleMethod(self, method):
+        """Set the method ('mean' or 'max') used to build lower-resolution levels."""
+        self.downsampleMethod = method
+        if self.image is not None:
+            self.pyramid = ImagePyramid(self.image, tileSize=self.tileSize, method=method, cacheSize=self.dataCacheSize)
+        self.tileCache.clear()
+        self.update()
+
+    def invalidateTiles(self, rect=None):
+        """
+        Call after the image data has been modified in place. If *rect* (a QRect or
+        (x, y, w, h) tuple in image pixels) is given, only tiles overlapping that region
+        are discarded.
+        """
+        if self.pyramid is None:
+            return
+        if rect is not None and not isinstance(rect, tuple):
+            rect = (rect.x(), rect.y(), rect.width(), rect.height())
+        for key in self.pyramid.invalidate(rect):
+            self.tileCache.pop(key)
+        self.update()
+
+    def paint(self, p, *args):
+        prof = debug.Profiler('TiledImageItem.paint', disabled=True)
+        if self.image is None or self.pyramid is None:
+            prof.finish()
+            return
+        if self.paintMode is not None:
+            p.setCompositionMode(self.paintMode)
+
+        tr = p.transform()
+        ## device pixels per image pixel (use the smaller of the x/y scales)
+        scale = min((tr.m11()**2 + tr.m12()**2)**0.5, (tr.m21()**2 + tr.m22()**2)**0.5)
+        level = self.pyramid.levelForScale(scale)
+        self.lastLevel = level
+
+        ## visible region in image coordinates
+        inv, ok = tr.inverted()
+        if not ok:
+            prof.finish()
+            return
+        view = inv.mapRect(QtCore.QRectF(p.viewport())) & self.boundingRect()
+        if view.isEmpty():
+            prof.finish()
+            return
+        prof.mark('choose level %d' % level)
+
+        if isinstance(self.lut, collections.Callable):
+            lut = self.lut(self.image)
+        else:
+            lut = self.lut
+
+        for (i, j), rect in self.pyramid.tilesInRect(level, view.left(), view.top(), view.right(), view.bottom()):
+            key = (level, i, j)
+            qimage = self.tileCache.get(key)
+            if qimage is None:
+                data = self.pyramid.tile(level, i, j)
+                argb, alpha = fn.makeARGB(data, lut=lut, levels=self.levels)
+                qimage = fn.makeQImage(argb, alpha)
+                self.tileCache.put(key, qimage, argb.shape[0] * argb.shape[1] * 4)
+            p.drawImage(QtCore.QRectF(*rect), qimage)
+        prof.mark('draw tiles')
+
+        if self.border is not None:
+            p.setPen(self.border)
+            p.drawRect(self.boundingRect())
+        prof.finish()
+
+    def save(self, fileName, *args):
+        """Save this image to file at full resolution. Note that this renders the entire
+        image at once, which may require a very large amount of memory."""
+        argb, alpha = fn.makeARGB(self.image, lut=self.lut, levels=self.levels)
+        fn.makeQImage(argb, alpha).save(fileName, *args)
+
+    def getPixmap(self):
+        if self.image is None:
+            return None
+        argb, alpha = fn.makeARGB(self.image, lut=self.lut, levels=self.levels)
+        return QtGui.QPixmap.fromImage(fn.makeQImage(argb, alpha))
+
+
+class ImagePyramid(object):
+    """
+    Lazily computed multi-resolution pyramid over a 2D (or 3D, RGBA) image array
+    with axes (x, y[, channel]).
+
+    Level 0 is the original image; level k is downsampled by 2**k. Each level is
+    divided into tiles of tileSize x tileSize pixels. Level 0 tiles are views into
+    the original array; tiles at higher levels are computed from the four tiles
+    beneath them and cached (least recently used tiles are discarded first once
+    *cacheSize* bytes are in use).
+    """
+    def __init__(self, image, tileSize=512, method='mean', cacheSize=512*2**20):
+        if method not in ('mean', 'max'):
+            raise Exception("Downsample method must be 'mean' or 'max' (got %r)" % method)
+        self.image = image
+        self.tileSize = tileSize
+        self.method = method
+        self.cache = LRUCache(cacheSize)
+
+        ## size of each level; the top level fits in a single tile
+        self.shapes = [image.shape[:2]]
+        while self.shapes[-1][0] > tileSize or self.shapes[-1][1] > tileSize:
+            w, h = self.shapes[-1]
+            self.shapes.append(((w+1) // 2, (h+1) // 2))
+
+    def levelCount(self):
+        return len(self.shapes)
+
+    def levelForScale(self, scale):
+        """Return the lowest-resolution level that still has at least one pixel per
+        device pixel, given *scale* device pixels per image pixel."""
+        if scale <= 0:
+            return len(self.shapes) - 1
+        level = int(np.floor(np.log2(1.0 / scale))) if scale < 1 else 0
+        return max(0, min(level, len(self.shapes)-1))
+
+    def tilesInRect(self, level, x0, y0, x1, y1):
+        """
+        Return a list of ((i, j), (x, y, w, h)) for each tile at *level* that intersects
+        the rectangle (x0, y0)-(x1, y1) given in level-0 pixel coordinates. The second
+        element is the area covered by the tile in level-0 pixel coordinates.
+        """
+        ts = self.tileSize
+        f = 2 ** level
+        step = ts * f   ## size of a tile in level-0 pixels
+        w, h = self.shapes[0]
+        lw, lh = self.shapes[level]
+        nx = (lw + ts - 1) // ts
+        ny = (lh + ts - 1) // ts
+        i0 = max(0, int(x0 // step))
+        i1 = min(nx, int(x1 // step) + 1)
+        j0 = max(0, int(y0 // step))
+        j1 = min(ny, int(y1 // step) + 1)
+        tiles = []
+        for i in range(i0, i1):
+            x = i * step
+            tw = min(step, w - x)
+            for j in range(j0, j1):
+                y = j * step
+                th = min(step, h - y)
+                tiles.append(((i, j), (x, y, tw, th)))
+        return tiles
+
+    def tile(self, level, i, j):
+        """Return the data for tile (i, j) at *level*."""
+        ts = self.tileSize
+        if level == 0:
+            return self.image[i*ts:(i+1)*ts, j*ts:(j+1)*ts]
+        key = (level, i, j)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        ## assemble the (up to) 2x2 tiles beneath this one
+        nx = (self.shapes[level-1][0] + ts - 1) // ts
+        ny = (self.shapes[level-1][1] + ts - 1) // ts
+        cols = []
+        for ci in range(2*i, min(2*i+2, nx)):
+            rows = [self.tile(level-1, ci, cj) for cj in range(2*j, min(2*j+2, ny))]
+            cols.append(rows[0] if len(rows) == 1 else np.concatenate(rows, axis=1))
+        src = cols[0] if len(cols) == 1 else np.concatenate(cols, axis=0)
+
+        data = downsample2(src, self.method)
+        self.cache.put(key, data, data.nbytes)
+        return data
+
+    def invalidate(self, rect=None):
+        """Discard cached tiles overlapping *rect* (x, y, w, h in level-0 pixels;
+        default is the whole image). Return the keys of the discarded tiles at all levels
+        (including level 0, which is not cached here)."""
+        if rect is None:
+            rect = (0, 0) + tuple(self.shapes[0])
+        x, y, w, h = rect
+        keys = []
+        for level in range(len(self.shapes)):
+            for ij, r in self.tilesInRect(level, x, y, x+w-1, y+h-1):
+                key = (level,) + ij
+                self.cache.pop(key)
+                keys.append(key)
+        return keys
+
+
+def downsample2(data, method='mean'):
+    ## Downsample the first two axes of *data* by a factor of 2. Odd sizes are handled
+    ## by repeating the last row/column. Integer results are rounded back to the input dtype.
+    w, h = data.shape[:2]
+    if w % 2 == 1:
+        data = np.concatenate([data, data[-1:]], axis=0)
+    if h % 2 == 1:
+        data = np.concatenate([data, data[:, -1:]], axis=1)
+    blocks = data.reshape((data.shape[0]//2, 2, data.shape[1]//2, 2) + data.shape[2:])
+    if method == 'max':
+        return blocks.max(axis=3).max(axis=1)
+    if data.dtype.kind in 'iub':
+        ## sum in a wide integer type, then round half up
+        out = blocks.sum(axis=3, dtype=np.int64).sum(axis=1)
+        return ((out + 2) // 4).astype(data.dtype)
+    return blocks.mean(axis=3).mean(axis=1).astype(data.dtype)
+
+
+class LRUCache(object):
+    ## Dictionary that discards its least recently used entries once the total
+    ## size of the stored values exceeds *maxBytes*.
+    def __init__(self, maxBytes):
+        self.maxBytes = maxBytes
+        self.nbytes = 0
+        self.data = OrderedDict()   ## key: (value, size); most recently used last
+
+    def get(self, key):
+        item = self.data.pop(key, None)
+        if item is None:
+            return None
+        self.data[key] = item
+        return item[0]
+
+    def put(self, key, value, size):
+        self.pop(key)
+        self.data[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.maxBytes and len(self.data) > 1:
+            k, (v, s) = self.data.popitem(last=False)
+            self.nbytes -= s
+
+    def pop(self, key):
+        item = self.data.pop(key, None)
+        if item is not None:
+            self.nbytes -= item[1]
+
+    def clear(self):
+        self.data.clear()
+        self.nbytes = 0
@@ -111,6 +111,8 @@ class ViewBox(GraphicsWidget):
             'background': None,
         }
         self._updatingRange = False  ## Used to break recursive loops. See updateAutoRange.
+        self._autoRangeSuspended = 0  ## see suspendAutoRange()
+        self._autoRangePending = False
         self._itemBoundsCache = weakref.WeakKeyDictionary()
         
         self.locateGroup = None  ## items displayed when using ViewBox.locate(item)
@@ -556,12 +558,33 @@ class ViewBox(GraphicsWidget):
         if x is not None or y is not None:
             self.updateAutoRange()
 
+    def suspendAutoRange(self):
+        """
+        Defer automatic range updates until :func:`resumeAutoRange() <pyqtgraph.ViewBox.resumeAutoRange>`
+        is called. This is useful when changing the data of many items at once; 
+        the auto-range is then computed only once. Calls may be nested.
+        """
+        self._autoRangeSuspended += 1
+        
+    def resumeAutoRange(self):
+        """
+        Undo one call to suspendAutoRange(). If any items changed while auto-ranging 
+        was suspended, the range is updated now.
+        """
+        self._autoRangeSuspended = max(0, self._autoRangeSuspended - 1)
+        if self._autoRangeSuspended == 0 and self._autoRangePending:
+            self._autoRangePending = False
+            self.updateAutoRange()
+
     def updateAutoRange(self):
         ## Break recursive loops when auto-ranging.
         ## This is needed because some items change their size in response 
         ## to a view change.
         if self._updatingRange:
             return
+        if self._autoRangeSuspended > 0:
+            self._autoRangePending = True
+            return
         
         self._updatingRange = True
         try:
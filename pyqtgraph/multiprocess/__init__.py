@@ -13,6 +13,7 @@ This library provides:
   - proxy system that allows objects hosted in the remote process to be used as if they were local
   - Qt signal connection between processes
   - very simple in-line parallelization (fork only; does not work on windows) for number-crunching
+  - headless batch rendering of plots to PNG/SVG using a pool of worker processes (BatchRenderer)
 
 TODO:
     allow remote processes to serve as rendering engines that pass pixmaps back to the parent process for display
@@ -21,4 +22,5 @@ TODO:
 
 from .processes import *
 from .parallelizer import Parallelize, CanceledError
-from .remoteproxy import proxy
\ No newline at end of file
+from .remoteproxy import proxy
+from .batchrender import BatchRenderer
\ No newline at end of file
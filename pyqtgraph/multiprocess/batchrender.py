@@ -0,0 +1,312 @@
+"""
+Headless batch rendering of plots using a pool of worker processes.
+
+Each worker is a separate python process hosting a GraphicsView/GraphicsLayout that is
+never shown. Plots are described by simple dictionaries ("specs"); array data in the spec
+is transferred through a shared memory file rather than being pickled and the rendered
+result (PNG or SVG) is returned as bytes::
+
+    renderer = BatchRenderer(workers=4)
+    spec = {
+        'size': (800, 600),
+        'format': 'png',
+        'plots': [
+            {'row': 0, 'col': 0, 'title': 'channel 1', 'labels': {'bottom': 'time'},
+             'curves': [{'x': t, 'y': data1, 'pen': 'r'}]},
+            {'row': 1, 'col': 0, 'curves': [{'y': data2}]},
+        ],
+    }
+    images = renderer.render([spec] * 100)   ## list of PNG byte strings
+    print(renderer.stats())
+    renderer.close()
+
+Workers request the 'offscreen' Qt platform if the Qt bindings support it (Qt5). With Qt4
+on X11 a display is still required (for example, Xvfb).
+"""
+from .processes import Process, QtProcess, startQtEventLoop
+from pyqtgraph.Qt import QtGui, QtCore
+import numpy as np
+import os, sys, mmap, tempfile, random, time
+
+__all__ = ['BatchRenderer']
+
+
+class BatchRenderer(object):
+    """
+    Pool of worker processes that render plot specs to PNG or SVG data.
+
+    ==============  ==============================================================
+    **Arguments:**
+    workers         Number of worker processes to start.
+    shmSize         Initial size (bytes) of each worker's shared memory buffer.
+                    The buffer grows automatically if a spec requires more space.
+    configOptions   Optional dict of pyqtgraph config options (see
+                    setConfigOptions) to apply in each worker.
+    ==============  ==============================================================
+
+    Spec format:
+
+    ==============  ==============================================================
+    size            (width, height) of the rendered image in pixels
+    format          'png' (default) or 'svg'
+    background      Optional background color (anything accepted by mkColor)
+    antialias       bool; default is False
+    plots           List of dicts, one per PlotItem. Recognized keys are 'row',
+                    'col', 'rowspan', 'colspan', 'title', 'labels' (dict passed
+                    to setLabels), 'xRange', 'yRange', 'logMode' (tuple), and
+                    'curves' (list of dicts of keyword arguments for
+                    PlotItem.plot()). Any ndarray inside a curve dict is sent
+                    through shared memory.
+    ==============  ==============================================================
+    """
+
+    def __init__(self, workers=2, shmSize=2**20, configOptions=None):
+        self.workers = []
+        for i in range(workers):
+            self.workers.append(_WorkerHandle('batchrender_%d' % i, shmSize, configOptions))
+
+    def render(self, specs):
+        """
+        Render all *specs* and return a list of bytes (one per spec, in the same order).
+        Specs are distributed among workers as they become available.
+        """
+        specs = list(specs)
+        results = [None] * len(specs)
+        queue = list(range(len(specs)))
+        pending = {}   ## worker: (index, request)
+        while len(queue) > 0 or len(pending) > 0:
+            for w in self.workers:
+                if w not in pending and len(queue) > 0:
+                    i = queue.pop(0)
+                    pending[w] = (i, w.submit(specs[i]))
+
+            done = False
+            for w, (i, req) in list(pending.items()):
+                if req.hasResult():
+                    results[i] = w.finish(req.result())
+                    del pending[w]
+                    done = True
+            if not done:
+                time.sleep(0.001)
+        return results
+
+    def stats(self):
+        """
+        Return a list of dicts, one per worker, describing throughput:
+        number of specs rendered, total render time in the worker,
+        total wall time from submission to result, and renders per second.
+        """
+        return [w.stats() for w in self.workers]
+
+    def close(self):
+        """Shut down all worker processes."""
+        for w in self.workers:
+            w.close()
+        self.workers = []
+
+
+class _WorkerHandle(object):
+    ## Parent-side state for a single worker process
+
+    def __init__(self, name, shmSize, configOptions):
+        if QtGui.QApplication.instance() is not None:
+            procClass = QtProcess
+        else:
+            procClass = Process
+        self.proc = procClass(name=name, target=startRenderWorker)
+        rmod = self.proc._import('pyqtgraph.multiprocess.batchrender')
+        self.shm = None
+        self.shmFile = None
+        self.shmTag = None
+        self.resizeShm(shmSize)
+        self.worker = rmod.RenderWorker(configOptions)
+        self.count = 0
+        self.renderTime = 0.0
+        self.wallTime = 0.0
+        self.submitTime = None
+
+    def resizeShm(self, size):
+        size = max(size, mmap.PAGESIZE)
+        if self.shm is not None:
+            self.shm.close()
+        if sys.platform.startswith('win'):
+            ## anonymous tagged mmap; use a new tag for every resize (see RemoteGraphicsView)
+            self.shmTag = "pyqtgraph_batch_" + ''.join([chr((random.getrandbits(20)%25) + 97) for i in range(20)])
+            self.shm = mmap.mmap(-1, size, self.shmTag)
+        else:
+            if self.shmFile is None:
+                self.shmFile = tempfile.NamedTemporaryFile(prefix='pyqtgraph_batch_')
+                self.shmTag = self.shmFile.name
+            self.shmFile.truncate(size)
+            self.shmFile.flush()
+            self.shm = mmap.mmap(self.shmFile.fileno(), size, mmap.MAP_SHARED, mmap.PROT_WRITE | mmap.PROT_READ)
+
+    def submit(self, spec):
+        ## copy arrays into shared memory, then ask the worker to render asynchronously
+        arrays = []
+        spec = packSpec(spec, arrays)
+        offsets = []
+        offset = 0
+        for arr in arrays:
+            offsets.append(offset)
+            offset += (arr.nbytes + 63) & ~63   ## keep arrays 64-byte aligned
+        if offset > self.shm.size():
+            self.resizeShm(max(offset, self.shm.size() * 2))
+        buf = np.frombuffer(self.shm, dtype=np.ubyte)
+        refs = []
+        for arr, off in zip(arrays, offsets):
+            buf[off:off+arr.nbytes] = arr.view(np.ubyte).ravel()
+            refs.append((off, arr.dtype.str, arr.shape))
+        del buf
+        self.submitTime = time.time()
+        return self.worker.render(spec, refs, self.shmTag, self.shm.size(), _callSync='async', _returnType='value')
+
+    def finish(self, result):
+        data, renderTime = result
+        self.count += 1
+        self.renderTime += renderTime
+        self.wallTime += time.time() - self.submitTime
+        return data
+
+    def stats(self):
+        return {
+            'name': self.proc.name,
+            'count': self.count,
+            'renderTime': self.renderTime,
+            'wallTime': self.wallTime,
+            'rate': self.count / self.wallTime if self.wallTime > 0 else 0.0,
+        }
+
+    def close(self):
+        try:
+            self.proc.join()
+        finally:
+            self.shm.close()
+            if self.shmFile is not None:
+                self.shmFile.close()
+
+
+def packSpec(spec, arrays):
+    ## Return a copy of *spec* with every ndarray in the curve dicts replaced by
+    ## a reference into *arrays*.
+    spec = dict(spec)
+    plots = []
+    for plot in spec.get('plots', []):
+        plot = dict(plot)
+        curves = []
+        for curve in plot.get('curves', []):
+            curve = dict(curve)
+            for k, v in curve.items():
+                if isinstance(v, np.ndarray):
+                    curve[k] = ('__shm__', len(arrays))
+                    arrays.append(np.ascontiguousarray(v))
+            curves.append(curve)
+        plot['curves'] = curves
+        plots.append(plot)
+    spec['plots'] = plots
+    return spec
+
+
+def startRenderWorker(name, port, authkey, ppid, debug=False):
+    ## Target function for worker processes; prefer an offscreen Qt platform before
+    ## the QApplication is created.
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    startQtEventLoop(name, port, authkey, ppid, debug=debug)
+
+
+class RenderWorker(object):
+    """
+    Created inside each worker process (by proxy) to carry out render requests.
+    """
+    def __init__(self, configOptions=None):
+        import pyqtgraph as pg
+        if configOptions is not None:
+            pg.setConfigOptions(**configOptions)
+        self.pg = pg
+        self.view = pg.GraphicsView()
+        self.shm = None
+        self.shmTag = None
+
+    def mapShm(self, tag, size):
+        if self.shm is not None and self.shmTag == tag and self.shm.size() == size:
+            return
+        if self.shm is not None:
+            self.shm.close()
+        if sys.platform.startswith('win'):
+            self.shm = mmap.mmap(-1, size, tag)
+        else:
+            fh = open(tag, 'rb')
+            try:
+                self.shm = mmap.mmap(fh.fileno(), size, mmap.MAP_SHARED, mmap.PROT_READ)
+            finally:
+                fh.close()
+        self.shmTag = tag
+
+    def render(self, spec, refs, shmTag, shmSize):
+        """Render one spec. Returns (bytes, render time in seconds)."""
+        pg = self.pg
+        start = time.time()
+        self.mapShm(shmTag, shmSize)
+        ## Copy arrays out of shared memory (a single memcpy each). Plot items may outlive
+        ## this request, and must not keep the mapping alive when it is resized.
+        buf = np.frombuffer(self.shm, dtype=np.ubyte)
+        arrays = []
+        for offset, dtype, shape in refs:
+            dtype = np.dtype(dtype)
+            n = int(np.prod(shape)) * dtype.itemsize
+            arrays.append(buf[offset:offset+n].view(dtype).reshape(shape).copy())
+        del buf
+
+        w, h = spec.get('size', (640, 480))
+        self.view.resize(w, h)
+        if 'background' in spec:
+            self.view.setBackground(spec['background'])
+        layout = pg.GraphicsLayout()
+        self.view.setCentralItem(layout)
+        self.view.resizeEvent(None)
+
+        try:
+            for plotSpec in spec.get('plots', []):
+                plot = layout.addPlot(row=plotSpec.get('row', None), col=plotSpec.get('col', None),
+                                      rowspan=plotSpec.get('rowspan', 1), colspan=plotSpec.get('colspan', 1),
+                                      title=plotSpec.get('title', None))
+                if 'labels' in plotSpec:
+                    plot.setLabels(**plotSpec['labels'])
+                if 'logMode' in plotSpec:
+                    plot.setLogMode(*plotSpec['logMode'])
+                for curve in plotSpec.get('curves', []):
+                    kwds = {}
+                    for k, v in curve.items():
+                        if isinstance(v, tuple) and len(v) == 2 and v[0] == '__shm__':
+                            v = arrays[v[1]]
+                        kwds[k] = v
+                    plot.plot(**kwds)
+                if 'xRange' in plotSpec:
+                    plot.setXRange(*plotSpec['xRange'], padding=0)
+                if 'yRange' in plotSpec:
+                    plot.setYRange(*plotSpec['yRange'], padding=0)
+            layout.layout.activate()
+            self.view.scene().prepareForPaint()
+
+            fmt = spec.get('format', 'png').lower()
+            if fmt == 'svg':
+                from pyqtgraph.exporters.SVGExporter import SVGExporter
+                exp = SVGExporter(self.view.scene())
+                data = exp.export(toBytes=True)
+            else:
+                from pyqtgraph.exporters.ImageExporter import ImageExporter
+                exp = ImageExporter(self.view.scene())
+                exp.parameters()['width'] = w
+                exp.parameters()['height'] = h
+                exp.parameters()['antialias'] = spec.get('antialias', False)
+                img = exp.export(toBytes=True)
+                arr = QtCore.QByteArray()
+                qbuf = QtCore.QBuffer(arr)
+                qbuf.open(QtCore.QIODevice.WriteOnly)
+                img.save(qbuf, fmt.upper())
+                qbuf.close()
+                data = bytes(arr.data())
+        finally:
+            layout.clear()
+
+        return data, time.time() - start
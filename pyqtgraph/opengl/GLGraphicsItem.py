@@ -208,6 +208,14 @@ class GLGraphicsItem(QtCore.QObject):
         """
         pass
     
+    def releaseGL(self):
+        """
+        Called before an item is removed from a GLViewWidget, with the widget's GL 
+        context current. Items should delete GL objects (eg. buffers) that were 
+        created in that context here.
+        """
+        pass
+    
     def setupGLState(self):
         """
         This method is responsible for preparing the GL state options needed to render 
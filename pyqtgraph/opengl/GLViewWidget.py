@@ -2,6 +2,7 @@ from pyqtgraph.Qt import QtCore, QtGui, QtOpenGL
 from OpenGL.GL import *
 import numpy as np
 from pyqtgraph import Vector
+from .buffers import deleteOrphanBuffers
 ##Vector = QtGui.QVector3D
 
 class GLViewWidget(QtOpenGL.QGLWidget):
@@ -55,6 +56,9 @@ class GLViewWidget(QtOpenGL.QGLWidget):
         
     def removeItem(self, item):
         self.items.remove(item)
+        if hasattr(item, 'releaseGL'):
+            self.makeCurrent()
+            item.releaseGL()
         item._setView(None)
         self.update()
         
@@ -94,6 +98,7 @@ class GLViewWidget(QtOpenGL.QGLWidget):
         
         
     def paintGL(self):
+        deleteOrphanBuffers()  ## left behind by items that were garbage collected
         self.setProjection()
         self.setModelview()
         glClear( GL_DEPTH_BUFFER_BIT | GL_COLOR_BUFFER_BIT )
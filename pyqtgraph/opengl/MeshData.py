@@ -46,6 +46,7 @@ class MeshData(object):
         self._faces = None   # Nx3 array of indexes into self._vertexes specifying three vertexes for each face
         self._edges = None
         self._vertexFaces = None  ## maps vertex ID to a list of face IDs (inverse mapping of _faces)
+        self._vertexFaceArrays = None  ## the same mapping in compressed (indptr, faceIndexes) form
         self._vertexEdges = None  ## maps vertex ID to a list of edge IDs (inverse mapping of _edges)
         
         ## Per-vertex data
@@ -150,6 +151,7 @@ class MeshData(object):
         of a triangular face."""
         self._faces = faces
         self._vertexFaces = None
+        self._vertexFaceArrays = None
         self._vertexesIndexedByFaces = None
         self.resetNormals()
         self._vertexColorsIndexedByFaces = None
@@ -195,6 +197,15 @@ class MeshData(object):
         if resetNormals:
             self.resetNormals()
     
+    def setVertexNormals(self, norms):
+        """
+        Set the array (Nv, 3) of vertex normals directly, for callers that can compute
+        them more cheaply than from the face normals (for example, from the gradient
+        of a regular grid). Face normals are cleared and will be recomputed on demand.
+        """
+        self.resetNormals()
+        self._vertexNormals = norms
+    
     def resetNormals(self):
         self._vertexNormals = None
         self._vertexNormalsIndexedByFaces = None
@@ -256,13 +267,16 @@ class MeshData(object):
         """
         if self._vertexNormals is None:
             faceNorms = self.faceNormals()
-            vertFaces = self.vertexFaces()
-            self._vertexNormals = np.empty(self._vertexes.shape, dtype=float)
-            for vindex in xrange(self._vertexes.shape[0]):
-                norms = faceNorms[vertFaces[vindex]]  ## get all face normals
-                norm = norms.sum(axis=0)       ## sum normals
-                norm /= (norm**2).sum()**0.5  ## and re-normalize
-                self._vertexNormals[vindex] = norm
+            verts = self.vertexes()
+            faces = self.faces().ravel().astype(np.intp)  ## bincount does not accept uint64 on numpy 1.x
+            ## sum the normals of all faces touching each vertex, then re-normalize
+            norms = np.empty(verts.shape, dtype=float)
+            for i in range(3):
+                norms[:,i] = np.bincount(faces, weights=np.repeat(faceNorms[:,i], 3), minlength=verts.shape[0])
+            lengths = (norms**2).sum(axis=1)**0.5
+            lengths[lengths == 0] = 1  ## vertexes that belong to no face keep a zero normal
+            norms /= lengths[:,np.newaxis]
+            self._vertexNormals = norms
                 
         if indexed is None:
             return self._vertexNormals
@@ -358,28 +372,38 @@ class MeshData(object):
         ## I think generally this should be discouraged..
         
         faces = self._vertexesIndexedByFaces
-        verts = {}  ## used to remember the index of each vertex position
-        self._faces = np.empty(faces.shape[:2], dtype=np.uint)
-        self._vertexes = []
-        self._vertexFaces = []
+        pts = faces.reshape(faces.shape[0] * faces.shape[1], faces.shape[2])
         self._faceNormals = None
         self._vertexNormals = None
-        for i in xrange(faces.shape[0]):
-            face = faces[i]
-            inds = []
-            for j in range(face.shape[0]):
-                pt = face[j]
-                pt2 = tuple([round(x*1e14) for x in pt])  ## quantize to be sure that nearly-identical points will be merged
-                index = verts.get(pt2, None)
-                if index is None:
-                    #self._vertexes.append(QtGui.QVector3D(*pt))
-                    self._vertexes.append(pt)
-                    self._vertexFaces.append([])
-                    index = len(self._vertexes)-1
-                    verts[pt2] = index
-                self._vertexFaces[index].append(i)  # keep track of which vertexes belong to which faces
-                self._faces[i,j] = index
-        self._vertexes = np.array(self._vertexes, dtype=float)
+        self._vertexFaces = None
+        self._vertexFaceArrays = None
+        if len(pts) == 0:
+            self._faces = np.empty(faces.shape[:2], dtype=np.uint)
+            self._vertexes = np.empty((0, faces.shape[2]), dtype=float)
+            return
+        
+        ## quantize to be sure that nearly-identical points will be merged
+        quant = np.round(pts * 1e14)
+        
+        ## sort points so that identical points are adjacent, then label each group
+        order = np.lexsort(quant.T[::-1])
+        sq = quant[order]
+        newGroup = np.empty(len(sq), dtype=bool)
+        newGroup[0] = True
+        newGroup[1:] = (sq[1:] != sq[:-1]).any(axis=1)
+        groupOfSorted = np.cumsum(newGroup) - 1
+        
+        ## number unique vertexes in order of first appearance
+        firstIndex = np.minimum.reduceat(order, np.argwhere(newGroup)[:,0])
+        groupOrder = np.argsort(firstIndex, kind='mergesort')
+        groupIndex = np.empty(len(groupOrder), dtype=np.intp)
+        groupIndex[groupOrder] = np.arange(len(groupOrder))
+        
+        inverse = np.empty(len(pts), dtype=np.intp)
+        inverse[order] = groupIndex[groupOfSorted]
+        
+        self._faces = inverse.reshape(faces.shape[:2]).astype(np.uint)
+        self._vertexes = np.array(pts[firstIndex[groupOrder]], dtype=float)
     
     #def _setUnindexedFaces(self, faces, vertexes, vertexColors=None, faceColors=None):
         #self._vertexes = vertexes #[QtGui.QVector3D(*v) for v in vertexes]
@@ -396,15 +420,25 @@ class MeshData(object):
         Return list mapping each vertex index to a list of face indexes that use the vertex.
         """
         if self._vertexFaces is None:
-            self._vertexFaces = [None] * len(self.vertexes())
-            for i in xrange(self._faces.shape[0]):
-                face = self._faces[i]
-                for ind in face:
-                    if self._vertexFaces[ind] is None:
-                        self._vertexFaces[ind] = []  ## need a unique/empty list to fill
-                    self._vertexFaces[ind].append(i)
+            indptr, faceInds = self.vertexFaceArrays()
+            self._vertexFaces = np.split(faceInds, indptr[1:-1])
         return self._vertexFaces
         
+    def vertexFaceArrays(self):
+        """
+        Return the mapping from vertexes to faces in compressed (CSR) form as a tuple 
+        (indptr, faceIndexes): the faces that use vertex i are 
+        faceIndexes[indptr[i]:indptr[i+1]], in increasing order.
+        """
+        if self._vertexFaceArrays is None:
+            nv = len(self.vertexes())
+            faces = self.faces().ravel().astype(np.intp)  ## bincount does not accept uint64 on numpy 1.x
+            faceInds = np.argsort(faces, kind='mergesort') // 3
+            indptr = np.zeros(nv+1, dtype=np.intp)
+            np.cumsum(np.bincount(faces, minlength=nv), out=indptr[1:])
+            self._vertexFaceArrays = (indptr, faceInds)
+        return self._vertexFaceArrays
+        
     #def reverseNormals(self):
         #"""
         #Reverses the direction of all normal vectors.
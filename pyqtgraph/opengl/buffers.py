@@ -0,0 +1,188 @@
+from OpenGL.GL import *
+from pyqtgraph.Qt import QtOpenGL
+import numpy as np
+
+## For keeping array data resident on the GPU between frames.
+
+## (context, bufferId) for buffers that were garbage collected before being deleted;
+## these are deleted by deleteOrphanBuffers() the next time a view paints.
+_orphanBuffers = []
+
+
+def contextCanUse(context, owner):
+    ## True if GL objects created in *owner* are valid in *context*
+    if context is None or owner is None:
+        return False
+    if context is owner:
+        return True
+    try:
+        return QtOpenGL.QGLContext.areSharing(context, owner)
+    except RuntimeError:  ## owner has been deleted
+        return False
+
+
+def deleteOrphanBuffers():
+    """Delete buffers of garbage-collected ArrayBuffers that belong to the current GL context."""
+    if len(_orphanBuffers) == 0:
+        return
+    ctx = QtOpenGL.QGLContext.currentContext()
+    for orphan in _orphanBuffers[:]:
+        owner, buf = orphan
+        if contextCanUse(ctx, owner):
+            glDeleteBuffers(1, [buf])
+            _orphanBuffers.remove(orphan)
+        else:
+            try:
+                owner.isValid()
+            except RuntimeError:
+                ## the owning context is gone and took the buffer with it
+                _orphanBuffers.remove(orphan)
+
+
+class ArrayBuffer(object):
+    """
+    Holds a copy of an (N, k) array (float32 by default) in an OpenGL buffer object.
+
+    Data is set from python with setData(), which may be called at any time (no GL
+    context is required). The new data is compared against the previous contents
+    and only the range of rows that actually changed is marked for upload. Uploads
+    happen the next time bind() is called from within a GL context: a full glBufferData
+    if the size of the array changed, otherwise glBufferSubData for the changed rows
+    only. If nothing changed, bind() uploads nothing.
+
+    The GL buffer belongs to the context that was current when it was created. If 
+    bind() is called from a context that can not use it (one that does not share 
+    objects with the owner), the data is supplied as a client-side array instead.
+    bind() returns the pointer argument to pass to glVertexPointer and friends: None 
+    when the GL buffer is bound, otherwise the array itself.
+
+    Usage inside paint()::
+
+        try:
+            glVertexPointer(buf.columns, GL_FLOAT, 0, buf.bind())
+            ...
+        finally:
+            buf.unbind()
+
+    Items holding ArrayBuffers should call delete() from their releaseGL() method,
+    which GLViewWidget calls with the view's context current when the item is removed.
+    """
+
+    def __init__(self, target=GL_ARRAY_BUFFER, usage=GL_DYNAMIC_DRAW, dtype=np.float32):
+        self.target = target
+        self.usage = usage
+        self.dtype = np.dtype(dtype)
+        self.data = None
+        self.buffer = None
+        self.context = None        ## QGLContext in which the GL buffer was created
+        self.bufferSize = None     ## size in bytes of the allocated GL buffer
+        self.dirty = None          ## (startRow, stopRow) waiting for upload, or None
+        self.bytesUploaded = 0     ## running total, useful for profiling
+
+    def setData(self, data):
+        """
+        Set the contents of the buffer. *data* is converted to a contiguous array
+        of shape (N, k) with the buffer's dtype. If *data* is None, the buffer is emptied.
+        """
+        if data is None:
+            self.data = None
+            self.dirty = None
+            return
+        data = np.ascontiguousarray(data, dtype=self.dtype)
+        if data.ndim == 1:
+            data = data.reshape(data.shape[0], 1)
+        elif data.ndim > 2:
+            data = data.reshape(-1, data.shape[-1])
+
+        old = self.data
+        if old is None or old.shape != data.shape:
+            self.data = data.copy()
+            self.dirty = (0, len(data))
+            return
+
+        ## find the range of rows that differ from the current contents
+        changed = np.argwhere((old != data).any(axis=1))
+        if len(changed) == 0:
+            return
+        start = int(changed[0,0])
+        stop = int(changed[-1,0]) + 1
+        old[start:stop] = data[start:stop]
+        self.setDirty(start, stop)
+
+    def updateRange(self, start, data):
+        """
+        Overwrite rows start:start+len(data) without comparing against the existing
+        contents. The shape of the buffer is unchanged.
+        """
+        data = np.asarray(data, dtype=self.dtype).reshape(-1, self.data.shape[1])
+        stop = start + len(data)
+        self.data[start:stop] = data
+        self.setDirty(start, stop)
+
+    def setDirty(self, start, stop):
+        if self.dirty is None:
+            self.dirty = (start, stop)
+        else:
+            self.dirty = (min(self.dirty[0], start), max(self.dirty[1], stop))
+
+    @property
+    def columns(self):
+        return self.data.shape[1]
+
+    def __len__(self):
+        return 0 if self.data is None else len(self.data)
+
+    def bind(self):
+        """
+        Upload any pending changes and bind the buffer. Requires a current GL context.
+        Returns None if the GL buffer was bound, or the data array if it must be used 
+        as a client-side array in this context.
+        """
+        ctx = QtOpenGL.QGLContext.currentContext()
+        if self.buffer is None:
+            self.buffer = glGenBuffers(1)
+            self.context = ctx
+        elif not contextCanUse(ctx, self.context):
+            glBindBuffer(self.target, 0)
+            return self.data
+        glBindBuffer(self.target, self.buffer)
+        if self.dirty is None or self.data is None:
+            return None
+        if self.bufferSize != self.data.nbytes:
+            glBufferData(self.target, self.data.nbytes, self.data, self.usage)
+            self.bufferSize = self.data.nbytes
+            self.bytesUploaded += self.data.nbytes
+        else:
+            start, stop = self.dirty
+            rowBytes = self.data.strides[0]
+            chunk = self.data[start:stop]
+            glBufferSubData(self.target, start * rowBytes, chunk.nbytes, chunk)
+            self.bytesUploaded += chunk.nbytes
+        self.dirty = None
+        return None
+
+    def unbind(self):
+        glBindBuffer(self.target, 0)
+
+    def delete(self):
+        """
+        Release the GL buffer. Should be called with the owning context (or one sharing 
+        with it) current; otherwise the buffer is deleted later by deleteOrphanBuffers().
+        The data is kept, and is uploaded to a new buffer if bind() is called again.
+        """
+        if self.buffer is not None:
+            if contextCanUse(QtOpenGL.QGLContext.currentContext(), self.context):
+                glDeleteBuffers(1, [self.buffer])
+            else:
+                _orphanBuffers.append((self.context, self.buffer))
+        self.buffer = None
+        self.context = None
+        self.bufferSize = None
+        if self.data is not None:
+            self.dirty = (0, len(self.data))
+
+    def __del__(self):
+        ## GL calls are not possible here; leave the buffer for deleteOrphanBuffers()
+        ## (module globals may already be gone at interpreter exit)
+        if self.buffer is not None and _orphanBuffers is not None:
+            _orphanBuffers.append((self.context, self.buffer))
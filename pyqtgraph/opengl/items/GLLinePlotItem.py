@@ -2,6 +2,7 @@ from OpenGL.GL import *
 from OpenGL.arrays import vbo
 from .. GLGraphicsItem import GLGraphicsItem
 from .. import shaders
+from ..buffers import ArrayBuffer
 from pyqtgraph import QtGui
 import numpy as np
 
@@ -17,6 +18,7 @@ class GLLinePlotItem(GLGraphicsItem):
         self.pos = None
         self.width = 1.
         self.color = (1.0,1.0,1.0,1.0)
+        self.posBuffer = ArrayBuffer()  ## vertex data resident on the GPU; see GLScatterPlotItem
         self.setData(**kwds)
     
     def setData(self, **kwds):
@@ -42,12 +44,16 @@ class GLLinePlotItem(GLGraphicsItem):
         for arg in args:
             if arg in kwds:
                 setattr(self, arg, kwds[arg])
-                #self.vbo.pop(arg, None)
+        if 'pos' in kwds:
+            self.posBuffer.setData(self.pos)
         self.update()
 
     def initializeGL(self):
         pass
         
+    def releaseGL(self):
+        self.posBuffer.delete()
+        
     #def setupGLState(self):
         #"""Prepare OpenGL state for drawing. This function is called immediately before painting."""
         ##glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)  ## requires z-sorting to render properly.
@@ -70,12 +76,13 @@ class GLLinePlotItem(GLGraphicsItem):
         
         glEnableClientState(GL_VERTEX_ARRAY)
         try:
-            glVertexPointerf(self.pos)
+            glVertexPointer(self.posBuffer.columns, GL_FLOAT, 0, self.posBuffer.bind())
             glColor4f(*self.color)
             
             glPointSize(self.width)
-            glDrawArrays(GL_LINE_STRIP, 0, self.pos.size / self.pos.shape[-1])
+            glDrawArrays(GL_LINE_STRIP, 0, len(self.posBuffer))
         finally:
+            self.posBuffer.unbind()
             glDisableClientState(GL_VERTEX_ARRAY)
     
         
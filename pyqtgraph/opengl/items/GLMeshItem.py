@@ -4,6 +4,7 @@ from .. MeshData import MeshData
 from pyqtgraph.Qt import QtGui
 import pyqtgraph as pg
 from .. import shaders
+from ..buffers import ArrayBuffer
 import numpy as np
 
 
@@ -54,6 +55,18 @@ class GLMeshItem(GLGraphicsItem):
         self.colors = None
         self.faces = None
         
+        ## GPU-resident copies of the compiled data. Only rows that change between 
+        ## updates are uploaded (see ArrayBuffer).
+        self._vertexBuffer = ArrayBuffer()
+        self._normalBuffer = ArrayBuffer()
+        self._colorBuffer = ArrayBuffer()
+        self._faceBuffer = ArrayBuffer(target=GL_ELEMENT_ARRAY_BUFFER, usage=GL_STATIC_DRAW, dtype=np.uint32)
+        self._bufferedFaces = None
+        
+    def releaseGL(self):
+        for buf in (self._vertexBuffer, self._normalBuffer, self._colorBuffer, self._faceBuffer):
+            buf.delete()
+        
     def setShader(self, shader):
         """Set the shader used when rendering faces in the mesh. (see the GL shaders example)"""
         self.opts['shader'] = shader
@@ -137,7 +150,21 @@ class GLMeshItem(GLGraphicsItem):
                 elif md.hasFaceColor():
                     self.colors = md.faceColors(indexed='faces')
                     
+            self.updateBuffers()
             return
+            
+    def updateBuffers(self):
+        ## copy compiled mesh data into the GL buffers (uploaded at the next paint)
+        self._vertexBuffer.setData(self.vertexes)
+        self._normalBuffer.setData(self.normals)
+        self._colorBuffer.setData(self.colors)
+        ## Face topology rarely changes (eg. GLSurfacePlotItem reuses the same array for 
+        ## as long as the grid shape is unchanged); skip the comparison in that case.
+        if self.faces is None:
+            self._faceBuffer.setData(None)
+        elif self.faces is not self._bufferedFaces:
+            self._faceBuffer.setData(self.faces)
+        self._bufferedFaces = self.faces
     
     def paint(self):
         self.setupGLState()
@@ -153,7 +180,7 @@ class GLMeshItem(GLGraphicsItem):
                 return
             glEnableClientState(GL_VERTEX_ARRAY)
             try:
-                glVertexPointerf(verts)
+                glVertexPointer(3, GL_FLOAT, 0, self._vertexBuffer.bind())
                 
                 if self.colors is None:
                     color = self.opts['color']
@@ -163,20 +190,20 @@ class GLMeshItem(GLGraphicsItem):
                         glColor4f(*color)
                 else:
                     glEnableClientState(GL_COLOR_ARRAY)
-                    glColorPointerf(color)
+                    glColorPointer(self._colorBuffer.columns, GL_FLOAT, 0, self._colorBuffer.bind())
                 
                 
                 if norms is not None:
                     glEnableClientState(GL_NORMAL_ARRAY)
-                    glNormalPointerf(norms)
+                    glNormalPointer(GL_FLOAT, 0, self._normalBuffer.bind())
                 
                 if faces is None:
-                    glDrawArrays(GL_TRIANGLES, 0, np.product(verts.shape[:-1]))
+                    glDrawArrays(GL_TRIANGLES, 0, len(self._vertexBuffer))
                 else:
-                    faces = faces.astype(np.uint).flatten()
-                    glDrawElements(GL_TRIANGLES, faces.shape[0], GL_UNSIGNED_INT, faces)
+                    glDrawElements(GL_TRIANGLES, len(self._faceBuffer) * self._faceBuffer.columns, GL_UNSIGNED_INT, self._faceBuffer.bind())
             finally:
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+                glBindBuffer(GL_ARRAY_BUFFER, 0)
                 glDisableClientState(GL_NORMAL_ARRAY)
                 glDisableClientState(GL_VERTEX_ARRAY)
                 glDisableClientState(GL_COLOR_ARRAY)
-            
@@ -2,6 +2,7 @@ from OpenGL.GL import *
 from OpenGL.arrays import vbo
 from .. GLGraphicsItem import GLGraphicsItem
 from .. import shaders
+from ..buffers import ArrayBuffer
 from pyqtgraph import QtGui
 import numpy as np
 
@@ -18,7 +19,13 @@ class GLScatterPlotItem(GLGraphicsItem):
         self.size = 10
         self.color = [1.0,1.0,1.0,0.5]
         self.pxMode = True
-        #self.vbo = {}      ## VBO does not appear to improve performance very much.
+        
+        ## Data is kept in GL buffer objects; setData only marks the rows that changed 
+        ## for upload, so repainting unchanged data (eg. rotating the view) uploads nothing.
+        self.posBuffer = ArrayBuffer()
+        self.colorBuffer = ArrayBuffer()
+        self.sizeBuffer = ArrayBuffer()  ## sizes are passed to the shader as normal.x
+        self._sizeDirty = True
         self.setData(**kwds)
     
     def setData(self, **kwds):
@@ -49,7 +56,13 @@ class GLScatterPlotItem(GLGraphicsItem):
         for arg in args:
             if arg in kwds:
                 setattr(self, arg, kwds[arg])
-                #self.vbo.pop(arg, None)
+                
+        if 'pos' in kwds:
+            self.posBuffer.setData(self.pos if len(self.pos) > 0 else None)
+        if 'color' in kwds:
+            self.colorBuffer.setData(self.color if isinstance(self.color, np.ndarray) else None)
+        if 'pos' in kwds or 'size' in kwds or 'pxMode' in kwds:
+            self._sizeDirty = True
                 
         self.pxMode = kwds.get('pxMode', self.pxMode)
         self.update()
@@ -75,10 +88,9 @@ class GLScatterPlotItem(GLGraphicsItem):
         
         self.shader = shaders.getShaderProgram('pointSprite')
         
-    #def getVBO(self, name):
-        #if name not in self.vbo:
-            #self.vbo[name] = vbo.VBO(getattr(self, name).astype('f'))
-        #return self.vbo[name]
+    def releaseGL(self):
+        for buf in (self.posBuffer, self.colorBuffer, self.sizeBuffer):
+            buf.delete()
         
     #def setupGLState(self):
         #"""Prepare OpenGL state for drawing. This function is called immediately before painting."""
@@ -96,6 +108,8 @@ class GLScatterPlotItem(GLGraphicsItem):
         ##glPointParameterfv(GL_POINT_SIZE_MIN, (0,))
         
     def paint(self):
+        if len(self.posBuffer) == 0:
+            return
         self.setupGLState()
         
         glEnable(GL_POINT_SPRITE)
@@ -118,14 +132,11 @@ class GLScatterPlotItem(GLGraphicsItem):
             #glUniform1i(self.shader.uniform('texture'), 0)  ## inform the shader which texture to use
             glEnableClientState(GL_VERTEX_ARRAY)
             try:
-                pos = self.pos
-                #if pos.ndim > 2:
-                    #pos = pos.reshape((reduce(lambda a,b: a*b, pos.shape[:-1]), pos.shape[-1]))
-                glVertexPointerf(pos)
+                glVertexPointer(self.posBuffer.columns, GL_FLOAT, 0, self.posBuffer.bind())
             
                 if isinstance(self.color, np.ndarray):
                     glEnableClientState(GL_COLOR_ARRAY)
-                    glColorPointerf(self.color)
+                    glColorPointer(self.colorBuffer.columns, GL_FLOAT, 0, self.colorBuffer.bind())
                 else:
                     if isinstance(self.color, QtGui.QColor):
                         glColor4f(*fn.glColor(self.color))
@@ -134,24 +145,29 @@ class GLScatterPlotItem(GLGraphicsItem):
                 
                 if not self.pxMode or isinstance(self.size, np.ndarray):
                     glEnableClientState(GL_NORMAL_ARRAY)
-                    norm = np.empty(pos.shape)
-                    if self.pxMode:
-                        norm[...,0] = self.size
-                    else:
-                        gpos = self.mapToView(pos.transpose()).transpose()
-                        pxSize = self.view().pixelSize(gpos)
-                        norm[...,0] = self.size / pxSize
-                    
-                    glNormalPointerf(norm)
+                    if not self.pxMode or self._sizeDirty:
+                        ## in pxMode the sizes are fixed until setData is called again;
+                        ## otherwise they depend on the view and must be recomputed.
+                        pos = self.posBuffer.data
+                        norm = np.zeros((len(pos), 3), dtype=np.float32)
+                        if self.pxMode:
+                            norm[:,0] = self.size
+                        else:
+                            gpos = self.mapToView(pos.transpose()).transpose()
+                            pxSize = self.view().pixelSize(gpos)
+                            norm[:,0] = self.size / pxSize
+                        self.sizeBuffer.setData(norm)
+                        self._sizeDirty = False
+                    glNormalPointer(GL_FLOAT, 0, self.sizeBuffer.bind())
                 else:
                     glNormal3f(self.size, 0, 0)  ## vertex shader uses norm.x to determine point size
                     #glPointSize(self.size)
-                glDrawArrays(GL_POINTS, 0, pos.size / pos.shape[-1])
+                glDrawArrays(GL_POINTS, 0, len(self.posBuffer))
             finally:
+                glBindBuffer(GL_ARRAY_BUFFER, 0)
                 glDisableClientState(GL_NORMAL_ARRAY)
                 glDisableClientState(GL_VERTEX_ARRAY)
                 glDisableClientState(GL_COLOR_ARRAY)
-                #posVBO.unbind()
                 
         #for i in range(len(self.pos)):
             #pos = self.pos[i]
@@ -48,9 +48,12 @@ class GLSurfacePlotItem(GLMeshItem):
         
         All arguments are optional.
         
-        Note that if vertex positions are updated, the normal vectors for each triangle must 
-        be recomputed. This is somewhat expensive if the surface was initialized with smooth=False
-        and very expensive if smooth=True. For faster performance, initialize with 
+        The face topology is cached and only regenerated when the shape of the grid changes,
+        so repeated calls that update only z (and/or colors) are comparatively cheap. 
+        If the surface was initialized with smooth=True (the default), vertex normals are 
+        computed directly from the gradient of z over the grid rather than from the 
+        individual triangles. With smooth=False the face normals must be recomputed 
+        for every update; for the best performance in that case, initialize with 
         computeNormals=False and use per-vertex colors or a normal-independent shader program.
         """
         if x is not None:
@@ -80,14 +83,16 @@ class GLSurfacePlotItem(GLMeshItem):
                 self._vertexes = None
         
         if colors is not None:
+            colors = np.asarray(colors)
             self._colors = colors
-            self._meshdata.setVertexColors(colors)
+            self._meshdata.setVertexColors(colors.reshape(-1, colors.shape[-1]))
         
         if self._z is None:
             return
         
         updateMesh = False
         newVertexes = False
+        updateColors = colors is not None
         
         ## Generate vertex and face array
         if self._vertexes is None:
@@ -123,17 +128,39 @@ class GLSurfacePlotItem(GLMeshItem):
         ## Update MeshData
         if updateMesh:
             self._meshdata.setVertexes(self._vertexes.reshape(self._vertexes.shape[0]*self._vertexes.shape[1], 3))
+            if self.opts['smooth'] and self.opts['computeNormals']:
+                norms = self.gridNormals()
+                if norms is not None:
+                    self._meshdata.setVertexNormals(norms)
+        if updateMesh or updateColors:
             self.meshDataChanged()
         
+    def gridNormals(self):
+        """
+        Return an (N, 3) array of vertex normals computed from the gradient of z over the 
+        x,y grid, or None if the grid is too small. For smooth surfaces this closely matches 
+        the average of the adjacent face normals but avoids building per-face data.
+        """
+        verts = self._vertexes
+        if verts.shape[0] < 2 or verts.shape[1] < 2:
+            return None
+        dzi, dzj = np.gradient(verts[..., 2])
+        dx = np.gradient(verts[:, 0, 0])
+        dy = np.gradient(verts[0, :, 1])
+        norms = np.empty(verts.shape, dtype=float)
+        ## orientation matches the winding of the faces from generateFaces()
+        norms[..., 0] = dzi / dx[:, np.newaxis]
+        norms[..., 1] = dzj / dy[np.newaxis, :]
+        norms[..., 2] = -1
+        norms /= ((norms**2).sum(axis=-1)**0.5)[..., np.newaxis]
+        return norms.reshape(verts.shape[0]*verts.shape[1], 3)
         
     def generateFaces(self):
         cols = self._z.shape[1]-1
         rows = self._z.shape[0]-1
-        faces = np.empty((cols*rows*2, 3), dtype=np.uint)
-        rowtemplate1 = np.arange(cols).reshape(cols, 1) + np.array([[0, 1, cols+1]])
-        rowtemplate2 = np.arange(cols).reshape(cols, 1) + np.array([[cols+1, 1, cols+2]])
-        for row in range(rows):
-            start = row * cols * 2 
-            faces[start:start+cols] = rowtemplate1 + row * (cols+1)
-            faces[start+cols:start+(cols*2)] = rowtemplate2 + row * (cols+1)
-        self._faces = faces
\ No newline at end of file
+        ## index of the first vertex of each grid cell, then two triangles per cell
+        ## (all first triangles of a row followed by all second triangles)
+        base = (np.arange(rows) * (cols+1))[:, np.newaxis] + np.arange(cols)[np.newaxis, :]
+        template = np.array([[0, 1, cols+1], [cols+1, 1, cols+2]], dtype=np.uint32)
+        faces = base[:, np.newaxis, :, np.newaxis].astype(np.uint32) + template[np.newaxis, :, np.newaxis, :]
+        self._faces = faces.reshape(rows*cols*2, 3)
\ No newline at end of file
@@ -287,7 +287,8 @@ class Parameter(QtCore.QObject):
         If removeChildren is True, then any children which are not referenced in the state object will 
         be removed.
         If blockSignals is True, no signals will be emitted until the tree has been completely restored. 
-        This prevents signal handlers from responding to a partially-rebuilt network.
+        This prevents signal handlers from responding to a partially-rebuilt network; all 
+        changes are then delivered through a single sigTreeStateChanged emission.
         """
         childState = state.get('children', [])
         
@@ -295,47 +296,42 @@ class Parameter(QtCore.QObject):
         if isinstance(childState, dict):
             childState = childState.values()
             
+        ## children are handled below; don't store (or compare) them as an option
+        opts = state.copy()
+        opts.pop('children', None)
         
         if blockSignals:
-            self.blockTreeChangeSignal()
+            blocker = self.treeChangeBlocker()
+        else:
+            blocker = NullContext()
             
-        try:
-            self.setOpts(**state)
+        with blocker:
+            self.setOpts(**opts)
             
             if not recursive:
                 return
             
             ptr = 0  ## pointer to first child that has not been restored yet
             foundChilds = set()
-            #print "==============", self.name()
             
             for ch in childState:
                 name = ch['name']
                 typ = ch['type']
-                #print('child: %s, %s' % (self.name()+'.'+name, typ))
                 
                 ## First, see if there is already a child with this name and type
+                ## (names are unique, so only one candidate needs to be checked)
+                ch2 = self.names.get(name, None)
                 gotChild = False
-                for i, ch2 in enumerate(self.childs[ptr:]):
-                    #print "  ", ch2.name(), ch2.type()
-                    if ch2.name() != name or not ch2.isType(typ):
-                        continue
+                if ch2 is not None and ch2 not in foundChilds and ch2.isType(typ):
                     gotChild = True
-                    #print "    found it"
-                    if i != 0:  ## move parameter to next position
-                        #self.removeChild(ch2)
+                    if ptr >= len(self.childs) or self.childs[ptr] is not ch2:  ## move parameter to next position
                         self.insertChild(ptr, ch2)
-                        #print "  moved to position", ptr
-                    ch2.restoreState(ch, recursive=recursive, addChildren=addChildren, removeChildren=removeChildren)
+                    ch2.restoreState(ch, recursive=recursive, addChildren=addChildren, removeChildren=removeChildren, blockSignals=blockSignals)
                     foundChilds.add(ch2)
-                    
-                    break
                 
                 if not gotChild:
                     if not addChildren:
-                        #print "  ignored child"
                         continue
-                    #print "    created new"
                     ch2 = Parameter.create(**ch)
                     self.insertChild(ptr, ch2)
                     foundChilds.add(ch2)
@@ -345,13 +341,60 @@ class Parameter(QtCore.QObject):
             if removeChildren:
                 for ch in self.childs[:]:
                     if ch not in foundChilds:
-                        #print "  remove:", ch
                         self.removeChild(ch)
-        finally:
-            if blockSignals:
-                self.unblockTreeChangeSignal()
-            
             
+    def setValues(self, values, blockSignals=True):
+        """
+        Set the values of many child parameters at once.
+        
+        *values* is a dict mapping a child name (or a tuple path to a sub-parameter, as
+        accepted by param()) to its new value. If the parameter named by a key has
+        children of its own and the value is a dict, that dict is applied recursively.
+        All names are resolved before any value is changed, so an unknown name raises 
+        an exception and leaves the tree untouched.
+        
+        If blockSignals is True, sigTreeStateChanged is emitted only once for the entire
+        update (by this parameter and by each affected child group).
+        
+        Example::
+        
+            params.setValues({'gain': 2.0, ('camera', 'exposure'): 0.01, 
+                              'filter': {'cutoff': 100, 'order': 4}})
+        """
+        updates = []   ## [(path, param, value), ...]
+        self._collectValues(values, (), updates)
+        
+        ## block every parameter between self and the ones being set; deepest are 
+        ## unblocked first so that their changes are collected by their (still blocked) parents.
+        blocked = []
+        if blockSignals:
+            paths = set()
+            for path, param, val in updates:
+                for i in range(len(path)):
+                    paths.add(path[:i])
+            for path in sorted(paths, key=len, reverse=True):
+                blocked.append(self.param(*path) if len(path) > 0 else self)
+        for p in blocked:
+            p.blockTreeChangeSignal()
+        try:
+            for path, param, val in updates:
+                param.setValue(val)
+        finally:
+            for p in blocked:
+                p.unblockTreeChangeSignal()
+                
+    def _collectValues(self, values, prefix, updates):
+        ## resolve names in *values* to parameters (raising if any are missing) 
+        ## and append (path, param, value) for each to *updates*
+        for names, val in values.items():
+            if not isinstance(names, tuple):
+                names = (names,)
+            param = self.param(*names)
+            path = prefix + names
+            if isinstance(val, dict) and param.hasChildren():
+                param._collectValues(val, path, updates)
+            else:
+                updates.append((path, param, val))
         
     def defaultValue(self):
         """Return the default value for this parameter."""
@@ -689,7 +732,7 @@ class Parameter(QtCore.QObject):
         self.emitTreeChanges()
     
     def emitTreeChanges(self):
-        if self.blockTreeChangeEmit == 0:
+        if self.blockTreeChangeEmit == 0 and len(self.treeStateChanges) > 0:
             changes = self.treeStateChanges
             self.treeStateChanges = []
             self.sigTreeStateChanged.emit(self, changes)
@@ -708,3 +751,12 @@ class SignalBlocker(object):
     
     
     
+
+
+class NullContext(object):
+    ## Used in place of a SignalBlocker when nothing should be blocked
+    def __enter__(self):
+        pass
+        
+    def __exit__(self, exc_type, exc_value, tb):
+        pass
@@ -52,6 +52,10 @@ class ParameterItem(QtGui.QTreeWidgetItem):
         
         ## flag used internally during name editing
         self.ignoreNameColumnChange = False
+        
+        ## True while items for child parameters have not been created yet
+        ## (see initChildren)
+        self.lazyChildren = False
     
     
     def valueChanged(self, param, val):
@@ -81,13 +85,35 @@ class ParameterItem(QtGui.QTreeWidgetItem):
         self.setHidden(not self.param.opts.get('visible', True))
         self.setExpanded(self.param.opts.get('expanded', True))
         
+    def initChildren(self, force=False):
+        """Called after this item has been added to a tree.
+        Items for the child parameters are created immediately if the parameter is
+        expanded (or *force* is True); otherwise they are created by populateChildren()
+        when the item is first expanded.
+        """
+        self.lazyChildren = True
+        if force or self.param.opts.get('expanded', True) or not self.param.hasChildren():
+            self.populateChildren()
+        else:
+            self.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+            
+    def populateChildren(self):
+        """Create items for all child parameters if that has not been done yet."""
+        if not self.lazyChildren:
+            return
+        self.lazyChildren = False
+        self.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        for i, ch in enumerate(self.param):
+            self.childAdded(self.param, ch, i)
+        
     def childAdded(self, param, child, pos):
+        if self.lazyChildren:
+            ## item will be created when this branch is expanded
+            return
         item = child.makeTreeItem(depth=self.depth+1)
         self.insertChild(pos, item)
         item.treeWidgetChanged()
-        
-        for i, ch in enumerate(child):
-            item.childAdded(child, ch, i)
+        item.initChildren()
         
     def childRemoved(self, param, child):
         for i in range(self.childCount()):
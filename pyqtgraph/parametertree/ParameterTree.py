@@ -6,7 +6,12 @@ import os, weakref, re
             
 
 class ParameterTree(TreeWidget):
-    """Widget used to display or control data from a ParameterSet"""
+    """Widget used to display or control data from a ParameterSet
+    
+    Items (and their editor widgets) are only created for parameters whose parent 
+    branch is expanded. Children of a collapsed parameter (see the 'expanded' 
+    option) are added the first time that branch is expanded.
+    """
     
     def __init__(self, parent=None, showHeader=True):
         TreeWidget.__init__(self, parent)
@@ -20,6 +25,7 @@ class ParameterTree(TreeWidget):
         self.header().setResizeMode(QtGui.QHeaderView.ResizeToContents)
         self.setHeaderHidden(not showHeader)
         self.itemChanged.connect(self.itemChangedEvent)
+        self.itemExpanded.connect(self.itemExpandedEvent)
         self.lastSel = None
         self.setRootIsDecorated(False)
         
@@ -29,6 +35,7 @@ class ParameterTree(TreeWidget):
         
     def addParameters(self, param, root=None, depth=0, showTop=True):
         item = param.makeTreeItem(depth=depth)
+        forceChildren = False
         if root is None:
             root = self.invisibleRootItem()
             ## Hide top-level item
@@ -36,12 +43,11 @@ class ParameterTree(TreeWidget):
                 item.setText(0, '')
                 item.setSizeHint(0, QtCore.QSize(1,1))
                 item.setSizeHint(1, QtCore.QSize(1,1))
-                depth -= 1
+                item.depth = depth - 1  ## children are displayed as top-level items
+                forceChildren = True    ## no way to expand a hidden item
         root.addChild(item)
         item.treeWidgetChanged()
-            
-        for ch in param:
-            self.addParameters(ch, root=item, depth=depth+1)
+        item.initChildren(force=forceChildren)
 
     def clear(self):
         self.invisibleRootItem().takeChildren()
@@ -95,6 +101,11 @@ class ParameterTree(TreeWidget):
         if hasattr(item, 'contextMenuEvent'):
             item.contextMenuEvent(ev)
             
+    def itemExpandedEvent(self, item):
+        ## create child items that were deferred while this item was collapsed
+        if hasattr(item, 'populateChildren'):
+            item.populateChildren()
+            
     def itemChangedEvent(self, item, col):
         if hasattr(item, 'columnChangedEvent'):
             item.columnChangedEvent(col)
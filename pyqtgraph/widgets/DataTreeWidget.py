@@ -16,29 +16,38 @@ class DataTreeWidget(QtGui.QTreeWidget):
     """
     Widget for displaying hierarchical python data structures
     (eg, nested dicts, lists, and arrays)
+    
+    Child items are created only when their parent is expanded, so very large
+    structures can be displayed quickly. Arrays with more than *arraySummarySize*
+    elements are shown as a summary (shape, dtype, min, max) rather than in full,
+    and lists with more than *pageSize* elements are split into groups of 
+    *pageSize* items.
     """
     
+    pageSize = 100           ## max number of list items shown under a single node
+    arraySummarySize = 100   ## arrays larger than this are summarized
+    maxValueLength = 1000    ## longer value strings are truncated
     
     def __init__(self, parent=None, data=None):
         QtGui.QTreeWidget.__init__(self, parent)
         self.setVerticalScrollMode(self.ScrollPerPixel)
+        self.lazyNodes = {}   ## node: (data, depth) for nodes whose children have not been created yet
+        self.expandDepth = 3
+        self.itemExpanded.connect(self.populateNode)
         self.setData(data)
         self.setColumnCount(3)
         self.setHeaderLabels(['key / index', 'type', 'value'])
         
-    def setData(self, data, hideRoot=False):
-        """data should be a dictionary."""
+    def setData(self, data, hideRoot=False, expandDepth=3):
+        """data should be a dictionary. Nodes are initially expanded up to *expandDepth* 
+        levels deep (nodes with more than pageSize children are not expanded automatically)."""
         self.clear()
+        self.lazyNodes = {}
+        self.expandDepth = expandDepth
         self.buildTree(data, self.invisibleRootItem(), hideRoot=hideRoot)
-        #node = self.mkNode('', data)
-        #while node.childCount() > 0:
-            #c = node.child(0)
-            #node.removeChild(c)
-            #self.invisibleRootItem().addChild(c)
-        self.expandToDepth(3)
         self.resizeColumnToContents(0)
         
-    def buildTree(self, data, parent, name='', hideRoot=False):
+    def buildTree(self, data, parent, name='', hideRoot=False, depth=0):
         if hideRoot:
             node = parent
         else:
@@ -56,14 +65,70 @@ class DataTreeWidget(QtGui.QTreeWidget):
                 'meta': data.infoCopy()
             }
             
+        if isinstance(data, (dict, list, tuple, ListPage)):
+            if len(data) == 0:
+                return
+            if hideRoot:
+                self.buildChildren(data, node, depth)
+                return
+            ## defer creating children until the node is expanded
+            node.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+            self.lazyNodes[node] = (data, depth)
+            if depth < self.expandDepth and not isinstance(data, ListPage) and len(data) <= self.pageSize:
+                self.populateNode(node)
+                node.setExpanded(True)
+        else:
+            node.setText(2, self.valueString(data))
+        
+    def populateNode(self, node):
+        ## create the children of *node* if that has not been done yet
+        if node not in self.lazyNodes:
+            return
+        data, depth = self.lazyNodes.pop(node)
+        node.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        self.buildChildren(data, node, depth)
+        
+    def buildChildren(self, data, node, depth):
         if isinstance(data, dict):
             for k in data:
-                self.buildTree(data[k], node, str(k))
-        elif isinstance(data, list) or isinstance(data, tuple):
-            for i in range(len(data)):
-                self.buildTree(data[i], node, str(i))
+                self.buildTree(data[k], node, str(k), depth=depth+1)
+        elif isinstance(data, ListPage):
+            for i in range(data.start, data.stop):
+                self.buildTree(data.data[i], node, str(i), depth=depth+1)
+        elif len(data) > self.pageSize:
+            ## split long lists into groups
+            for start in range(0, len(data), self.pageSize):
+                stop = min(start + self.pageSize, len(data))
+                group = QtGui.QTreeWidgetItem(["[%d:%d]" % (start, stop), "", "%d items" % (stop-start)])
+                node.addChild(group)
+                group.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+                self.lazyNodes[group] = (ListPage(data, start, stop), depth)
         else:
-            node.setText(2, str(data))
+            for i in range(len(data)):
+                self.buildTree(data[i], node, str(i), depth=depth+1)
+                
+    def valueString(self, data):
+        """Return the text displayed in the value column for *data*."""
+        if isinstance(data, np.ndarray) and data.size > self.arraySummarySize:
+            s = "shape=%s dtype=%s" % (str(data.shape), str(data.dtype))
+            if data.dtype.kind in 'biuf':
+                s += " min=%g max=%g" % (data.min(), data.max())
+            return s
+        s = str(data)
+        if len(s) > self.maxValueLength:
+            s = s[:self.maxValueLength] + '...'
+        return s
+        
+        
+class ListPage(object):
+    ## A range of items from a long list, displayed as a single group node
+    def __init__(self, data, start, stop):
+        self.data = data
+        self.start = start
+        self.stop = stop
+        
+    def __len__(self):
+        return self.stop - self.start
         
         
     #def mkNode(self, name, v):
@@ -9,7 +9,7 @@ try:
 except:
     HAVE_METAARRAY = False
 
-__all__ = ['TableWidget']
+__all__ = ['TableWidget', 'ArrayTableWidget', 'ArrayTableModel']
 class TableWidget(QtGui.QTableWidget):
     """Extends QTableWidget with some useful functions for automatic data handling
     and copy / export context menu. Can automatically format and display:
@@ -134,11 +134,7 @@ class TableWidget(QtGui.QTableWidget):
             self.setRowCount(row+1)
         for col in range(self.columnCount()):
             val = vals[col]
-            if isinstance(val, float) or isinstance(val, np.floating):
-                s = "%0.3g" % val
-            else:
-                s = str(val)
-            item = QtGui.QTableWidgetItem(s)
+            item = QtGui.QTableWidgetItem(formatValue(val))
             item.value = val
             #print "add item to row %d:"%row, item, item.value
             self.items.append(item)
@@ -177,10 +173,7 @@ class TableWidget(QtGui.QTableWidget):
                     row.append(asUnicode(''))
             data.append(row)
             
-        s = ''
-        for row in data:
-            s += ('\t'.join(row) + '\n')
-        return s
+        return ''.join(['\t'.join(row) + '\n' for row in data])
 
     def copySel(self):
         """Copy selected data to clipboard."""
@@ -217,6 +210,264 @@ class TableWidget(QtGui.QTableWidget):
 
 
 
+def formatValue(val):
+    ## Cell text used by both TableWidget and ArrayTableModel
+    if isinstance(val, float) or isinstance(val, np.floating):
+        return "%0.3g" % val
+    return asUnicode(val)
+
+
+class ArrayTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model that wraps an array without copying it. Accepts:
+    
+    - 1D or 2D numpy arrays (rows along the first axis)
+    - 1D numpy record arrays (one column per field)
+    - 2D metaarrays (headers are taken from the axis info)
+    
+    Cell text is generated only when the view asks for it (ie, for visible rows), 
+    and sorting is done with numpy.argsort on the selected column, so the cost of
+    displaying the table does not depend on the number of rows.
+    """
+    
+    def __init__(self, data=None, parent=None):
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self._data = None
+        self._columns = []      ## list of column arrays (views into the data)
+        self._colNames = None
+        self._rowNames = None
+        self._order = None      ## row permutation after sorting, or None
+        self.setArray(data)
+        
+    def setArray(self, data):
+        """Set the array displayed by the model. (QAbstractItemModel.setData, which 
+        edits a single cell, is not supported; the model is read-only.)"""
+        self.beginResetModel()
+        try:
+            self._order = None
+            self._rowNames = None
+            self._colNames = None
+            if data is None:
+                self._data = None
+                self._columns = []
+                return
+            if HAVE_METAARRAY and (hasattr(data, 'implements') and data.implements('MetaArray')):
+                if data.axisHasColumns(0):
+                    self._rowNames = [asUnicode(data.columnName(0, i)) for i in range(data.shape[0])]
+                elif data.axisHasValues(0):
+                    self._rowNames = list(map(asUnicode, data.xvals(0)))
+                if data.ndim > 1 and data.axisHasColumns(1):
+                    self._colNames = [asUnicode(data.columnName(1, i)) for i in range(data.shape[1])]
+                data = data.asarray()
+            if not isinstance(data, np.ndarray):
+                raise TypeError("ArrayTableModel requires ndarray, record array or MetaArray (got %s); use TableWidget for other data types." % str(type(data)))
+            if data.dtype.names is not None:
+                if data.ndim != 1:
+                    raise ValueError("Record arrays must be 1D (got shape %s)" % str(data.shape))
+                self._columns = [data[name] for name in data.dtype.names]
+                self._colNames = list(map(asUnicode, data.dtype.names))
+            elif data.ndim == 1:
+                self._columns = [data]
+            elif data.ndim == 2:
+                self._columns = [data[:, i] for i in range(data.shape[1])]
+            else:
+                raise ValueError("Arrays must be 1D or 2D (got shape %s)" % str(data.shape))
+            self._data = data
+        finally:
+            self.endResetModel()
+            
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if self._data is None or parent.isValid():
+            return 0
+        return self._data.shape[0]
+    
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+    
+    def sourceRow(self, row):
+        """Return the index into the data array of the row currently displayed at *row*."""
+        if self._order is None:
+            return row
+        return int(self._order[row])
+    
+    def value(self, row, col):
+        """Return the unformatted value displayed at (*row*, *col*)."""
+        return self._columns[col][self.sourceRow(row)]
+        
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return formatValue(self.value(index.row(), index.column()))
+        return None
+    
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            if self._colNames is not None:
+                return self._colNames[section]
+            return asUnicode(section)
+        else:
+            row = self.sourceRow(section)
+            if self._rowNames is not None:
+                return self._rowNames[row]
+            return asUnicode(row)
+            
+    def hasHeaders(self):
+        """Return (hasRowNames, hasColumnNames)."""
+        return self._rowNames is not None, self._colNames is not None
+    
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        if self._data is None or column < 0 or column >= len(self._columns):
+            return
+        self.layoutAboutToBeChanged.emit()
+        ## remap persistent indexes (eg. current item and selection) to follow their rows
+        oldIndexes = self.persistentIndexList()
+        oldRows = [self.sourceRow(ind.row()) for ind in oldIndexes]
+        order_ = np.argsort(self._columns[column], kind='mergesort')
+        if order == QtCore.Qt.DescendingOrder:
+            order_ = order_[::-1]
+        self._order = order_
+        if len(oldIndexes) > 0:
+            inverse = np.empty(len(order_), dtype=np.intp)
+            inverse[order_] = np.arange(len(order_))
+            newIndexes = [self.index(int(inverse[r]), ind.column()) for r, ind in zip(oldRows, oldIndexes)]
+            self.changePersistentIndexList(oldIndexes, newIndexes)
+        self.layoutChanged.emit()
+        
+    def iterSerialize(self, rows=None, columns=None, chunkSize=10000):
+        """
+        Generate tab-separated text for the given range of rows and columns (all by 
+        default), *chunkSize* rows at a time. Values are written unformatted, in the 
+        current sort order. Headers are included if the data has them.
+        """
+        if self._data is None:
+            return
+        if rows is None:
+            rows = (0, self.rowCount())
+        if columns is None:
+            columns = (0, self.columnCount())
+        colInds = list(range(*columns))
+        hasRowNames, hasColNames = self.hasHeaders()
+        if hasColNames:
+            header = [self._colNames[c] for c in colInds]
+            if hasRowNames:
+                header.insert(0, asUnicode(''))
+            yield '\t'.join(header) + '\n'
+        
+        for start in range(rows[0], rows[1], chunkSize):
+            stop = min(start + chunkSize, rows[1])
+            if self._order is None:
+                inds = slice(start, stop)
+            else:
+                inds = self._order[start:stop]
+            cols = []
+            if hasRowNames:
+                srcRows = range(start, stop) if self._order is None else inds
+                cols.append([self._rowNames[r] for r in srcRows])
+            for c in colInds:
+                vals = self._columns[c][inds]
+                if vals.dtype.kind in 'biuf':
+                    cols.append(vals.astype(str).tolist())
+                else:
+                    cols.append([asUnicode(v) for v in vals])
+            yield ''.join(['\t'.join(row) + '\n' for row in zip(*cols)])
+
+
+class ArrayTableWidget(QtGui.QTableView):
+    """
+    Table view for large numpy arrays, record arrays and metaarrays, backed by
+    :class:`ArrayTableModel <pyqtgraph.ArrayTableModel>`. This offers the same 
+    copy / export context menu as :class:`TableWidget <pyqtgraph.TableWidget>`,
+    but no Qt objects are created per cell; tables with millions of rows display
+    and sort quickly. Click a column header to sort.
+    """
+    
+    def __init__(self, *args):
+        QtGui.QTableView.__init__(self, *args)
+        self.setModel(ArrayTableModel(parent=self))
+        self.setSelectionMode(QtGui.QAbstractItemView.ContiguousSelection)
+        self.setSortingEnabled(True)
+        self.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+        self.contextMenu = QtGui.QMenu()
+        self.contextMenu.addAction('Copy Selection').triggered.connect(self.copySel)
+        self.contextMenu.addAction('Copy All').triggered.connect(self.copyAll)
+        self.contextMenu.addAction('Save Selection').triggered.connect(self.saveSel)
+        self.contextMenu.addAction('Save All').triggered.connect(self.saveAll)
+        
+    def setData(self, data):
+        """Display *data*. The array is referenced, not copied."""
+        self.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+        self.model().setArray(data)
+        
+    def clear(self):
+        self.setData(None)
+        
+    def selectedRange(self):
+        ## (rows, columns) of the (contiguous) selection, as (start, stop) tuples
+        sel = self.selectionModel().selection()
+        if len(sel) == 0:
+            return None
+        rng = sel[0]
+        return (rng.top(), rng.bottom()+1), (rng.left(), rng.right()+1)
+        
+    def iterSerialize(self, useSelection=False, chunkSize=10000):
+        """Generate tab-separated text for the entire table (or just the selected area) in chunks."""
+        rows = columns = None
+        if useSelection:
+            rng = self.selectedRange()
+            if rng is None:
+                return iter([])
+            rows, columns = rng
+        return self.model().iterSerialize(rows, columns, chunkSize=chunkSize)
+            
+    def serialize(self, useSelection=False):
+        """Convert entire table (or just selected area) into tab-separated text values"""
+        return ''.join(self.iterSerialize(useSelection))
+        
+    def copySel(self):
+        """Copy selected data to clipboard."""
+        QtGui.QApplication.clipboard().setText(self.serialize(useSelection=True))
+
+    def copyAll(self):
+        """Copy all data to clipboard."""
+        QtGui.QApplication.clipboard().setText(self.serialize(useSelection=False))
+
+    def saveSel(self):
+        """Save selected data to file."""
+        self.save(self.iterSerialize(useSelection=True))
+
+    def saveAll(self):
+        """Save all data to file."""
+        self.save(self.iterSerialize(useSelection=False))
+
+    def save(self, chunks):
+        ## text is written to the file one chunk at a time
+        fileName = QtGui.QFileDialog.getSaveFileName(self, "Save As..", "", "Tab-separated values (*.tsv)")
+        if fileName == '':
+            return
+        fh = open(fileName, 'w')
+        try:
+            for chunk in chunks:
+                fh.write(chunk)
+        finally:
+            fh.close()
+
+    def contextMenuEvent(self, ev):
+        self.contextMenu.popup(ev.globalPos())
+        
+    def keyPressEvent(self, ev):
+        if ev.text() == 'c' and ev.modifiers() == QtCore.Qt.ControlModifier:
+            ev.accept()
+            self.copySel()
+        else:
+            QtGui.QTableView.keyPressEvent(self, ev)
+
+
+
 if __name__ == '__main__':
     app = QtGui.QApplication([])
     win = QtGui.QMainWindow()
@@ -0,0 +1,153 @@
+"""
+Tests for the QPainterPath builders in pyqtgraph.functions (arrayToQPath,
+tiledQPath, isocurve). Each is checked with both the binary stream loader
+(used on Python 2) and the element-by-element fallback.
+"""
+import sys, types
+import numpy as np
+import test
+import pyqtgraph as pg
+import pyqtgraph.functions as fn
+from pyqtgraph.Qt import QtGui, QtCore
+
+MoveTo = int(QtGui.QPainterPath.MoveToElement)
+LineTo = int(QtGui.QPainterPath.LineToElement)
+
+
+def pathElements(path):
+    ## list of (type, x, y) for each element in *path*
+    els = []
+    for i in range(path.elementCount()):
+        e = path.elementAt(i)
+        els.append((int(e.type), e.x, e.y))
+    return els
+
+
+def subpaths(path):
+    ## split a path made of moveTo/lineTo elements into lists of [x, y] vertices
+    out = []
+    for t, x, y in pathElements(path):
+        if t == MoveTo:
+            out.append([])
+        out[-1].append([x, y])
+    return out
+
+
+class PathTestCase(test.TestCase):
+    """Runs each check once for every path-building method available here."""
+
+    def modes(self):
+        ## the binary loader only works with the Python 2 buffer interface
+        if sys.version_info[0] == 2:
+            return ['binary', 'fallback']
+        return ['fallback']
+
+    def setMode(self, mode):
+        ## functions.py selects the method from sys.version_info
+        fn.sys = types.ModuleType('sys')
+        fn.sys.__dict__.update(sys.__dict__)
+        fn.sys.version_info = (2, 7) if mode == 'binary' else (3, 0)
+
+    def tearDown(self):
+        fn.sys = sys
+
+
+class ArrayToQPathTest(PathTestCase):
+    def expected(self, x, y, connect):
+        ## vertex 0 starts the path; vertex i is joined to i-1 if connect[i-1]
+        return [(MoveTo if (i == 0 or not connect[i-1]) else LineTo, x[i], y[i]) for i in range(len(x))]
+
+    def test_all(self):
+        x = np.arange(6, dtype=float)
+        y = x ** 2
+        for mode in self.modes():
+            self.setMode(mode)
+            self.assertEqual(pathElements(fn.arrayToQPath(x, y)), self.expected(x, y, np.ones(6)), mode)
+
+    def test_connectArray(self):
+        ## several channels joined into one path, broken after the last sample of
+        ## each channel (as done by MultiTraceItem)
+        nCh, nPts = 4, 10
+        x = np.tile(np.arange(nPts, dtype=float), nCh)
+        y = np.random.normal(size=nCh*nPts)
+        connect = np.ones(nCh*nPts, dtype=np.int32)
+        connect[nPts-1::nPts] = 0
+        for mode in self.modes():
+            self.setMode(mode)
+            path = fn.arrayToQPath(x, y, connect=connect)
+            self.assertEqual(pathElements(path), self.expected(x, y, connect), mode)
+            self.assertEqual(len(subpaths(path)), nCh, mode)
+
+    def test_pairs(self):
+        x = np.arange(8, dtype=float)
+        y = -x
+        for mode in self.modes():
+            self.setMode(mode)
+            kinds = [t for t, _, _ in pathElements(fn.arrayToQPath(x, y, connect='pairs'))]
+            self.assertEqual(kinds, [MoveTo, LineTo] * 4, mode)
+
+    def test_finite(self):
+        x = np.arange(8, dtype=float)
+        y = np.array([0, 1, 2, np.nan, 4, 5, np.inf, 7])
+        for mode in self.modes():
+            self.setMode(mode)
+            ## non-finite vertices are dropped and the line is broken around them
+            self.assertEqual(subpaths(fn.arrayToQPath(x, y, connect='finite')),
+                             [[[0, 0], [1, 1], [2, 2]], [[4, 4], [5, 5]], [[7, 7]]], mode)
+
+
+class TiledQPathTest(PathTestCase):
+    def symbol(self):
+        ## two subpaths, so that the last subpath does not start at element 0
+        path = QtGui.QPainterPath()
+        path.addRect(QtCore.QRectF(-0.5, -0.5, 1, 1))
+        path.moveTo(0, -1)
+        path.lineTo(0, 1)
+        return path
+
+    def test_elements(self):
+        sym = self.symbol()
+        x = np.array([10., 20., 30.])
+        y = np.array([1., 2., 3.])
+        scale = np.array([1., 2., 4.])
+        expected = []
+        for i in range(3):
+            expected.extend([(t, ex * scale[i] + x[i], ey * scale[i] + y[i]) for t, ex, ey in pathElements(sym)])
+        for mode in self.modes():
+            self.setMode(mode)
+            path = fn.tiledQPath(sym, x, y, scale)
+            self.assertEqual(pathElements(path), expected, mode)
+            self.assertEqual(path.fillRule(), QtCore.Qt.WindingFill, mode)
+
+    def test_lastSubpath(self):
+        ## closeSubpath() joins the end of the path to the start of its last subpath
+        for mode in self.modes():
+            self.setMode(mode)
+            path = fn.tiledQPath(self.symbol(), [0., 10.], [0., 0.])
+            path.closeSubpath()
+            t, x, y = pathElements(path)[-1]
+            self.assertEqual((t, x, y), (LineTo, 10., -1.), mode)
+
+    def test_empty(self):
+        for mode in self.modes():
+            self.setMode(mode)
+            path = fn.tiledQPath(self.symbol(), [], [])
+            self.assertEqual(path.elementCount(), 0, mode)
+            self.assertEqual(path.fillRule(), QtCore.Qt.WindingFill, mode)
+
+
+class IsocurveTest(PathTestCase):
+    def test_pathChains(self):
+        ## the path must contain exactly the chains returned with connected=True
+        np.random.seed(1)
+        x, y = np.ogrid[0:1:40j, 0:1:40j]
+        data = np.sin(x * 13) * np.cos(y * 9) + np.random.normal(scale=0.2, size=(40, 40))
+        chains = [[list(map(float, p)) for p in chain] for chain in fn.isocurve(data, 0.1, connected=True)]
+        self.assertTrue(len(chains) > 1)
+        for mode in self.modes():
+            self.setMode(mode)
+            self.assertEqual(subpaths(fn.isocurve(data, 0.1, path=True)), chains, mode)
+
+
+if __name__ == '__main__':
+    test.unittest.main()